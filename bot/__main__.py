@@ -11,7 +11,8 @@ from dotenv import load_dotenv
 
 from bot.bot import MasarykBOT
 from bot.cogs import setup_injections as setup_cog_injections
-from bot.db import connect_db, Pool, setup_injections as setup_db_injections
+from bot.db import connect_db, Pool, QUERY_STATS, ReadPool, setup_injections as setup_db_injections
+from bot.db.migrate import migrate_url
 from bot.utils import setup_logging, DatabaseRequiredException
 from bot.constants import CONFIG
 
@@ -62,11 +63,16 @@ bot = MasarykBOT(
 log = logging.getLogger()
 
 
-def setup_injections(db_pool: Optional[Pool], bot: commands.Bot) -> Callable[..., None]:
+def setup_injections(
+    db_pool: Optional[Pool],
+    bot: commands.Bot,
+    replica_pool: Optional[Pool] = None
+) -> Callable[..., None]:
     def inner(binder: inject.Binder) -> None:
         binder.bind(commands.Bot, bot)
         if db_pool:
             binder.bind(Pool, db_pool)  # type: ignore[misc]
+            binder.bind(ReadPool, ReadPool(db_pool, replica_pool))
             binder.install(setup_db_injections)
             binder.install(setup_cog_injections)
     return inner
@@ -91,10 +97,19 @@ async def main() -> None:
 
     pool: Optional[Pool] = None
     if postgres_url := os.getenv("POSTGRES"):
+        QUERY_STATS.enabled = CONFIG.database.instrument
+        QUERY_STATS.slow_query_threshold = CONFIG.database.slow_query_ms / 1000
         pool = await connect_db(postgres_url)
+        if pool and CONFIG.database.migrate:
+            await migrate_url(postgres_url)
+
+    replica_pool: Optional[Pool] = None
+    if pool and (replica_url := os.getenv("POSTGRES_REPLICA")):
+        if not (replica_pool := await connect_db(replica_url)):
+            log.warning("replica is unavailable, reading from the primary")
 
     loop = asyncio.get_event_loop()
-    await loop.run_in_executor(None, lambda: inject.configure_once(setup_injections(pool, bot)))
+    await loop.run_in_executor(None, lambda: inject.configure_once(setup_injections(pool, bot, replica_pool)))
 
     async with bot:
         await load_extensions()
@@ -6,6 +6,7 @@ from typing import NoReturn, Optional
 import discord as discord
 from discord.ext import commands
 
+from bot.db import QUERY_STATS
 from bot.utils import Context
 
 log = logging.getLogger(__name__)
@@ -59,6 +60,14 @@ class AdminCog(commands.Cog):
         fmt = await ctx.bot.tree.sync()
         await ctx.send(f"synced {len(fmt)} commands")
 
+    @commands.command()
+    @commands.has_permissions(administrator=True)
+    async def dbstats(self, ctx: Context, limit: int = 10) -> None:
+        if not QUERY_STATS.enabled:
+            await ctx.send("query instrumentation is disabled, enable `database.instrument` in the config")
+            return
+        await ctx.send(f"```\n{QUERY_STATS.format_top(min(limit, 15))}\n```")
+
     @commands.command()
     @commands.has_permissions(administrator=True)
     async def logs(self, ctx: Context, filename: Optional[str] = None) -> None:
@@ -125,9 +125,8 @@ class CourseService:
 
     async def find_all_faculties(self) -> Iterable[FacultyEntity]:
         result = []
-        async with self._uow.transaction(readonly=True) as trans:
-            async for faculties in await self._faculty_repository.find_all(conn=trans.conn):
-                result.extend(faculties)
+        async for faculties in self._faculty_repository.stream_all():
+            result.extend(faculties)
         return result
 
     async def recover_database(self, guild: discord.Guild) -> int:
@@ -1,17 +1,22 @@
 import logging
 from contextlib import suppress
+from typing import Sequence
 
+import discord
 import inject
 from discord.ext import commands, tasks
 
 from bot.cogs.logger.processors import Backup, setup_injections
 from bot.cogs.logger.message_iterator import MessageIterator
 from bot.cogs.logger.history_iterator import HistoryIterator
-from bot.utils import requires_database, Context
+from bot.cogs.logger.live_ingestion import LiveIngestion
+from bot.db import MessageRepository
+from bot.utils import requires_database, Context, EmojiIndex
 
 __all__ = [
     'MessageIterator',
     'HistoryIterator',
+    'LiveIngestion',
     'LoggerCog', 'setup',
     'BackupAlreadyRunning',
     'setup_injections'
@@ -25,16 +30,72 @@ class BackupAlreadyRunning(RuntimeError):
 
 
 class LoggerCog(commands.Cog):
-    @inject.autoparams('backup_bot')
-    def __init__(self, bot: commands.Bot, bot_backup: Backup[commands.Bot]) -> None:
+    @inject.autoparams('bot_backup', 'live_ingestion', 'emoji_index', 'message_repository', 'message_backup')
+    def __init__(
+        self,
+        bot: commands.Bot,
+        bot_backup: Backup[commands.Bot],
+        live_ingestion: LiveIngestion,
+        emoji_index: EmojiIndex,
+        message_repository: MessageRepository,
+        message_backup: Backup[discord.Message]
+    ) -> None:
         self.bot = bot
         self.backup_running: bool = False
         self.bot_backup = bot_backup
+        self.live_ingestion = live_ingestion
+        self.emoji_index = emoji_index
+        self.message_repository = message_repository
+        self.message_backup = message_backup
+
+    async def cog_unload(self) -> None:
+        try:
+            await self.live_ingestion.flush()
+        finally:
+            await self.message_backup.close()
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
+        self.emoji_index.build(self.bot.emojis)
+        await self.live_ingestion.start_session()
         self.backup_running = False
-        self.backup_task.start()
+        if not self.backup_task.is_running():
+            self.backup_task.start()
+
+    @commands.Cog.listener()
+    async def on_guild_emojis_update(
+        self,
+        guild: discord.Guild,
+        _before: Sequence[discord.Emoji],
+        after: Sequence[discord.Emoji]
+    ) -> None:
+        self.emoji_index.update_guild(guild, after)
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message) -> None:
+        await self.live_ingestion.on_message(message)
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent) -> None:
+        await self.live_ingestion.on_message_edit(payload)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent) -> None:
+        if payload.guild_id is not None:
+            await self.live_ingestion.on_message_delete([payload.message_id])
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent) -> None:
+        if payload.guild_id is not None:
+            await self.live_ingestion.on_message_delete(list(payload.message_ids))
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent) -> None:
+        await self.live_ingestion.on_reaction_add(payload)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent) -> None:
+        await self.live_ingestion.on_reaction_remove(payload)
 
     @commands.hybrid_command()
     @commands.has_permissions(administrator=True)
@@ -52,6 +113,8 @@ class LoggerCog(commands.Cog):
             raise BackupAlreadyRunning('backup process is already running')
         log.info("processors started")
         self.backup_running = True
+        if created := await self.message_repository.create_partitions():
+            log.info("created %d message partitions", created)
         await self.bot_backup.traverse_down(self.bot)
         self.backup_running = False
         log.info("processors finished")
@@ -61,5 +124,7 @@ class LoggerCog(commands.Cog):
 async def setup(bot: commands.Bot) -> None:
     injector = inject.get_injector_or_die()
     bot_backup = injector.get_instance(Backup[commands.Bot])
+    live_ingestion = LiveIngestion()
+    emoji_index = injector.get_instance(EmojiIndex)
 
-    await bot.add_cog(LoggerCog(bot, bot_backup))
+    await bot.add_cog(LoggerCog(bot, bot_backup, live_ingestion, emoji_index))
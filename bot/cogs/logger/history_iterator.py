@@ -1,6 +1,6 @@
 import logging
 from collections.abc import AsyncIterator
-from typing import Optional, cast
+from typing import Awaitable, Callable, Optional, cast
 
 import discord.errors
 import inject
@@ -16,8 +16,12 @@ log = logging.getLogger(__name__)
 class HistoryIterator(AsyncIterator[MessageIterator]):
     @inject.autoparams('logger_repository', 'channel_repository')
     def __init__(self, bot: commands.Bot, logger_repository: LoggerRepository,
-                 channel_repository: ChannelRepository) -> None:
+                 channel_repository: ChannelRepository,
+                 flush: Optional[Callable[[], Awaitable[None]]] = None, single_batch: bool = False) -> None:
         self.bot = bot
+        self._flush = flush
+        self._single_batch = single_batch
+        self._fetched = False
         self._logger_repository = logger_repository
         self._channel_repository = channel_repository
         self.updatable_processes: list[LoggerRepository.UpdatableProcesses] = []
@@ -26,15 +30,16 @@ class HistoryIterator(AsyncIterator[MessageIterator]):
         return self
 
     async def __anext__(self) -> "MessageIterator":
-        if not self.updatable_processes:
+        if not self.updatable_processes and not (self._single_batch and self._fetched):
             log.info('starting message processors batch')
             self.updatable_processes = await self._logger_repository.find_updatable_processes()
+            self._fetched = True
 
         channel: Optional[TextChannel] = None
         while not channel:
             channel = await self.get_next_channel_to_process()
 
-        return cast("MessageIterator", MessageIterator(channel))
+        return cast("MessageIterator", MessageIterator(channel, flush=self._flush))
 
     async def get_next_channel_to_process(self) -> Optional[TextChannel]:
         if not self.updatable_processes:
@@ -53,4 +58,4 @@ class HistoryIterator(AsyncIterator[MessageIterator]):
             return None
 
     async def mark_channel_as_deleted(self, channel_id: int) -> None:
-        await self._channel_repository.soft_delete([(channel_id,)])
+        await self._channel_repository.soft_delete(channel_id)
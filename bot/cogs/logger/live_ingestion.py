@@ -0,0 +1,165 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import groupby
+from typing import Any, Awaitable, Callable, Dict, List, Type, Union
+
+import discord
+import inject
+from discord.utils import snowflake_time
+from pytz import UTC
+
+from bot.cogs.logger.processors import Backup
+from bot.db import LoggerRepository, MessageMapper, MessageRepository, ReactionRepository
+from bot.db.utils import Id
+from bot.utils import AnyEmote, get_emoji_id
+from bot.utils.buffer import FlushBuffer
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MessageCreated:
+    message: discord.Message
+
+
+@dataclass(frozen=True)
+class MessageEdited:
+    message_id: Id
+    content: str
+    is_command: bool
+
+
+@dataclass(frozen=True)
+class MessageDeleted:
+    message_id: Id
+
+
+@dataclass(frozen=True)
+class ReactionAdded:
+    message_id: Id
+    emoji_id: Id
+    user_id: Id
+    created_at: datetime
+
+
+@dataclass(frozen=True)
+class ReactionRemoved:
+    message_id: Id
+    emoji_id: Id
+    user_id: Id
+
+
+LiveEvent = Union[MessageCreated, MessageEdited, MessageDeleted, ReactionAdded, ReactionRemoved]
+
+
+class LiveIngestion:
+    """
+    writes gateway events to the database as they arrive
+
+    events are buffered and written in batches, in the order they arrived,
+    channels receiving messages get the live session recorded in cogs.logger,
+    so that the routine backup only backfills the time the bot was offline
+    """
+
+    BUFFER_SIZE = 500
+    BUFFER_DELAY = 5.0
+
+    @inject.autoparams()
+    def __init__(
+        self,
+        message_backup: Backup[discord.Message],
+        emoji_backup: Backup[AnyEmote],
+        message_repository: MessageRepository,
+        reaction_repository: ReactionRepository,
+        logger_repository: LoggerRepository
+    ) -> None:
+        self.message_backup = message_backup
+        self.emoji_backup = emoji_backup
+        self.message_repository = message_repository
+        self.reaction_repository = reaction_repository
+        self.logger_repository = logger_repository
+
+        self.session_start = datetime.now(tz=UTC)
+        self._buffer = FlushBuffer[LiveEvent](self._write_many, self.BUFFER_SIZE, self.BUFFER_DELAY)
+        self._writers: Dict[Type[Any], Callable[[List[Any]], Awaitable[None]]] = {
+            MessageCreated: self._write_created,
+            MessageEdited: self._write_edited,
+            MessageDeleted: self._write_deleted,
+            ReactionAdded: self._write_reactions_added,
+            ReactionRemoved: self._write_reactions_removed,
+        }
+
+    async def start_session(self) -> None:
+        """events missed while disconnected are left to the routine backup"""
+        await self.flush()
+        self.session_start = datetime.now(tz=UTC)
+
+    async def flush(self) -> None:
+        await self._buffer.flush()
+
+    async def on_message(self, message: discord.Message) -> None:
+        if message.guild is None:
+            return
+        await self._buffer.add(MessageCreated(message))
+
+    async def on_message_edit(self, payload: discord.RawMessageUpdateEvent) -> None:
+        if payload.guild_id is None or 'content' not in payload.data:
+            return
+        content, is_command = MessageMapper.map_content(payload.data['content'])
+        await self._buffer.add(MessageEdited(payload.message_id, content, is_command))
+
+    async def on_message_delete(self, message_ids: List[Id]) -> None:
+        for message_id in message_ids:
+            await self._buffer.add(MessageDeleted(message_id))
+
+    async def on_reaction_add(self, payload: discord.RawReactionActionEvent) -> None:
+        if payload.guild_id is None:
+            return
+        emoji = await self._backup_emoji(payload.emoji)
+        created_at = snowflake_time(payload.message_id)
+        await self._buffer.add(ReactionAdded(payload.message_id, get_emoji_id(emoji), payload.user_id, created_at))
+
+    async def on_reaction_remove(self, payload: discord.RawReactionActionEvent) -> None:
+        if payload.guild_id is None:
+            return
+        emoji = await self._backup_emoji(payload.emoji)
+        await self._buffer.add(ReactionRemoved(payload.message_id, get_emoji_id(emoji), payload.user_id))
+
+    async def _backup_emoji(self, partial_emoji: discord.PartialEmoji) -> AnyEmote:
+        emoji: AnyEmote = partial_emoji if partial_emoji.id else partial_emoji.name
+        await self.emoji_backup.traverse_up(emoji)
+        return emoji
+
+    async def _write_many(self, events: List[LiveEvent]) -> None:
+        log.debug('writing %d live events', len(events))
+        for event_type, run in groupby(events, key=type):
+            await self._writers[event_type](list(run))
+
+    async def _write_created(self, events: List[MessageCreated]) -> None:
+        for event in events:
+            await self.message_backup.traverse_down(event.message)
+        await self.message_backup.flush()
+
+        covered_until: Dict[Id, datetime] = {}
+        for event in events:
+            channel_id = event.message.channel.id
+            covered_until[channel_id] = max(covered_until.get(channel_id, event.message.created_at),
+                                            event.message.created_at)
+
+        for channel_id, to_date in covered_until.items():
+            to_date = max(to_date, self.session_start)
+            await self.logger_repository.extend_live_process((channel_id, self.session_start, to_date))
+
+    async def _write_edited(self, events: List[MessageEdited]) -> None:
+        await self.message_repository.edit_many([(e.message_id, e.content, e.is_command) for e in events])
+
+    async def _write_deleted(self, events: List[MessageDeleted]) -> None:
+        await self.message_repository.soft_delete_many([e.message_id for e in events])
+
+    async def _write_reactions_added(self, events: List[ReactionAdded]) -> None:
+        await self.reaction_repository.add_members([(e.message_id, e.emoji_id, e.user_id, e.created_at)
+                                                    for e in events])
+
+    async def _write_reactions_removed(self, events: List[ReactionRemoved]) -> None:
+        await self.reaction_repository.remove_members([(e.message_id, e.emoji_id, e.user_id) for e in events])
@@ -1,6 +1,6 @@
 import logging
 from datetime import datetime, timedelta
-from typing import AsyncIterator, Optional, Union
+from typing import AsyncIterator, Awaitable, Callable, Optional, Tuple, Union
 
 import inject
 from discord import Message, TextChannel, Thread
@@ -14,52 +14,93 @@ log = logging.getLogger(__name__)
 
 
 class MessageIterator:
+    """
+    iterates over the next window of at most WINDOW_SIZE messages of the first gap in the channel's backup
+
+    every CHECKPOINT_INTERVAL messages the window is flushed and recorded as covered up to the last message,
+    so a crawl interrupted midway resumes from the checkpoint instead of fetching the whole window again
+    """
+
+    WINDOW_SIZE = 1_000
+    CHECKPOINT_INTERVAL = 100
+
     _from_date: datetime
+    _to_date: Optional[datetime] = None
     _iterator: AsyncIterator[Message]
     _current_message: Optional[Message] = None
+    _count: int = 0
 
     @inject.autoparams('logger_repository')
-    def __init__(self, channel: Union[TextChannel, Thread], logger_repository: bot.db.LoggerRepository) -> None:
+    def __init__(
+        self,
+        channel: Union[TextChannel, Thread],
+        logger_repository: bot.db.LoggerRepository,
+        flush: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> None:
+        """
+        flush is awaited before the processed window is marked as finished,
+        so that buffered messages are written before the logger moves on
+        """
         self.channel = channel
         self.logger_repository = logger_repository
+        self._flush = flush
+
+    async def _get_next_gap(self) -> Tuple[datetime, Optional[datetime]]:
+        if (gap := await self.logger_repository.find_next_gap(self.channel.id)) is not None:
+            return gap.from_date, gap.to_date
 
-    async def _get_next_from_date(self) -> datetime:
-        last_process = await self.logger_repository.find_last_process(self.channel.id)
-        if last_process is None:
-            if self.channel.created_at is None:
-                if self.channel.last_message_id is not None:
-                    oldest_message = await anext(self.channel.history(oldest_first=True, limit=1))
-                    return oldest_message.created_at
-                else:
-                    return (await self.channel.fetch_message(self.channel.id)).created_at
+        if self.channel.created_at is None:
+            if self.channel.last_message_id is not None:
+                oldest_message = await anext(self.channel.history(oldest_first=True, limit=1))
+                return oldest_message.created_at, None
             else:
-                return self.channel.created_at
-        elif last_process.finished_at is None:
-            return last_process.from_date
+                return (await self.channel.fetch_message(self.channel.id)).created_at, None
         else:
-            return last_process.to_date
+            return self.channel.created_at, None
 
     async def history(self) -> AsyncIterator[Message]:
-        from_date = min(await self._get_next_from_date(), datetime.now(tz=UTC))
+        from_date, to_date = await self._get_next_gap()
+        from_date = min(from_date, datetime.now(tz=UTC))
 
-        if abs(datetime.now(tz=UTC) - from_date) < timedelta(days=3):
+        if to_date is None and abs(datetime.now(tz=UTC) - from_date) < timedelta(days=3):
             return EmptyAsyncIterator()
 
         log.info("processing messages from %s in %s (%s)", from_date.date(), self.channel.name, self.channel.guild.name)
 
         await self.logger_repository.begin_process((self.channel.id, from_date))
-        self._iterator = aiter(self.channel.history(after=from_date, limit=1_000))
+        self._iterator = aiter(self.channel.history(after=from_date, before=to_date, limit=self.WINDOW_SIZE))
         self._from_date = from_date
+        self._to_date = to_date
         return self
 
     def __aiter__(self) -> "MessageIterator":
         return self
 
     async def __anext__(self) -> Message:
+        if self._count and self._count % self.CHECKPOINT_INTERVAL == 0:
+            await self._checkpoint()
+
         try:
             self._current_message = await anext(self._iterator)
+            self._count += 1
             return self._current_message
         except StopAsyncIteration:
-            to_date = datetime.now(tz=UTC) if self._current_message is None else self._current_message.created_at
-            await self.logger_repository.end_process((self.channel.id, self._from_date, to_date))
+            if self._flush is not None:
+                await self._flush()
+            await self.logger_repository.end_process((self.channel.id, self._from_date, self._get_covered_until()))
             raise StopAsyncIteration
+
+    async def _checkpoint(self) -> None:
+        assert self._current_message is not None
+        if self._flush is not None:
+            await self._flush()
+        await self.logger_repository.checkpoint_process(
+            (self.channel.id, self._from_date, self._current_message.created_at)
+        )
+
+    def _get_covered_until(self) -> datetime:
+        if self._to_date is not None and self._count < self.WINDOW_SIZE:
+            return self._to_date
+        if self._current_message is None:
+            return datetime.now(tz=UTC)
+        return self._current_message.created_at
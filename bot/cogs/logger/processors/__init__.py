@@ -23,10 +23,14 @@ from bot.cogs.logger.processors.message_emoji import MessageEmojiBackup
 from bot.cogs.logger.processors.reaction import ReactionBackup
 from bot.cogs.logger.processors.role import RoleBackup
 from bot.cogs.logger.processors.user import UserBackup
-from bot.utils import MessageAttachment, MessageEmote, AnyEmote
+from bot.cogs.logger.worker_pool import WorkerPool
+from bot.constants import CONFIG
+from bot.utils import MessageAttachment, MessageEmote, AnyEmote, EmojiIndex
 
 
 def setup_injections(binder: inject.Binder) -> None:
+    binder.bind_to_constructor(WorkerPool, lambda: WorkerPool(CONFIG.logger.concurrency))
+    binder.bind_to_constructor(EmojiIndex, EmojiIndex)
     binder.bind_to_constructor(Backup[MessageAttachment], AttachmentBackup)
     binder.bind_to_constructor(Backup[commands.Bot], BotBackup)
     binder.bind_to_constructor(Backup[discord.CategoryChannel], CategoryBackup)
@@ -1,19 +1,45 @@
+import logging
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
-from collections import deque
+from typing import Any, ClassVar, Generic, Hashable, List, Sequence, TypeVar, cast
+from weakref import WeakSet
+
+from bot.utils.lru_cache import LRUCache
+
+log = logging.getLogger(__name__)
 
 T = TypeVar('T')
 R = TypeVar('R')
 
 
 class Backup(ABC, Generic[T]):
+    CACHE_SIZE = 200
+
+    _instances: ClassVar["WeakSet[Backup[Any]]"] = WeakSet()
+
     def __init__(self) -> None:
-        self._backedUp: deque[T] = deque(maxlen=200)
+        self._backedUp: LRUCache[Hashable, bool] = LRUCache(self.CACHE_SIZE)
+        Backup._instances.add(self)
+
+    @classmethod
+    def clear_caches(cls) -> None:
+        """forget what was backed up, so that the next run archives changes made since"""
+        for backup in cls._instances:
+            backup._backedUp = LRUCache(backup.CACHE_SIZE)
+
+    @classmethod
+    def log_cache_stats(cls) -> None:
+        for backup in cls._instances:
+            log.info("%s cache: %r", type(backup).__name__, backup._backedUp)
+
+    def key(self, obj: T) -> Hashable:
+        """identity of the object, objects with a known key are not backed up again"""
+        return cast(Hashable, getattr(obj, 'id'))
 
     @abstractmethod
     async def traverse_up(self, obj: T) -> None:
-        if obj not in self._backedUp:
-            self._backedUp.append(obj)
+        key = self.key(obj)
+        if self._backedUp.get(key) is None:
+            self._backedUp[key] = True
             await self.backup(obj)
 
     @abstractmethod
@@ -23,3 +49,20 @@ class Backup(ABC, Generic[T]):
     @abstractmethod
     async def traverse_down(self, obj: T) -> None:
         await self.traverse_up(obj)
+
+    async def traverse_down_many(self, objs: Sequence[T]) -> None:
+        """traverse down every object, backups that can write in bulk override this"""
+        for obj in objs:
+            await self.traverse_down(obj)
+
+    async def preload(self, objs: List[T]) -> None:
+        """load whatever is needed to back up objs in bulk, ahead of traversing them one by one"""
+        pass
+
+    async def flush(self) -> None:
+        """write out anything the backup is still holding in memory"""
+        pass
+
+    async def close(self) -> None:
+        """flush and stop whatever the backup runs in the background"""
+        await self.flush()
@@ -1,3 +1,5 @@
+from typing import Hashable
+
 import inject
 
 from bot.cogs.logger.processors._base import Backup
@@ -12,6 +14,9 @@ class AttachmentBackup(Backup[MessageAttachment]):
         self.attachment_repository = attachment_repository
         self.mapper = mapper
 
+    def key(self, attachment: MessageAttachment) -> Hashable:
+        return attachment.attachment.id
+
     async def traverse_up(self, attachment: MessageAttachment) -> None:
         await super().traverse_up(attachment)
 
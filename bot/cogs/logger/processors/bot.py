@@ -1,14 +1,29 @@
+import logging
+from typing import Hashable
+
 import discord
 import inject
 from discord.ext import commands
 
+from bot.db import FingerprintCache, UserRepository
 from . import Backup
 from ..history_iterator import HistoryIterator
+from ..message_iterator import MessageIterator
+from ..worker_pool import WorkerPool
+
+log = logging.getLogger(__name__)
 
 
 class BotBackup(Backup[commands.Bot]):
-    def __init__(self) -> None:
+    @inject.autoparams()
+    def __init__(self, pool: WorkerPool, fingerprints: FingerprintCache, user_repository: UserRepository) -> None:
         super().__init__()
+        self.pool = pool
+        self.fingerprints = fingerprints
+        self.user_repository = user_repository
+
+    def key(self, bot: commands.Bot) -> Hashable:
+        return id(bot)
 
     async def traverse_up(self, bot: commands.Bot) -> None:
         await super().traverse_up(bot)
@@ -23,11 +38,36 @@ class BotBackup(Backup[commands.Bot]):
         guild_backup: Backup[discord.Guild],
         message_backup: Backup[discord.Message]
     ) -> None:
+        Backup.clear_caches()
+        self.fingerprints.clear()
         await super().traverse_down(bot)
 
         for guild in bot.guilds:
             await guild_backup.traverse_down(guild)
+        await self.mark_departed_users(bot)
 
-        async for week in HistoryIterator(bot):
+        async def backup_week(week: MessageIterator) -> None:
             async for message in await week.history():
                 await message_backup.traverse_down(message)
+
+        # every batch holds at most one window per channel, so no channel is crawled twice at once,
+        # stops once a batch has no successfully crawled window (e.g. only inaccessible channels are left)
+        while await self.pool.run(backup_week, HistoryIterator(bot, flush=message_backup.flush, single_batch=True)):
+            pass
+
+        await message_backup.flush()
+        Backup.log_cache_stats()
+        log.info("upserts: %r", self.fingerprints)
+
+    async def mark_departed_users(self, bot: commands.Bot) -> None:
+        """
+        marks users that are no longer a member of any guild as deleted,
+        users are shared by all guilds, so a user leaving one guild stays while they are in another
+        """
+        if not all(guild.chunked for guild in bot.guilds):
+            log.warning("member lists are incomplete, not marking departed users")
+            return
+
+        member_ids = list({member.id for guild in bot.guilds for member in guild.members})
+        departed = await self.user_repository.soft_delete_missing(member_ids)
+        log.info("marked %d departed users as deleted", departed)
@@ -4,18 +4,29 @@ import discord
 import inject
 from discord import CategoryChannel
 
-from bot.db import CategoryMapper, CategoryRepository, CategoryEntity
+from bot.db import CategoryMapper, CategoryRepository, CategoryEntity, FingerprintCache
 from bot.cogs.logger.processors._base import Backup
+from bot.cogs.logger.worker_pool import WorkerPool
 
 log = logging.getLogger(__name__)
 
 
 class CategoryBackup(Backup[CategoryChannel]):
+    CACHE_SIZE = 1_000
+
     @inject.autoparams()
-    def __init__(self, category_repository: CategoryRepository, mapper: CategoryMapper) -> None:
+    def __init__(
+        self,
+        category_repository: CategoryRepository,
+        mapper: CategoryMapper,
+        pool: WorkerPool,
+        fingerprints: FingerprintCache
+    ) -> None:
         super().__init__()
         self.category_repository = category_repository
         self.mapper = mapper
+        self.pool = pool
+        self.fingerprints = fingerprints
 
     @inject.autoparams()
     async def traverse_up(self, category: CategoryChannel, guild_backup: Backup[discord.Guild]) -> None:
@@ -25,11 +36,10 @@ class CategoryBackup(Backup[CategoryChannel]):
     async def backup(self, category: CategoryChannel) -> None:
         log.debug('backing up category %s', category.name)
         entity: CategoryEntity = await self.mapper.map(category)
-        await self.category_repository.insert(entity)
+        await self.fingerprints.upsert(self.category_repository, entity)
 
     @inject.autoparams()
     async def traverse_down(self, category: CategoryChannel, channel_backup: Backup[discord.abc.GuildChannel]) -> None:
         await super().traverse_down(category)
 
-        for channel in category.channels:
-            await channel_backup.traverse_down(channel)
+        await self.pool.run(channel_backup.traverse_down, category.channels)
@@ -6,17 +6,25 @@ from discord.abc import GuildChannel
 
 from bot.cogs.logger.message_iterator import MessageIterator
 from bot.cogs.logger.processors._base import Backup
-from bot.db import ChannelRepository, ChannelMapper, ChannelEntity
+from bot.db import ChannelRepository, ChannelMapper, ChannelEntity, FingerprintCache
 
 log = logging.getLogger(__name__)
 
 
 class ChannelBackup(Backup[GuildChannel]):
+    CACHE_SIZE = 5_000
+
     @inject.autoparams()
-    def __init__(self, channel_repository: ChannelRepository, mapper: ChannelMapper) -> None:
+    def __init__(
+        self,
+        channel_repository: ChannelRepository,
+        mapper: ChannelMapper,
+        fingerprints: FingerprintCache
+    ) -> None:
         super().__init__()
         self.channel_repository = channel_repository
         self.mapper = mapper
+        self.fingerprints = fingerprints
 
     @inject.autoparams()
     async def traverse_up(
@@ -40,7 +48,7 @@ class ChannelBackup(Backup[GuildChannel]):
 
         log.debug('backing up channel %s', channel.name)
         entity: ChannelEntity = await self.mapper.map(channel)
-        await self.channel_repository.insert(entity)
+        await self.fingerprints.upsert(self.channel_repository, entity)
 
     @inject.autoparams()
     async def traverse_down(
@@ -63,7 +71,7 @@ class ChannelBackup(Backup[GuildChannel]):
                     await thread_backup.traverse_down(thread)
 
             if isinstance(channel, discord.TextChannel):
-                async for message in await MessageIterator(channel).history():
+                async for message in await MessageIterator(channel, flush=message_backup.flush).history():
                     await message_backup.traverse_down(message)
         except Exception as ex:
             log.error("Could not traverse_down channel %s, got %s", channel.name, ex)
@@ -1,22 +1,34 @@
 import logging
+from typing import Hashable
 
 import discord
 import inject
 from discord import Emoji
 
 from bot.cogs.logger.processors._base import Backup
-from bot.db import EmojiRepository, EmojiMapper, EmojiEntity
-from bot.utils import AnyEmote
+from bot.db import EmojiRepository, EmojiMapper, EmojiEntity, FingerprintCache
+from bot.utils import AnyEmote, get_emoji_id
 
 log = logging.getLogger(__name__)
 
 
 class EmojiBackup(Backup[AnyEmote]):
+    CACHE_SIZE = 10_000
+
     @inject.autoparams()
-    def __init__(self, emoji_repository: EmojiRepository, mapper: EmojiMapper) -> None:
+    def __init__(
+        self,
+        emoji_repository: EmojiRepository,
+        mapper: EmojiMapper,
+        fingerprints: FingerprintCache
+    ) -> None:
         super().__init__()
         self.emoji_repository = emoji_repository
         self.mapper = mapper
+        self.fingerprints = fingerprints
+
+    def key(self, emoji: AnyEmote) -> Hashable:
+        return get_emoji_id(emoji)
 
     @inject.autoparams()
     async def traverse_up(self, emoji: AnyEmote, guild_backup: Backup[discord.Guild]) -> None:
@@ -27,7 +39,7 @@ class EmojiBackup(Backup[AnyEmote]):
     async def backup(self, emoji: AnyEmote) -> None:
         log.debug('backing up emoji %s', emoji.name if hasattr(emoji, 'name') else emoji)
         entity: EmojiEntity = await self.mapper.map(emoji)
-        await self.emoji_repository.insert(entity)
+        await self.fingerprints.upsert(self.emoji_repository, entity)
 
     async def traverse_down(self, emoji: AnyEmote) -> None:
         await super().traverse_down(emoji)
@@ -4,19 +4,30 @@ import discord
 import inject
 from discord import Guild
 
-from bot.db import GuildRepository, GuildMapper, GuildEntity
+from bot.db import GuildRepository, GuildMapper, GuildEntity, FingerprintCache
 from bot.utils import AnyEmote
 from . import Backup
+from ..worker_pool import WorkerPool
 
 log = logging.getLogger(__name__)
 
 
 class GuildBackup(Backup[Guild]):
+    CACHE_SIZE = 100
+
     @inject.autoparams()
-    def __init__(self, guild_repository: GuildRepository, mapper: GuildMapper) -> None:
+    def __init__(
+        self,
+        guild_repository: GuildRepository,
+        mapper: GuildMapper,
+        pool: WorkerPool,
+        fingerprints: FingerprintCache
+    ) -> None:
         super().__init__()
         self.guild_repository = guild_repository
         self.mapper = mapper
+        self.pool = pool
+        self.fingerprints = fingerprints
 
     async def traverse_up(self, guild: Guild) -> None:
         await super().traverse_up(guild)
@@ -24,7 +35,7 @@ class GuildBackup(Backup[Guild]):
     async def backup(self, guild: Guild) -> None:
         log.debug('backing up guild %s', guild.name)
         entity: GuildEntity = await self.mapper.map(guild)
-        await self.guild_repository.insert(entity)
+        await self.fingerprints.upsert(self.guild_repository, entity)
 
     @inject.autoparams()
     async def traverse_down(
@@ -38,8 +49,7 @@ class GuildBackup(Backup[Guild]):
     ) -> None:
         await super().traverse_down(guild)
 
-        for user in guild.members:
-            await user_backup.traverse_down(user)
+        await user_backup.traverse_down_many(guild.members)
 
         for role in guild.roles:
             await role_backup.traverse_down(role)
@@ -47,8 +57,9 @@ class GuildBackup(Backup[Guild]):
         for emoji in guild.emojis:
             await emoji_backup.traverse_down(emoji)
 
-        for channel in filter(lambda ch: ch.category is None, guild.channels):
-            await channel_backup.traverse_down(channel)
-
         for category in guild.categories:
-            await category_backup.traverse_down(category)
+            await category_backup.traverse_up(category)
+
+        uncategorised = [ch for ch in guild.channels if ch.category is None]
+        categorised = [ch for category in guild.categories for ch in category.channels]
+        await self.pool.run(channel_backup.traverse_down, uncategorised + categorised)
@@ -1,5 +1,5 @@
-import asyncio
 import logging
+from typing import List
 
 import discord
 import inject
@@ -8,13 +8,18 @@ from discord.ext import commands
 
 from bot.db import MessageRepository, MessageMapper, MessageEntity, MessageEmojiMapper
 from bot.utils import MessageEmote, MessageAttachment
+from bot.utils.background_writer import BackgroundWriter
+from bot.utils.buffer import FlushBuffer
 from bot.cogs.logger.processors._base import Backup
 
 log = logging.getLogger(__name__)
 
 
 class MessageBackup(Backup[Message]):
-    rate_limiter = 0
+    CACHE_SIZE = 5_000
+    BUFFER_SIZE = 500
+    BUFFER_DELAY = 10.0
+    MAX_PENDING_BATCHES = 4
 
     @inject.autoparams()
     def __init__(
@@ -29,25 +34,32 @@ class MessageBackup(Backup[Message]):
         self.message_repository = message_repository
         self.mapper = mapper
         self.emoji_mapper = emoji_mapper
+        self._writer = BackgroundWriter[Message](self._write_many, self.MAX_PENDING_BATCHES)
+        self._buffer = FlushBuffer[Message](self._writer.put, self.BUFFER_SIZE, self.BUFFER_DELAY)
+        # written by the writer, their children are not backed up yet
+        self._written: List[Message] = []
+
+    async def traverse_up(self, message: Message) -> None:
+        if not isinstance(message.channel, (discord.abc.GuildChannel, discord.Thread)):
+            return
+
+        await self._traverse_parents(message)
+        await super().traverse_up(message)
 
     @inject.autoparams()
-    async def traverse_up(
+    async def _traverse_parents(
         self,
         message: Message,
         thread_backup: Backup[discord.Thread],
         channel_backup: Backup[discord.abc.GuildChannel],
         user_backup: Backup[discord.User | discord.Member]
     ) -> None:
-        if not isinstance(message.channel, (discord.abc.GuildChannel, discord.Thread)):
-            return
-
         if isinstance(message.channel, discord.abc.GuildChannel):
             await channel_backup.traverse_up(message.channel)
         elif isinstance(message.channel, discord.Thread):
             await thread_backup.traverse_up(message.channel)
 
         await user_backup.traverse_up(message.author)
-        await super().traverse_up(message)
 
     async def backup(self, message: Message) -> None:
         if not isinstance(message.channel, (discord.abc.GuildChannel, discord.Thread)):
@@ -60,24 +72,68 @@ class MessageBackup(Backup[Message]):
 
         self.bot.dispatch("message_backup", message)
 
+    async def traverse_down(self, message: Message) -> None:
+        """
+        the message itself is buffered and written in bulk by a background writer,
+        its reactions, attachments and emojis follow once the batch is written,
+        they are backed up by the callers of traverse_down and flush, so that crawlers do not queue behind the writer
+        """
+        if not isinstance(message.channel, (discord.abc.GuildChannel, discord.Thread)):
+            return
+
+        await self._traverse_parents(message)
+        self._backedUp[self.key(message)] = True
+        await self._buffer.add(message)
+        await self._traverse_written()
+
+    async def flush(self) -> None:
+        await self._buffer.flush()
+        await self._writer.join()
+        await self._traverse_written()
+
+    async def close(self) -> None:
+        try:
+            await self.flush()
+        finally:
+            await self._writer.close()
+
+    async def _write_many(self, messages: List[Message]) -> None:
+        log.debug('backing up %d messages', len(messages))
+
+        entities: List[MessageEntity] = [await self.mapper.map(message) for message in messages]
+        await self.message_repository.insert_many(entities)
+
+        for message in messages:
+            self.bot.dispatch("message_backup", message)
+        self._written.extend(messages)
+
+    @inject.autoparams('reaction_backup')
+    async def _traverse_written(self, reaction_backup: Backup[discord.Reaction]) -> None:
+        if not self._written:
+            return
+        messages, self._written = self._written, []
+
+        await reaction_backup.preload([reaction for message in messages for reaction in message.reactions])
+        for i, message in enumerate(messages):
+            try:
+                await self._traverse_children(message)
+            except BaseException:
+                self._written[:0] = messages[i:]
+                raise
+
     @inject.autoparams()
-    async def traverse_down(
+    async def _traverse_children(
         self,
         message: Message,
         reaction_backup: Backup[discord.Reaction],
         attachment_backup: Backup[MessageAttachment],
         message_emoji_backup: Backup[MessageEmote]
     ) -> None:
-        if not isinstance(message.channel, (discord.abc.GuildChannel, discord.Thread)):
-            return
-
-        await super().traverse_down(message)
-
         for reaction in message.reactions:
             await reaction_backup.traverse_down(reaction)
 
         for attachment in message.attachments:
             await attachment_backup.traverse_down(MessageAttachment(message, attachment))
 
-        for emoji in await self.emoji_mapper.map_emojis(self.bot, message):
+        for emoji in await self.emoji_mapper.map_emojis(message):
             await message_emoji_backup.traverse_down(emoji)
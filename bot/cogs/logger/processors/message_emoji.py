@@ -1,4 +1,5 @@
 import logging
+from typing import Hashable
 
 import discord
 import inject
@@ -6,7 +7,7 @@ from discord.ext import commands
 
 from bot.cogs.logger.processors._base import Backup
 from bot.db.discord import MessageEmojiEntity, MessageEmojiMapper, MessageEmojiRepository
-from bot.utils import MessageEmote, AnyEmote
+from bot.utils import MessageEmote, AnyEmote, get_emoji_id
 
 log = logging.getLogger(__name__)
 
@@ -19,6 +20,9 @@ class MessageEmojiBackup(Backup[MessageEmote]):
         self.repository = repository
         self.mapper = mapper
 
+    def key(self, message_emoji: MessageEmote) -> Hashable:
+        return message_emoji.message.id, get_emoji_id(message_emoji.emoji)
+
     @inject.autoparams()
     async def traverse_up(
         self,
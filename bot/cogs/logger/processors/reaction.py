@@ -1,18 +1,38 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
 import discord
 import inject
 from discord import Reaction
 
 from bot.db import ReactionRepository, ReactionMapper, ReactionEntity
-from bot.utils import AnyEmote
+from bot.utils import AnyEmote, get_emoji_id
+from bot.db.utils import Id
 from ._base import Backup
 
+log = logging.getLogger(__name__)
+
 
 class ReactionBackup(Backup[Reaction]):
+    """
+    server.reactions is kept up to date from live reaction events (the ledger),
+    reaction.users() is only paged through when the ledger disagrees with reaction.count
+    """
+
     @inject.autoparams()
     def __init__(self, reaction_repository: ReactionRepository, mapper: ReactionMapper) -> None:
         super().__init__()
         self.reaction_repository = reaction_repository
         self.mapper = mapper
+        self._ledger_counts: Dict[Tuple[Id, Id], int] = {}
+
+    def key(self, reaction: Reaction) -> Tuple[Id, Id]:
+        return reaction.message.id, get_emoji_id(reaction.emoji)
+
+    async def preload(self, reactions: List[Reaction]) -> None:
+        self._ledger_counts.update(await self.reaction_repository.find_member_counts(
+            [self.key(reaction) for reaction in reactions]
+        ))
 
     @inject.autoparams()
     async def traverse_up(
@@ -26,8 +46,23 @@ class ReactionBackup(Backup[Reaction]):
         await super().traverse_up(reaction)
 
     async def backup(self, reaction: Reaction) -> None:
+        key = self.key(reaction)
+        ledger_count: Optional[int]
+        if key in self._ledger_counts:
+            ledger_count = self._ledger_counts.pop(key)
+        else:
+            ledger_count = (await self.reaction_repository.find_member_counts([key])).get(key)
+
+        if ledger_count == reaction.count:
+            return
+
+        log.debug('reaction ledger of %s has %s of %d members, fetching them', key, ledger_count, reaction.count)
         entity: ReactionEntity = await self.mapper.map(reaction)
         await self.reaction_repository.insert(entity)
 
     async def traverse_down(self, reaction: Reaction) -> None:
-        await super().traverse_down(reaction)
+        """preloaded reactions are traversed down, the count is dropped even if the reaction was backed up already"""
+        try:
+            await super().traverse_down(reaction)
+        finally:
+            self._ledger_counts.pop(self.key(reaction), None)
@@ -4,7 +4,7 @@ import discord
 import inject
 from discord import Role
 
-from bot.db import RoleRepository, RoleMapper, RoleEntity
+from bot.db import RoleRepository, RoleMapper, RoleEntity, FingerprintCache
 from bot.cogs.logger.processors._base import Backup
 
 log = logging.getLogger(__name__)
@@ -12,10 +12,16 @@ log = logging.getLogger(__name__)
 
 class RoleBackup(Backup[Role]):
     @inject.autoparams()
-    def __init__(self, role_repository: RoleRepository, mapper: RoleMapper) -> None:
+    def __init__(
+        self,
+        role_repository: RoleRepository,
+        mapper: RoleMapper,
+        fingerprints: FingerprintCache
+    ) -> None:
         super().__init__()
         self.role_repository = role_repository
         self.mapper = mapper
+        self.fingerprints = fingerprints
 
     @inject.autoparams()
     async def traverse_up(self, role: Role, guild_backup: Backup[discord.Guild]) -> None:
@@ -25,7 +31,7 @@ class RoleBackup(Backup[Role]):
     async def backup(self, role: Role) -> None:
         log.debug("backing up role %s", role)
         entity: RoleEntity = await self.mapper.map(role)
-        await self.role_repository.insert(entity)
+        await self.fingerprints.upsert(self.role_repository, entity)
 
     async def traverse_down(self, role: Role) -> None:
         await self.backup(role)
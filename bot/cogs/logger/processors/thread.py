@@ -12,6 +12,8 @@ log = logging.getLogger(__name__)
 
 
 class ThreadBackup(Backup[Thread]):
+    CACHE_SIZE = 10_000
+
     @inject.autoparams()
     def __init__(self, repository: ThreadRepository, mapper: ThreadMapper) -> None:
         super().__init__()
@@ -40,5 +42,5 @@ class ThreadBackup(Backup[Thread]):
 
         await super().traverse_down(thread)
 
-        async for message in await MessageIterator(thread).history():
+        async for message in await MessageIterator(thread, flush=message_backup.flush).history():
             await message_backup.traverse_down(message)
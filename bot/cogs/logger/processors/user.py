@@ -1,21 +1,30 @@
 import logging
+from typing import List, Sequence
 
 import discord
 import inject
 from discord import User, Member
 
-from bot.db import UserRepository, UserMapper, UserEntity
+from bot.db import UserRepository, UserMapper, UserEntity, FingerprintCache
 from . import Backup
 
 log = logging.getLogger(__name__)
 
 
 class UserBackup(Backup[User | Member]):
+    CACHE_SIZE = 50_000
+
     @inject.autoparams()
-    def __init__(self, user_repository: UserRepository, mapper: UserMapper) -> None:
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        mapper: UserMapper,
+        fingerprints: FingerprintCache
+    ) -> None:
         super().__init__()
         self.user_repository = user_repository
         self.mapper = mapper
+        self.fingerprints = fingerprints
 
     @inject.autoparams()
     async def traverse_up(self, user: User | Member, guild_backup: Backup[discord.Guild]) -> None:
@@ -26,7 +35,17 @@ class UserBackup(Backup[User | Member]):
     async def backup(self, user: User | Member) -> None:
         log.debug('backing up user %s', user.name)
         entity: UserEntity = await self.mapper.map(user)
-        await self.user_repository.insert(entity)
+        await self.fingerprints.upsert(self.user_repository, entity)
 
     async def traverse_down(self, user: User | Member) -> None:
         await super().traverse_down(user)
+
+    async def traverse_down_many(self, users: Sequence[User | Member]) -> None:
+        """maps all users at once and writes the changed ones with a single staged upsert"""
+        pending = [user for user in users if self._backedUp.get(self.key(user)) is None]
+        for user in pending:
+            self._backedUp[self.key(user)] = True
+
+        log.debug('backing up %d users', len(pending))
+        entities: List[UserEntity] = [await self.mapper.map(user) for user in pending]
+        await self.fingerprints.upsert_many(self.user_repository, entities)
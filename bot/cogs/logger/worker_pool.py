@@ -0,0 +1,59 @@
+import asyncio
+import logging
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, TypeVar
+
+log = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+DEFAULT_CONCURRENCY = 4
+
+
+class WorkerPool:
+    """
+    runs a coroutine function over items with at most `concurrency` of them at once
+
+    an exception raised for one item is logged and does not stop the others,
+    cancelling `run` cancels all workers and waits for them to finish
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY) -> None:
+        assert concurrency > 0, "concurrency must be positive"
+        self.concurrency = concurrency
+
+    async def run(self, fn: Callable[[T], Awaitable[None]], items: Iterable[T] | AsyncIterable[T]) -> int:
+        """:returns: number of items processed without an exception"""
+        queue: asyncio.Queue[T] = asyncio.Queue(maxsize=self.concurrency)
+        processed = 0
+
+        async def worker() -> None:
+            nonlocal processed
+            while True:
+                item = await queue.get()
+                try:
+                    await fn(item)
+                    processed += 1
+                except Exception as ex:
+                    log.error("Could not process %s, got %s", item, ex)
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            async for item in _as_async(items):
+                await queue.put(item)
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return processed
+
+
+async def _as_async(items: Iterable[T] | AsyncIterable[T]) -> AsyncIterator[T]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
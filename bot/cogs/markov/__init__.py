@@ -1,17 +1,21 @@
 import logging
-from collections import deque
 from typing import Optional, cast
 
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 
 from bot.cogs.markov.generation_service import MarkovGenerationService
 from bot.cogs.markov.training_service import MarkovTrainingService
 from bot.utils import Context, requires_database
+from bot.utils.buffer import FlushBuffer
 from bot.utils.extra_types import GuildContext, GuildMessage
 
 log = logging.getLogger(__name__)
 
+# learned messages are written when this many are queued, or a minute after the first one
+TRAINING_QUEUE_SIZE = 500
+TRAINING_QUEUE_DELAY = 60.0
+
 
 class MarkovCog(commands.Cog):
     def __init__(
@@ -24,8 +28,12 @@ class MarkovCog(commands.Cog):
         self.generation_service = generation_service or MarkovGenerationService()
         self.training_service = training_service or MarkovTrainingService()
 
-        self.training_queue = deque[GuildMessage]()
-        self.train_message_task.start()
+        self.training_queue = FlushBuffer[GuildMessage](
+            self.training_service.train_messages, max_size=TRAINING_QUEUE_SIZE, max_delay=TRAINING_QUEUE_DELAY
+        )
+
+    async def cog_unload(self) -> None:
+        await self.training_queue.flush()
 
     @commands.group(invoke_without_command=True)
     @commands.guild_only()
@@ -52,16 +60,18 @@ class MarkovCog(commands.Cog):
         await self.training_service.train(ctx.guild.id)
         await ctx.reply("[markov] Finished training", mention_author=True)
 
+    @markov.command(name='stats')
+    @commands.has_permissions(administrator=True)
+    async def stats(self, ctx: Context) -> None:
+        flushes = self.training_service.flush_stats
+        await ctx.send(f"training queue: {len(self.training_queue)} messages\n"
+                       f"flushes: {flushes.calls}, {flushes.rows} messages, "
+                       f"mean {flushes.mean * 1000:.1f} ms, max {flushes.max * 1000:.1f} ms")
+
     @commands.Cog.listener()
     async def on_message_backup(self, message: discord.Message) -> None:
         if self.training_service.should_learn_message(message):
-            self.training_queue.append(cast(GuildMessage, message))
-
-    @tasks.loop(minutes=1)
-    async def train_message_task(self) -> None:
-        while self.training_queue:
-            message = self.training_queue.popleft()
-            await self.training_service.train_message(message.guild.id, message.content)
+            await self.training_queue.add(cast(GuildMessage, message))
 
     async def markov_from_message(self, message: discord.Message) -> bool:
         assert self.bot.user, "bot must be signed in"
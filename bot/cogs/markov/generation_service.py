@@ -1,45 +1,37 @@
-import random
 from typing import Optional, Tuple
 
 import inject
 from discord.utils import get
 
+from bot.cogs.markov.model import MarkovModel, MarkovModels
 from bot.constants import CONFIG
-from bot.db import MarkovRepository, UnitOfWork, DBConnection
 
 DEFAULT_CONTEXT_SIZE = 8
 
 
 class MarkovGenerationService:
-    @inject.autoparams('markov_repository', 'uow')
-    def __init__(self, markov_repository: MarkovRepository, uow: UnitOfWork) -> None:
-        self.markov_repository = markov_repository
-        self.uow = uow
+    @inject.autoparams('models')
+    def __init__(self, models: MarkovModels) -> None:
+        self.models = models
 
     async def generate(self, guild_id: int, start: str = '', limit: int = 4_000) -> str:
-        async with self.uow.transaction(readonly=True) as transcation:
-            (message, follows) = await self._try_to_find_start(guild_id, start, conn=transcation.conn)
-            while follows is not None and len(message) < limit:
-                message += follows
-                follows = await self._find_next(guild_id, message, conn=transcation.conn)
-            return message
-
-    async def _try_to_find_start(self, guild_id: int, message: str, conn: DBConnection) -> Tuple[str, Optional[str]]:
-        follows = await self._find_next(guild_id, message, conn)
+        """generates in memory from the model of the guild, the database is only read to load the model"""
+        model = await self.models.get(guild_id)
+        context_size = self._get_context_size(guild_id)
+        (message, follows) = self._try_to_find_start(model, start, context_size)
+        while follows is not None and len(message) < limit:
+            message += follows
+            follows = model.next(message[-context_size:])
+        return message
+
+    @staticmethod
+    def _try_to_find_start(model: MarkovModel, message: str, context_size: int) -> Tuple[str, Optional[str]]:
+        follows = model.next(message[-context_size:])
         if not follows:
             message = ""
-            follows = await self._find_next(guild_id, "", conn)
+            follows = model.next("")
         return message, follows
 
-    async def _find_next(self, guild_id: int, message: str, conn: DBConnection) -> Optional[str]:
-        context_size = self._get_context_size(guild_id)
-        if not (options := await self.markov_repository.find_random_next(guild_id, context=message[-context_size:], conn=conn)):
-            return None
-
-        follows = [option.follows for option in options]
-        frequencies = [option.frequency for option in options]
-        return random.choices(follows, weights=frequencies, k=1)[0]
-
     @staticmethod
     def _get_context_size(guild_id: int) -> int:
         if not (guild_config := get(CONFIG.guilds, id=guild_id)):
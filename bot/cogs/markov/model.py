@@ -0,0 +1,124 @@
+import logging
+import random
+import sys
+from array import array
+from typing import Dict, Optional, Tuple
+
+import inject
+
+from bot.db import MarkovRepository
+from bot.db.utils import AsyncTTLCache, Id
+from bot.utils.lru_cache import LRUCache
+
+log = logging.getLogger(__name__)
+
+__all__ = ['AliasTable', 'MarkovModel', 'MarkovModels']
+
+
+class AliasTable:
+    """
+    Vose's alias method, draws one of the characters weighted by the frequencies in constant time
+
+    slot i keeps characters[i] with probability probability[i], otherwise it is replaced by characters[alias[i]]
+    """
+    __slots__ = ('characters', 'probability', 'alias')
+
+    def __init__(self, characters: str, frequencies: "array[int]") -> None:
+        size = len(characters)
+        total = sum(frequencies)
+        self.characters = characters
+        self.probability = array('d', (frequency * size / total for frequency in frequencies))
+        self.alias = array('l', range(size))
+
+        small = [i for i, probability in enumerate(self.probability) if probability < 1.0]
+        large = [i for i, probability in enumerate(self.probability) if probability >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.alias[less] = more
+            self.probability[more] += self.probability[less] - 1.0
+            (small if self.probability[more] < 1.0 else large).append(more)
+        # what is left is 1.0 up to rounding errors
+        for i in small + large:
+            self.probability[i] = 1.0
+
+    def draw(self) -> str:
+        slot, coin = divmod(random.random() * len(self.characters), 1.0)
+        i = int(slot)
+        return self.characters[i if coin < self.probability[i] else self.alias[i]]
+
+
+class MarkovModel:
+    """
+    the follow characters of every context with their frequencies,
+    the next character is drawn from an alias table of the context,
+    built on first use and kept for the `capacity` most recently used contexts
+
+    contexts are interned, the follow characters of a context are a single string
+    """
+    __slots__ = ('_options', '_tables')
+
+    def __init__(self, capacity: int = 8192) -> None:
+        self._options: Dict[str, Tuple[str, "array[int]"]] = {}
+        self._tables: LRUCache[str, AliasTable] = LRUCache(capacity)
+
+    def __len__(self) -> int:
+        return len(self._options)
+
+    @property
+    def tables(self) -> LRUCache[str, AliasTable]:
+        return self._tables
+
+    def add(self, context: str, follows: str, frequency: int = 1) -> None:
+        assert len(follows) == 1, "follows is a single character"
+        self._tables.pop(context)
+        if (options := self._options.get(context)) is None:
+            self._options[sys.intern(context)] = (follows, array('q', [frequency]))
+            return
+
+        characters, frequencies = options
+        if (index := characters.find(follows)) == -1:
+            self._options[context] = (characters + follows, frequencies)
+            frequencies.append(frequency)
+            return
+        frequencies[index] += frequency
+
+    def next(self, context: str) -> Optional[str]:
+        if (table := self._tables.get(context)) is None:
+            if (options := self._options.get(context)) is None:
+                return None
+            table = self._tables[context] = AliasTable(*options)
+        return table.draw()
+
+
+class MarkovModels:
+    """
+    models of the guilds, loaded from cogs.markov on first use and reloaded after `ttl` seconds,
+    the database stays the durable store, trained messages are added to the loaded models as well
+    """
+
+    @inject.autoparams('markov_repository')
+    def __init__(self, markov_repository: MarkovRepository, ttl: float = 3600, capacity: int = 16) -> None:
+        self.markov_repository = markov_repository
+        self._models = AsyncTTLCache[MarkovModel](ttl, capacity)
+
+    async def get(self, guild_id: Id) -> MarkovModel:
+        return await self._models.get_or_load(self._models.key(guild_id), lambda: self._load(guild_id))
+
+    def loaded(self, guild_id: Id) -> Optional[MarkovModel]:
+        """the model of the guild if it is loaded, training only has to update loaded models"""
+        return self._models.peek(guild_id)
+
+    def invalidate(self, guild_id: Optional[Id] = None) -> None:
+        """drop the model of the guild, or of all guilds, it is loaded again on next use"""
+        if guild_id is None:
+            self._models.clear()
+        else:
+            self._models.invalidate(guild_id)
+
+    async def _load(self, guild_id: Id) -> MarkovModel:
+        model = MarkovModel()
+        async for rows in self.markov_repository.find_model(guild_id):
+            for row in rows:
+                model.add(row.context, row.follows, row.frequency)
+        log.info("loaded markov model of guild %d with %d contexts", guild_id, len(model))
+        return model
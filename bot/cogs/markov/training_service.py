@@ -1,26 +1,46 @@
 import logging
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import discord
 import inject
 from discord.utils import get
 
+from bot.cogs.markov.model import MarkovModels
 from bot.constants import CONFIG
-from bot.db import MessageRepository, UnitOfWork
+from bot.db import MessageRepository
 from bot.db.cogs import MarkovEntity, MarkovRepository
+from bot.db.utils.query_stats import MethodStats
+from bot.utils.extra_types import GuildMessage
 from bot.utils.progress import ProgressReporter
 
 log = logging.getLogger(__name__)
 
 DEFAULT_CONTEXT_SIZE = 8
+# (context, follows) pairs counted in memory before they are added to cogs.markov
+TRAINING_BATCH_SIZE = 200_000
+
+Ngrams = Counter[Tuple[str, str]]
+
+
+def count_ngrams(messages: Iterable[str], context_size: int, counts: Optional[Ngrams] = None) -> Ngrams:
+    """count the (context, follows) pairs of the messages, adds to counts if given"""
+    counts = Counter() if counts is None else counts
+    for message in messages:
+        counts.update((message[max(0, i - context_size):i], message[i]) for i in range(len(message)))
+    return counts
 
 
 class MarkovTrainingService:
-    @inject.autoparams('message_repository', 'markov_repository', 'uow')
+    @inject.autoparams('message_repository', 'markov_repository', 'models')
     def __init__(self, message_repository: MessageRepository, markov_repository: MarkovRepository,
-                 uow: UnitOfWork) -> None:
+                 models: MarkovModels) -> None:
         self.message_repository = message_repository
         self.markov_repository = markov_repository
-        self.uow = uow
+        self.models = models
+        # latency of the batched writes of live training, rows are the trained messages
+        self.flush_stats = MethodStats()
 
     @staticmethod
     def should_learn_message(message: discord.Message) -> bool:
@@ -31,7 +51,11 @@ class MarkovTrainingService:
         )
 
     async def train(self, guild_id: int) -> None:
-        await self.markov_repository.truncate()
+        """
+        rebuild the model of the guild in cogs.markov_shadow and swap it in when done,
+        generation keeps using the old model meanwhile
+        """
+        await self.markov_repository.clear_shadow(guild_id)
 
         progress = ProgressReporter(
             max_count=await self.message_repository.count(),
@@ -40,23 +64,41 @@ class MarkovTrainingService:
         )
 
         log.info("training in guild %d started", guild_id)
-        async with self.uow.transaction(readonly=True) as transaction:
-            paginator = await self.markov_repository.find_training_messages(guild_id, conn=transaction.conn)
-            async for messages in paginator:
-                for message in messages:
-                    await self.train_message(guild_id, message.content)
-                    progress.increment()
+        context_size = self._get_context_size(guild_id)
+        counts: Ngrams = Counter()
+        async for messages in self.markov_repository.find_training_messages(guild_id):
+            count_ngrams((message.content for message in messages), context_size, counts)
+            progress.increment(len(messages))
+            if len(counts) >= TRAINING_BATCH_SIZE:
+                await self.markov_repository.insert_many(self._entities(guild_id, counts), shadow=True)
+                counts.clear()
+        await self.markov_repository.insert_many(self._entities(guild_id, counts), shadow=True)
+        await self.markov_repository.swap_shadow(guild_id)
+        self.models.invalidate(guild_id)
         log.info("training in guild %d finished", guild_id)
 
-    async def train_message(self, guild_id: int, message: str) -> None:
-        context_size = self._get_context_size(guild_id)
-        async with self.uow.transaction() as transaction:
-            for i in range(len(message)):
-                context = message[max(0, i - context_size):i]
-                follows = message[i]
+    async def train_messages(self, messages: List[GuildMessage]) -> None:
+        """counts of all messages are aggregated into one delta per guild and written with a single upsert"""
+        started = time.perf_counter()
+        contents: Dict[int, List[str]] = defaultdict(list)
+        for message in messages:
+            contents[message.guild.id].append(message.content)
 
-                entity = MarkovEntity(guild_id, context, follows)
-                await self.markov_repository.insert(entity, conn=transaction.conn)
+        deltas = {guild_id: count_ngrams(guild_contents, self._get_context_size(guild_id))
+                  for guild_id, guild_contents in contents.items()}
+        await self.markov_repository.insert_many(
+            [entity for guild_id, counts in deltas.items() for entity in self._entities(guild_id, counts)]
+        )
+
+        for guild_id, counts in deltas.items():
+            if (model := self.models.loaded(guild_id)) is not None:
+                for (context, follows), frequency in counts.items():
+                    model.add(context, follows, frequency)
+        self.flush_stats.record(time.perf_counter() - started, len(messages), 0.0)
+
+    @staticmethod
+    def _entities(guild_id: int, counts: Ngrams) -> List[MarkovEntity]:
+        return [MarkovEntity(guild_id, context, follows, frequency) for (context, follows), frequency in counts.items()]
 
     @staticmethod
     def _get_context_size(guild_id: int) -> int:
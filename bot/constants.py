@@ -137,6 +137,24 @@ class ColorConfig(yaml.YAMLObject):
     MUNI_YELLOW: Optional[int] = None
 
 
+@enforce_types
+@dataclass(frozen=True)
+class LoggerConfig(yaml.YAMLObject):
+    yaml_tag = u'!logger'
+
+    concurrency: int = 4
+
+
+@enforce_types
+@dataclass(frozen=True)
+class DatabaseConfig(yaml.YAMLObject):
+    yaml_tag = u'!database'
+
+    instrument: bool = False
+    slow_query_ms: int = 500
+    migrate: bool = True
+
+
 @enforce_types
 @dataclass(frozen=True)
 class Config(yaml.YAMLObject):
@@ -146,6 +164,8 @@ class Config(yaml.YAMLObject):
     emoji: EmojiConfig
     colors: ColorConfig
     guilds: List[GuildConfig]
+    logger: LoggerConfig = field(default_factory=LoggerConfig)
+    database: DatabaseConfig = field(default_factory=DatabaseConfig)
 
 
 T = TypeVar('T', bound=yaml.YAMLObject)
@@ -177,6 +197,8 @@ def get_loader() -> Type[yaml.Loader]:
     loader.add_constructor("!markov", class_loader(MarkovConfig))
     loader.add_constructor("!emojis", class_loader(EmojiConfig))
     loader.add_constructor("!colors", class_loader(ColorConfig))
+    loader.add_constructor("!logger", class_loader(LoggerConfig))
+    loader.add_constructor("!database", class_loader(DatabaseConfig))
     loader.add_constructor("!Config", class_loader(Config))
     return loader
 
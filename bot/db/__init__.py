@@ -1,13 +1,13 @@
 import asyncio
 import logging
 import socket
-from typing import Optional
+from typing import Optional, cast
 
 import asyncpg
 import inject
 
 __all__ = [
-    "UnitOfWork", "Url", "Page", "Pool", "Record", "DBConnection",
+    "UnitOfWork", "TransactionContext", "ReadPool", "Url", "Page", "KeysetPage", "Pool", "Record", "DBConnection", "FingerprintCache", "QUERY_STATS",
 
     "AttachmentMapper", "CategoryMapper", "ChannelMapper", "ThreadMapper", "EmojiMapper",
     "GuildMapper", "MessageMapper", "MessageEmojiMapper", "ReactionMapper",
@@ -29,7 +29,8 @@ __all__ = [
 ]
 
 # ---- utils ----
-from bot.db.utils import UnitOfWork, Url, Page, Pool, Record, DBConnection
+from bot.db.utils import UnitOfWork, TransactionContext, Url, Page, KeysetPage, Pool, Record, DBConnection, FingerprintCache
+from bot.db.utils import Statements, QUERY_STATS, ReadPool, connect_sqlite
 
 # ---- discord ----
 from bot.db.discord import (AttachmentMapper, CategoryMapper, ChannelMapper, EmojiMapper,
@@ -62,14 +63,19 @@ def setup_injections(binder: inject.Binder) -> None:
     binder.install(setup_cogs_injections)
 
     binder.bind_to_constructor(UnitOfWork, UnitOfWork)
+    binder.bind_to_constructor(FingerprintCache, FingerprintCache)
 
 
 async def connect_db(url: Url) -> Optional[Pool]:
+    """a sqlite:///path url opens the embedded SQLite backend, see `bot.db.utils.sqlite`"""
+    if url.startswith('sqlite:'):
+        return cast(Pool, await connect_sqlite(url))
+
     pool: Pool | None = None
     attempts = 0
     while pool is None:
         try:
-            pool = await asyncpg.create_pool(url, command_timeout=1280)
+            pool = await asyncpg.create_pool(url, command_timeout=1280, statement_cache_size=Statements.cache_size())
         except (socket.gaierror, OSError) as ex:
             log.error("Failed to connect to database: %s", ex)
             return None
@@ -16,7 +16,7 @@ class LeaderboardFilter:
     exclude_channel_ids: List[Id]
 
 
-@dataclass
+@dataclass(slots=True)
 class LeaderboardEntity(Entity):
     __table_name__ = "cogs.leaderboard"
 
@@ -77,7 +77,7 @@ class LeaderboardRepository(Table[LeaderboardEntity]):
     @inject_conn
     async def get_top10(self, conn: DBConnection) -> List[LeaderboardEntity]:
         rows = await conn.fetch(f"SELECT * FROM ldb_lookup LIMIT 10")
-        return [LeaderboardEntity.convert(row) for row in rows]
+        return LeaderboardEntity.convert_many(rows)
 
     @inject_conn
     async def get_around(self, conn: DBConnection, id: Id) -> List[LeaderboardEntity]:
@@ -88,21 +88,23 @@ class LeaderboardRepository(Table[LeaderboardEntity]):
                 WHERE author_id = $1
             )
 
-            (   SELECT *
+            SELECT * FROM (
+                SELECT *
                 FROM ldb_lookup
                 WHERE sent_total >= (SELECT * FROM desired_count) AND
                       author_id <> $1
                 ORDER BY sent_total LIMIT 2
-            ) UNION (
+            ) AS above UNION SELECT * FROM (
                 SELECT *
                 FROM ldb_lookup
                 WHERE sent_total = (SELECT * FROM desired_count) AND
                       author_id = $1 LIMIT 1
-            ) UNION (
+            ) AS author UNION SELECT * FROM (
                 SELECT *
                 FROM ldb_lookup
                 WHERE sent_total < (SELECT * FROM desired_count) AND
                       author_id <> $1 LIMIT 2
-            ) ORDER BY sent_total DESC
+            ) AS below
+            ORDER BY sent_total DESC
         """, id)
-        return [LeaderboardEntity.convert(row) for row in rows]
+        return LeaderboardEntity.convert_many(rows)
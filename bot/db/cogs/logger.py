@@ -2,14 +2,14 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional, Tuple, NamedTuple, List
 
-from bot.db.utils import Id, Entity, Table, DBConnection, inject_conn
+from bot.db.utils import Id, Entity, Table, DBConnection, inject_conn, Statements
 
 __all__ = [
     'LoggerEntity', 'LoggerRepository'
 ]
 
 
-@dataclass
+@dataclass(slots=True)
 class LoggerEntity(Entity):
     __table_name__ = "cogs.logger"
 
@@ -19,26 +19,123 @@ class LoggerEntity(Entity):
     finished_at: Optional[datetime] = None
 
 
+# first uncovered time range (gap) of each channel with a finished process,
+# the time before the channel creation (taken from its snowflake) counts as covered
+_COVERAGE = """
+    processes AS (
+        SELECT channel_id, from_date, to_date
+        FROM cogs.logger
+        WHERE to_date IS NOT NULL AND {where}
+    ), islands AS (
+        SELECT DISTINCT channel_id,
+               to_timestamp(((channel_id >> 22) + 1420070400000) / 1000.0) AS from_date,
+               to_timestamp(((channel_id >> 22) + 1420070400000) / 1000.0) AS to_date
+        FROM processes
+        UNION ALL
+        SELECT channel_id, from_date, to_date FROM processes
+    ), coverage AS (
+        SELECT channel_id, from_date,
+               MAX(to_date) OVER (
+                   PARTITION BY channel_id ORDER BY from_date ROWS UNBOUNDED PRECEDING
+               ) AS covered_until,
+               LEAD(from_date) OVER (PARTITION BY channel_id ORDER BY from_date) AS next_from
+        FROM islands
+    ), gaps AS ({gaps})
+"""
+
+_GAPS = """
+        SELECT DISTINCT ON (channel_id) channel_id, covered_until AS from_date, next_from AS to_date
+        FROM coverage
+        WHERE next_from IS NULL OR next_from > covered_until
+        ORDER BY channel_id, from_date
+"""
+
+# SQLite has no DISTINCT ON
+_SQLITE_GAPS = """
+        SELECT channel_id, from_date, to_date
+        FROM (
+            SELECT channel_id, covered_until AS from_date, next_from AS to_date,
+                   ROW_NUMBER() OVER (PARTITION BY channel_id ORDER BY from_date) AS gap_no
+            FROM coverage
+            WHERE next_from IS NULL OR next_from > covered_until
+        ) AS numbered
+        WHERE gap_no = 1
+"""
+
+
 class LoggerRepository(Table[LoggerEntity]):
+    statements = Statements(
+        begin_process="""
+            INSERT INTO cogs.logger VALUES ($1, $2, NULL, NULL)
+            ON CONFLICT (channel_id, from_date) DO NOTHING
+        """,
+        end_process="""
+            UPDATE cogs.logger
+            SET to_date=$3, finished_at=NOW()
+            WHERE channel_id=$1 AND from_date=$2
+        """,
+        checkpoint_process="""
+            UPDATE cogs.logger
+            SET to_date=$3
+            WHERE channel_id=$1 AND from_date=$2 AND finished_at IS NULL
+        """,
+        extend_live_process="""
+            INSERT INTO cogs.logger AS l VALUES ($1, $2, $3, NOW())
+            ON CONFLICT (channel_id, from_date) DO UPDATE
+                SET to_date=GREATEST(l.to_date, excluded.to_date),
+                    finished_at=NOW()
+        """,
+        find_next_gap=f"""
+            WITH {_COVERAGE.format(where='channel_id=$1', gaps=_GAPS)}
+            SELECT from_date, to_date
+            FROM gaps
+        """,
+        find_updatable_processes=f"""
+            WITH {_COVERAGE.format(where='TRUE', gaps=_GAPS)}
+            SELECT channel_id, from_date AS to_date
+            FROM gaps AS t
+            INNER JOIN server.channels as c
+                ON c.id = t.channel_id
+            WHERE (t.to_date IS NOT NULL OR t.from_date + interval '7 days' < now()) AND
+                  c.deleted_at IS NULL
+        """,
+    ).dialect(
+        # computed timestamps of SQLite need their type in the column name
+        'sqlite',
+        find_next_gap=f"""
+            WITH {_COVERAGE.format(where='channel_id=$1', gaps=_SQLITE_GAPS)}
+            SELECT from_date AS "from_date [timestamptz]", to_date AS "to_date [timestamptz]"
+            FROM gaps
+        """,
+        find_updatable_processes=f"""
+            WITH {_COVERAGE.format(where='TRUE', gaps=_SQLITE_GAPS)}
+            SELECT channel_id, from_date AS "to_date [timestamptz]"
+            FROM gaps AS t
+            INNER JOIN server.channels as c
+                ON c.id = t.channel_id
+            WHERE (t.to_date IS NOT NULL OR t.from_date + interval '7 days' < now()) AND
+                  c.deleted_at IS NULL
+        """,
+    )
+
     def __init__(self) -> None:
         super().__init__(entity=LoggerEntity)
 
     @inject_conn
     async def begin_process(self, conn: DBConnection, data: Tuple[Id, datetime]) -> None:
         channel_id, from_date = data
-        await conn.execute(f"""
-            INSERT INTO cogs.logger VALUES ($1, $2, NULL, NULL)
-            ON CONFLICT (channel_id, from_date) DO NOTHING
-        """, channel_id, from_date)
+        await self.statements.execute(conn, 'begin_process', channel_id, from_date)
 
     @inject_conn
     async def end_process(self, conn: DBConnection, data: Tuple[Id, datetime, datetime]) -> None:
         channel_id, from_date, to_date = data
-        await conn.execute(f"""
-            UPDATE cogs.logger
-            SET to_date=$3, finished_at=NOW()
-            WHERE channel_id=$1 AND from_date=$2
-        """, channel_id, from_date, to_date)
+        await self.statements.execute(conn, 'end_process', channel_id, from_date, to_date)
+
+    @inject_conn
+    async def checkpoint_process(self, conn: DBConnection, data: Tuple[Id, datetime, datetime]) -> None:
+        """advance a running process, the range up to the checkpoint counts as covered"""
+        channel_id, from_date, checkpoint = data
+        await self.statements.execute(conn, 'checkpoint_process', channel_id, from_date, checkpoint)
 
     @inject_conn
     async def insert_process(self, conn: DBConnection, data: Tuple[Id, datetime, datetime]) -> None:
@@ -49,29 +146,31 @@ class LoggerRepository(Table[LoggerEntity]):
            """, channel_id, from_date, to_date)
 
     @inject_conn
-    async def find_last_process(self, conn: DBConnection, channel_id: Id) -> Optional[LoggerEntity]:
-        row = await conn.fetchrow(f"""
-            SELECT * 
-            FROM cogs.logger
-            WHERE channel_id=$1
-            ORDER BY to_date DESC
-        """, channel_id)
-        return LoggerEntity.convert(row) if row else None
+    async def extend_live_process(self, conn: DBConnection, data: Tuple[Id, datetime, datetime]) -> None:
+        channel_id, from_date, to_date = data
+        await self.statements.execute(conn, 'extend_live_process', channel_id, from_date, to_date)
+
+    Gap = NamedTuple('Gap', [('from_date', datetime), ('to_date', Optional[datetime])])
+
+    @inject_conn
+    async def find_next_gap(self, conn: DBConnection, channel_id: Id) -> Optional["LoggerRepository.Gap"]:
+        """
+        first time range of the channel not covered by a finished process,
+        to_date is None if the gap reaches up to now
+
+        a process interrupted after a checkpoint covers the range up to the checkpoint,
+        so the next crawl resumes from there
+
+        returns None if the channel has no finished process yet
+        """
+        row = await self.statements.fetchrow(conn, 'find_next_gap', channel_id)
+        return self.Gap(*row.values()) if row else None
 
     UpdatableProcesses = NamedTuple('UpdatableProcesses', [('channel_id', Id), ('to_date', datetime)])
 
     @inject_conn
     async def find_updatable_processes(self, conn: DBConnection) -> List["LoggerRepository.UpdatableProcesses"]:
-        rows = await conn.fetch(f"""
-            SELECT channel_id, to_date
-            FROM (
-                SELECT channel_id, MAX(to_date) as to_date
-                FROM cogs.logger
-                GROUP BY channel_id
-            ) t
-            INNER JOIN server.channels as c 
-                ON c.id = t.channel_id
-            WHERE t.to_date + interval '7 days' < now() AND
-                  c.deleted_at IS NULL
-        """)
+        """channels with a gap between processes or not processed for over a week"""
+        rows = await self.statements.fetch(conn, 'find_updatable_processes')
         return [self.UpdatableProcesses(*row.values()) for row in rows]
+
@@ -1,15 +1,17 @@
 from dataclasses import dataclass
+from datetime import datetime
 from typing import NamedTuple, List
 
-from bot.db.discord.messages import MessageEntity
-from bot.db.utils import Id, Entity, Table, DBConnection, inject_conn, Page
+from bot.db.discord.messages import FIRST_MESSAGE_AT, MessageEntity
+from bot.db.utils import (Id, Entity, Table, DBConnection, inject_conn, inject_read_conn, KeysetPage, Statements,
+                          copy_to_staging)
 
 __all__ = [
     'MarkovEntity', 'MarkovRepository'
 ]
 
 
-@dataclass
+@dataclass(slots=True)
 class MarkovEntity(Entity):
     __table_name__ = "cogs.markov"
 
@@ -20,28 +22,57 @@ class MarkovEntity(Entity):
 
 
 class MarkovRepository(Table[MarkovEntity]):
+    statements = Statements(
+        insert="""
+            INSERT INTO cogs.markov AS m (guild_id, context, follows, frequency)
+            VALUES ($1, $2, $3, $4)
+            ON CONFLICT (guild_id, context, follows) DO UPDATE
+                SET frequency = m.frequency + 1
+        """,
+        find_random_next="""
+            SELECT follows, frequency
+            FROM cogs.markov
+            WHERE guild_id = $1 AND
+                  context = $2
+        """,
+    )
+
     def __init__(self) -> None:
         super().__init__(entity=MarkovEntity)
 
     @inject_conn
     async def insert(self, conn: DBConnection, data: MarkovEntity) -> None:
-        await conn.execute("""
-            INSERT INTO cogs.markov AS m (guild_id, context, follows, frequency)
-            VALUES ($1, $2, $3, $4)
-            ON CONFLICT (guild_id, context, follows) DO UPDATE
-                SET frequency = m.frequency + 1
-        """, data.guild_id, data.context, data.follows, data.frequency)
+        await self.statements.execute(conn, 'insert', data.guild_id, data.context, data.follows, data.frequency)
+
+    @inject_conn
+    async def insert_many(self, conn: DBConnection, data: List[MarkovEntity], shadow: bool = False) -> None:
+        """
+        add the frequencies to the stored ones, with one COPY and one upsert for all of them,
+        into cogs.markov_shadow when retraining
+        """
+        if not data:
+            return
+
+        table = "cogs.markov_shadow" if shadow else "cogs.markov"
+        columns = ('guild_id', 'context', 'follows', 'frequency')
+        records = [(entity.guild_id, entity.context, entity.follows, entity.frequency) for entity in data]
+
+        async with conn.transaction():
+            staging = await copy_to_staging(conn, table, columns, records)
+            await conn.execute(f"""
+                INSERT INTO {table} AS m (guild_id, context, follows, frequency)
+                SELECT guild_id, context, follows, SUM(frequency)
+                FROM {staging}
+                GROUP BY guild_id, context, follows
+                ON CONFLICT (guild_id, context, follows) DO UPDATE
+                    SET frequency = m.frequency + excluded.frequency
+            """)
 
     Next = NamedTuple('Next', [('follows', str), ('frequency', int)])
 
-    @inject_conn
+    @inject_read_conn
     async def find_random_next(self, conn: DBConnection, guild_id: Id, context: str) -> List["MarkovRepository.Next"]:
-        rows = await conn.fetch("""
-            SELECT follows, frequency
-            FROM cogs.markov 
-            WHERE guild_id = $1 AND
-                  context = $2
-        """, guild_id, context)
+        rows = await self.statements.fetch(conn, 'find_random_next', guild_id, context)
         return [self.Next(*row.values()) for row in rows]
 
     @inject_conn
@@ -51,14 +82,50 @@ class MarkovRepository(Table[MarkovEntity]):
         """)
 
     @inject_conn
-    async def find_training_messages(self, conn: DBConnection, guild_id: int) -> Page[MessageEntity]:
-        cursor = await conn.cursor(f"""
+    async def clear_shadow(self, conn: DBConnection, guild_id: Id) -> None:
+        """drop the rows of an interrupted retraining of the guild"""
+        await conn.execute("""
+            DELETE FROM cogs.markov_shadow
+            WHERE guild_id = $1
+        """, guild_id)
+
+    @inject_conn
+    async def swap_shadow(self, conn: DBConnection, guild_id: Id) -> None:
+        """replace the model of the guild with the retrained one in a single transaction, other guilds are untouched"""
+        async with conn.transaction():
+            await conn.execute("""
+                DELETE FROM cogs.markov
+                WHERE guild_id = $1
+            """, guild_id)
+            await conn.execute("""
+                INSERT INTO cogs.markov (guild_id, context, follows, frequency)
+                SELECT guild_id, context, follows, frequency
+                FROM cogs.markov_shadow
+                WHERE guild_id = $1
+            """, guild_id)
+            await conn.execute("""
+                DELETE FROM cogs.markov_shadow
+                WHERE guild_id = $1
+            """, guild_id)
+
+    def find_model(self, guild_id: Id, per_page: int = 10_000) -> KeysetPage[MarkovEntity]:
+        """all (context, follows) frequencies of the guild, in pages so that no connection is held"""
+        return KeysetPage(self.read_pool, """
+            SELECT guild_id, context, follows, frequency
+            FROM cogs.markov
+            WHERE guild_id = $1
+        """, MarkovEntity, args=(guild_id,), key=('context', 'follows'), per_page=per_page, prefetch=True)
+
+    def find_training_messages(self, guild_id: int, since: datetime = FIRST_MESSAGE_AT,
+                               per_page: int = 1000) -> KeysetPage[MessageEntity]:
+        """messages to train on created since the date, older partitions of server.messages are not scanned"""
+        return KeysetPage(self.read_pool, """
             SELECT m.*
             FROM server.messages m
             INNER JOIN server.channels c on c.id = m.channel_id
             INNER JOIN server.users u on u.id = m.author_id
             WHERE guild_id = $1 AND
+                  m.created_at >= $2 AND
                   NOT m.is_command AND
                   NOT u.is_bot
-        """, guild_id)
-        return Page[MessageEntity](cursor, MessageEntity)
+        """, MessageEntity, args=(guild_id, since), per_page=per_page, prefetch=True)
@@ -35,7 +35,6 @@ ENTITIES = (GuildEntity, RoleEntity, UserEntity, EmojiEntity, CategoryEntity, Ch
             ThreadEntity, MessageEntity, AttachmentEntity, ReactionEntity, MessageEmojiEntity)
 
 
-
 def setup_injections(binder: inject.Binder) -> None:
     for repo_type in REPOSITORIES:
         binder.bind_to_constructor(repo_type, repo_type)
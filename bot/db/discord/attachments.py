@@ -1,11 +1,11 @@
 from dataclasses import dataclass
 from typing import Optional
 
-from bot.db.utils import Entity, Mapper, Id, Crud, inject_conn, DBConnection
+from bot.db.utils import Entity, Mapper, Id, Crud, inject_conn, DBConnection, Statements
 from bot.utils import MessageAttachment
 
 
-@dataclass
+@dataclass(slots=True)
 class AttachmentEntity(Entity):
     __table_name__ = "server.attachment"
 
@@ -22,12 +22,8 @@ class AttachmentMapper(Mapper[MessageAttachment, AttachmentEntity]):
 
 
 class AttachmentRepository(Crud[AttachmentEntity]):
-    def __init__(self) -> None:
-        super().__init__(entity=AttachmentEntity)
-
-    @inject_conn
-    async def insert(self, conn: DBConnection, data: AttachmentEntity) -> None:
-        await conn.execute(f"""
+    statements = Statements(
+        insert="""
             INSERT INTO server.attachments AS a (message_id, id, filename, url)
             VALUES ($1, $2, $3, $4)
             ON CONFLICT (id) DO UPDATE
@@ -35,7 +31,15 @@ class AttachmentRepository(Crud[AttachmentEntity]):
                     url=$4
                 WHERE a.filename<>excluded.filename OR
                         a.url<>excluded.url
-        """, data.message_id, data.id, data.filename, data.url)
+        """,
+    )
+
+    def __init__(self) -> None:
+        super().__init__(entity=AttachmentEntity)
+
+    @inject_conn
+    async def insert(self, conn: DBConnection, data: AttachmentEntity) -> None:
+        await self.statements.execute(conn, 'insert', data.message_id, data.id, data.filename, data.url)
 
     @inject_conn
     async def soft_delete(self, conn: DBConnection, id: Id) -> None:
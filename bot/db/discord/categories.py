@@ -4,12 +4,12 @@ from typing import Optional
 
 from discord import CategoryChannel
 
-from bot.db.utils import Crud, DBConnection, Id, Mapper, inject_conn, Entity
+from bot.db.utils import Crud, DBConnection, Id, Mapper, inject_conn, Entity, Statements
 
 
-@dataclass
+@dataclass(slots=True)
 class CategoryEntity(Entity):
-    __table_name__ = "server.category"
+    __table_name__ = "server.categories"
 
     guild_id: Id
     id: Id
@@ -28,12 +28,8 @@ class CategoryMapper(Mapper[CategoryChannel, CategoryEntity]):
 
 
 class CategoryRepository(Crud[CategoryEntity]):
-    def __init__(self) -> None:
-        super().__init__(entity=CategoryEntity)
-
-    @inject_conn
-    async def insert(self, conn: DBConnection, data: CategoryEntity) -> None:
-        await conn.execute(f"""
+    statements = Statements(
+        insert="""
             INSERT INTO server.categories AS c (guild_id, id, name, position, created_at)
             VALUES ($1, $2, $3, $4, $5)
             ON CONFLICT (id) DO UPDATE
@@ -44,4 +40,12 @@ class CategoryRepository(Crud[CategoryEntity]):
                 WHERE c.name<>excluded.name OR
                         c.position<>excluded.position OR
                         c.created_at<>excluded.created_at
-        """, data.guild_id, data.id, data.name, data.position, data.created_at)
+        """,
+    )
+
+    def __init__(self) -> None:
+        super().__init__(entity=CategoryEntity)
+
+    @inject_conn
+    async def insert(self, conn: DBConnection, data: CategoryEntity) -> None:
+        await self.statements.execute(conn, 'insert', data.guild_id, data.id, data.name, data.position, data.created_at)
@@ -6,7 +6,7 @@ from typing import Optional
 import discord
 from discord.abc import GuildChannel
 
-from bot.db.utils import Crud, DBConnection, Id, Mapper, inject_conn, Entity
+from bot.db.utils import Crud, DBConnection, Id, Mapper, inject_conn, Entity, Statements
 
 
 class ChannelType(enum.Enum):
@@ -14,7 +14,7 @@ class ChannelType(enum.Enum):
     FORUM = "forum"
 
 
-@dataclass
+@dataclass(slots=True)
 class ChannelEntity(Entity):
     __table_name__ = "server.channels"
 
@@ -51,12 +51,8 @@ class ChannelMapper(Mapper[GuildChannel, ChannelEntity]):
 
 
 class ChannelRepository(Crud[ChannelEntity]):
-    def __init__(self) -> None:
-        super().__init__(entity=ChannelEntity)
-
-    @inject_conn
-    async def insert(self, conn: DBConnection, data: ChannelEntity) -> None:
-        await conn.execute(f"""
+    statements = Statements(
+        insert="""
             INSERT INTO server.channels AS ch (guild_id, category_id, id, "name", "type", created_at)
             VALUES ($1, $2, $3, $4, $5, $6)
             ON CONFLICT (id) DO UPDATE
@@ -65,4 +61,12 @@ class ChannelRepository(Crud[ChannelEntity]):
                     edited_at=NOW()
                 WHERE ch.name<>excluded.name OR
                       ch.created_at<>excluded.created_at
-        """, data.guild_id, data.category_id, data.id, data.name, data.type.value, data.created_at)
+        """,
+    )
+
+    def __init__(self) -> None:
+        super().__init__(entity=ChannelEntity)
+
+    @inject_conn
+    async def insert(self, conn: DBConnection, data: ChannelEntity) -> None:
+        await self.statements.execute(conn, 'insert', data.guild_id, data.category_id, data.id, data.name, data.type.value, data.created_at)
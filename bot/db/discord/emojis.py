@@ -5,11 +5,11 @@ from typing import Optional
 from discord import Emoji, PartialEmoji
 from emoji import demojize
 
-from bot.db.utils import Crud, DBConnection, Id, Mapper, Url, inject_conn, Entity
+from bot.db.utils import Crud, DBConnection, Id, Mapper, Url, inject_conn, Entity, Statements
 from bot.utils import AnyEmote, get_emoji_id
 
 
-@dataclass
+@dataclass(slots=True)
 class EmojiEntity(Entity):
     __table_name__ = "server.emojis"
 
@@ -42,12 +42,8 @@ class EmojiMapper(Mapper[AnyEmote, EmojiEntity]):
 
 
 class EmojiRepository(Crud[EmojiEntity]):
-    def __init__(self) -> None:
-        super().__init__(entity=EmojiEntity)
-
-    @inject_conn
-    async def insert(self, conn: DBConnection, data: EmojiEntity) -> None:
-        await conn.execute(f"""
+    statements = Statements(
+        insert="""
             INSERT INTO server.emojis AS e (id, name, url, animated, created_at)
             VALUES ($1, $2, $3, $4, $5)
             ON CONFLICT (id) DO UPDATE
@@ -58,4 +54,12 @@ class EmojiRepository(Crud[EmojiEntity]):
                 WHERE e.name<>excluded.name OR
                       e.url<>excluded.url OR
                       e.animated<>excluded.animated
-        """, data.id, data.name, data.url, data.animated, data.created_at)
+        """,
+    )
+
+    def __init__(self) -> None:
+        super().__init__(entity=EmojiEntity)
+
+    @inject_conn
+    async def insert(self, conn: DBConnection, data: EmojiEntity) -> None:
+        await self.statements.execute(conn, 'insert', data.id, data.name, data.url, data.animated, data.created_at)
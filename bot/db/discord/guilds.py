@@ -4,10 +4,10 @@ from typing import Optional
 
 from discord import Guild
 
-from bot.db.utils import Crud, DBConnection, Id, Mapper, Url, inject_conn, Entity
+from bot.db.utils import Crud, DBConnection, Id, Mapper, Url, inject_conn, Entity, Statements
 
 
-@dataclass
+@dataclass(slots=True)
 class GuildEntity(Entity):
     __table_name__ = "server.guilds"
 
@@ -28,12 +28,8 @@ class GuildMapper(Mapper[Guild, GuildEntity]):
 
 
 class GuildRepository(Crud[GuildEntity]):
-    def __init__(self) -> None:
-        super().__init__(entity=GuildEntity)
-
-    @inject_conn
-    async def insert(self, conn: DBConnection, data: GuildEntity) -> None:
-        await conn.execute(f"""
+    statements = Statements(
+        insert="""
             INSERT INTO server.guilds AS g (id, name, icon_url, created_at)
             VALUES ($1, $2, $3, $4)
             ON CONFLICT (id) DO UPDATE
@@ -44,4 +40,12 @@ class GuildRepository(Crud[GuildEntity]):
                 WHERE g.name<>excluded.name OR
                         g.icon_url<>excluded.icon_url OR
                         g.created_at<>excluded.created_at
-        """, data.id, data.name, data.icon_url, data.created_at)
+        """,
+    )
+
+    def __init__(self) -> None:
+        super().__init__(entity=GuildEntity)
+
+    @inject_conn
+    async def insert(self, conn: DBConnection, data: GuildEntity) -> None:
+        await self.statements.execute(conn, 'insert', data.id, data.name, data.icon_url, data.created_at)
@@ -1,18 +1,30 @@
 import logging
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional, cast, Tuple
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional, cast, Tuple, List
 
 import discord
 from discord import Message
+from discord.utils import snowflake_time
 
-from bot.db.utils import (Crud, DBConnection, Id, Mapper, inject_conn, Entity)
+from bot.db.utils import (Crud, DBConnection, Id, Mapper, inject_conn, Entity, copy_to_staging, Statements)
 
 log = logging.getLogger(__name__)
 BOT_PREFIXES = ('!', 'pls', '.')
 
+# the first partition of server.messages, history backups insert messages as old as discord itself
+FIRST_MESSAGE_AT = datetime(2015, 1, 1, tzinfo=timezone.utc)
+# created_at of a message is the time of its snowflake, the slack covers rows stored with a skewed clock or timezone
+CREATED_AT_SLACK = timedelta(days=1)
 
-@dataclass
+
+def created_between(ids: Iterable[Id]) -> Tuple[datetime, datetime]:
+    """bounds of created_at of the messages, lets the planner prune the partitions of server.messages"""
+    ids = list(ids)
+    return snowflake_time(min(ids)) - CREATED_AT_SLACK, snowflake_time(max(ids)) + CREATED_AT_SLACK
+
+
+@dataclass(slots=True)
 class MessageEntity(Entity):
     __table_name__ = "server.messages"
 
@@ -31,13 +43,17 @@ class MessageMapper(Mapper[Message, MessageEntity]):
     async def map(self, obj: Message) -> MessageEntity:
         message = obj
         created_at = message.created_at.replace(tzinfo=None)
-        content = message.content.replace('\x00', '')
-        is_command = content.startswith(BOT_PREFIXES)
+        content, is_command = self.map_content(message.content)
 
         channel_id, thread_id = self.get_channel_id(message)
 
         return MessageEntity(channel_id, thread_id, message.author.id, message.id, content, is_command, created_at)
 
+    @staticmethod
+    def map_content(content: str) -> Tuple[str, bool]:
+        content = content.replace('\x00', '')
+        return content, content.startswith(BOT_PREFIXES)
+
     @staticmethod
     def get_channel_id(message: Message) -> Tuple[Optional[Id], Optional[Id]]:
         if isinstance(message.channel, discord.abc.GuildChannel):
@@ -49,24 +65,91 @@ class MessageMapper(Mapper[Message, MessageEntity]):
 
 
 class MessageRepository(Crud[MessageEntity]):
-    def __init__(self) -> None:
-        super().__init__(entity=MessageEntity)
-
-    @inject_conn
-    async def insert(self, conn: DBConnection, data: MessageEntity) -> None:
-        await conn.execute(f"""
+    statements = Statements(
+        insert="""
             INSERT INTO server.messages AS m (channel_id, thread_id, author_id, id, content, is_command, created_at)
             VALUES ($1, $2, $3, $4, $5, $6, $7)
-            ON CONFLICT (id) DO UPDATE
+            ON CONFLICT (id, created_at) DO UPDATE
                 SET content=$5,
                     is_command=$6,
-                    created_at=$7,
                     edited_at=NOW()
                 WHERE m.content<>excluded.content OR
                       m.is_command<>excluded.is_command OR
-                      m.created_at<>excluded.created_at OR
                       m.edited_at<>excluded.edited_at
-        """, data.channel_id, data.thread_id, data.author_id, data.id, data.content, data.is_command, data.created_at)
+        """,
+        create_partitions="""
+            SELECT server.create_message_partitions($1, now() + make_interval(months => $2))
+        """,
+    )
+
+    def __init__(self) -> None:
+        super().__init__(entity=MessageEntity)
+
+    @inject_conn
+    async def insert(self, conn: DBConnection, data: MessageEntity) -> None:
+        await self.statements.execute(conn, 'insert', data.channel_id, data.thread_id, data.author_id, data.id, data.content, data.is_command, data.created_at)
+
+    @inject_conn
+    async def insert_many(self, conn: DBConnection, data: List[MessageEntity]) -> None:
+        if not data:
+            return
+
+        columns = ('channel_id', 'thread_id', 'author_id', 'id', 'content', 'is_command', 'created_at')
+        records = [(message.channel_id, message.thread_id, message.author_id, message.id,
+                    message.content, message.is_command, message.created_at)
+                   for message in data]
+
+        async with conn.transaction():
+            staging = await copy_to_staging(conn, "server.messages", columns, records)
+            await conn.execute(f"""
+                INSERT INTO server.messages AS m (channel_id, thread_id, author_id, id, content, is_command, created_at)
+                SELECT DISTINCT ON (id) channel_id, thread_id, author_id, id, content, is_command, created_at
+                FROM {staging}
+                ORDER BY id
+                ON CONFLICT (id, created_at) DO UPDATE
+                    SET content=excluded.content,
+                        is_command=excluded.is_command,
+                        edited_at=NOW()
+                    WHERE m.content<>excluded.content OR
+                          m.is_command<>excluded.is_command
+            """)
+
+    @inject_conn
+    async def edit_many(self, conn: DBConnection, data: List[Tuple[Id, str, bool]]) -> None:
+        if not data:
+            return
+
+        ids, contents, is_commands = zip(*data)
+        await conn.execute(f"""
+            UPDATE server.messages AS m
+            SET content=e.content,
+                is_command=e.is_command,
+                edited_at=NOW()
+            FROM unnest($1::bigint[], $2::text[], $3::boolean[]) AS e(id, content, is_command)
+            WHERE m.id=e.id AND
+                  m.created_at BETWEEN $4 AND $5 AND
+                  m.content<>e.content
+        """, ids, contents, is_commands, *created_between(ids))
+
+    @inject_conn
+    async def soft_delete_many(self, conn: DBConnection, ids: List[Id]) -> None:
+        if not ids:
+            return
+
+        await conn.execute(f"""
+            UPDATE server.messages
+            SET deleted_at=NOW()
+            WHERE id=ANY($1::bigint[]) AND
+                  created_at BETWEEN $2 AND $3 AND
+                  deleted_at IS NULL
+        """, ids, *created_between(ids))
+
+    @inject_conn
+    async def create_partitions(self, conn: DBConnection, months_ahead: int = 3) -> int:
+        """create the missing monthly partitions up to months_ahead, returns the number of created partitions"""
+        if getattr(conn, 'dialect', None) == 'sqlite':
+            return 0
+        return cast(int, await self.statements.fetchval(conn, 'create_partitions', FIRST_MESSAGE_AT, months_ahead))
 
     @inject_conn
     async def count(self, conn: DBConnection) -> int:
@@ -1,14 +1,15 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from discord import Reaction
 
-from bot.db.utils import Crud, DBConnection, Id, Mapper, inject_conn, Entity
+from bot.db.discord.messages import created_between
+from bot.db.utils import Crud, DBConnection, Id, Mapper, inject_conn, Entity, Statements
 from bot.utils import get_emoji_id
 
 
-@dataclass
+@dataclass(slots=True)
 class ReactionEntity(Entity):
     __table_name__ = "server.reactions"
 
@@ -30,12 +31,8 @@ class ReactionMapper(Mapper[Reaction, ReactionEntity]):
 
 
 class ReactionRepository(Crud[ReactionEntity]):
-    def __init__(self) -> None:
-        super().__init__(entity=ReactionEntity)
-
-    @inject_conn
-    async def insert(self, conn: DBConnection, data: ReactionEntity) -> None:
-        await conn.execute(f"""
+    statements = Statements(
+        insert="""
             INSERT INTO server.reactions AS r (message_id, emoji_id, member_ids, created_at)
             VALUES ($1, $2, $3, $4)
             ON CONFLICT (message_id, emoji_id) DO UPDATE
@@ -44,12 +41,64 @@ class ReactionRepository(Crud[ReactionEntity]):
                     edited_at=NOW()
                 WHERE r.member_ids<>excluded.member_ids OR
                       r.created_at<>excluded.created_at
-        """, data.message_id, data.emoji_id, data.user_ids, data.created_at)
+        """,
+        add_members="""
+            INSERT INTO server.reactions AS r (message_id, emoji_id, member_ids, created_at)
+            SELECT $1, $2, ARRAY[$3::bigint], $4
+            WHERE EXISTS (SELECT 1 FROM server.messages WHERE id=$1 AND created_at BETWEEN $5 AND $6)
+            ON CONFLICT (message_id, emoji_id) DO UPDATE
+                SET member_ids=array_append(r.member_ids, $3::bigint),
+                    edited_at=NOW(),
+                    deleted_at=NULL
+                WHERE NOT $3::bigint=ANY(r.member_ids)
+        """,
+        remove_members="""
+            UPDATE server.reactions
+            SET member_ids=array_remove(member_ids, $3::bigint),
+                edited_at=NOW()
+            WHERE message_id=$1 AND
+                  emoji_id=$2 AND
+                  $3::bigint=ANY(member_ids)
+        """,
+    )
+
+    def __init__(self) -> None:
+        super().__init__(entity=ReactionEntity)
+
+    @inject_conn
+    async def insert(self, conn: DBConnection, data: ReactionEntity) -> None:
+        await self.statements.execute(conn, 'insert', data.message_id, data.emoji_id, data.user_ids, data.created_at)
+
+    @inject_conn
+    async def find_member_counts(self, conn: DBConnection, keys: List[Tuple[Id, Id]]) -> Dict[Tuple[Id, Id], int]:
+        """number of members of the (message_id, emoji_id) reactions, unknown reactions are left out"""
+        if not keys:
+            return {}
+
+        message_ids, emoji_ids = zip(*keys)
+        rows = await conn.fetch(f"""
+            SELECT r.message_id, r.emoji_id, cardinality(r.member_ids) AS count
+            FROM server.reactions AS r
+            INNER JOIN unnest($1::bigint[], $2::bigint[]) AS k(message_id, emoji_id)
+                ON r.message_id=k.message_id AND r.emoji_id=k.emoji_id
+            WHERE r.deleted_at IS NULL
+        """, message_ids, emoji_ids)
+        return {(row['message_id'], row['emoji_id']): row['count'] for row in rows}
+
+    @inject_conn
+    async def add_members(self, conn: DBConnection, data: List[Tuple[Id, Id, Id, datetime]]) -> None:
+        """add (message_id, emoji_id, member_id, created_at) reactions, reactions on unknown messages are skipped"""
+        await self.statements.executemany(conn, 'add_members', [(*row, *created_between([row[0]])) for row in data])
+
+    @inject_conn
+    async def remove_members(self, conn: DBConnection, data: List[Tuple[Id, Id, Id]]) -> None:
+        """remove (message_id, emoji_id, member_id) reactions"""
+        await self.statements.executemany(conn, 'remove_members', data)
 
     @inject_conn
-    async def soft_delete(self, conn: DBConnection, id: Id) -> None:
+    async def soft_delete(self, conn: DBConnection, data: ReactionEntity) -> None:
         await conn.execute(f"""
             UPDATE server.reactions
             SET deleted_at=NOW()
             WHERE message_id = $1 AND emoji_id=$2;
-        """, (id,))
+        """, data.message_id, data.emoji_id)
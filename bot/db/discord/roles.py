@@ -4,12 +4,12 @@ from typing import Optional
 
 from discord import Role
 
-from bot.db.utils import (Crud, DBConnection, Id, Mapper, inject_conn, Entity)
+from bot.db.utils import (Crud, DBConnection, Id, Mapper, inject_conn, Entity, Statements)
 
 
-@dataclass
+@dataclass(slots=True)
 class RoleEntity(Entity):
-    __table_name__ = "server.role"
+    __table_name__ = "server.roles"
 
     guild_id: Id
     id: Id
@@ -28,12 +28,8 @@ class RoleMapper(Mapper[Role, RoleEntity]):
 
 
 class RoleRepository(Crud[RoleEntity]):
-    def __init__(self) -> None:
-        super().__init__(entity=RoleEntity)
-
-    @inject_conn
-    async def insert(self, conn: DBConnection, data: RoleEntity) -> None:
-        await conn.execute(f"""
+    statements = Statements(
+        insert="""
             INSERT INTO server.roles AS r (guild_id, id, name, color, created_at)
             VALUES ($1, $2, $3, $4, $5)
             ON CONFLICT (id) DO UPDATE
@@ -44,4 +40,12 @@ class RoleRepository(Crud[RoleEntity]):
                 WHERE r.name<>excluded.name OR
                         r.color<>excluded.color OR
                         r.created_at<>excluded.created_at
-        """, data.guild_id, data.id, data.name, data.color, data.created_at)
+        """,
+    )
+
+    def __init__(self) -> None:
+        super().__init__(entity=RoleEntity)
+
+    @inject_conn
+    async def insert(self, conn: DBConnection, data: RoleEntity) -> None:
+        await self.statements.execute(conn, 'insert', data.guild_id, data.id, data.name, data.color, data.created_at)
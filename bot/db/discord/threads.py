@@ -4,10 +4,10 @@ from typing import Optional
 
 from discord import Thread
 
-from bot.db.utils import Entity, Id, Mapper, Crud, inject_conn, DBConnection
+from bot.db.utils import Entity, Id, Mapper, Crud, inject_conn, DBConnection, Statements
 
 
-@dataclass
+@dataclass(slots=True)
 class ThreadEntity(Entity):
     __table_name__ = "server.messages"
 
@@ -37,12 +37,8 @@ class ThreadMapper(Mapper[Thread, ThreadEntity]):
 
 
 class ThreadRepository(Crud[ThreadEntity]):
-    def __init__(self) -> None:
-        super().__init__(entity=ThreadEntity)
-
-    @inject_conn
-    async def insert(self, conn: DBConnection, data: ThreadEntity) -> None:
-        await conn.execute(f"""
+    statements = Statements(
+        insert="""
             INSERT INTO server.threads AS ch (parent_id, id, name, created_at, archived_at)
             VALUES ($1, $2, $3, $4, $5)
             ON CONFLICT (id) DO UPDATE
@@ -53,4 +49,12 @@ class ThreadRepository(Crud[ThreadEntity]):
                 WHERE ch.name<>excluded.name OR
                       ch.created_at<>excluded.created_at OR
                       ch.archived_at<>excluded.archived_at
-        """, data.parent_id, data.id, data.name, data.created_at, data.archived_at)
+        """,
+    )
+
+    def __init__(self) -> None:
+        super().__init__(entity=ThreadEntity)
+
+    @inject_conn
+    async def insert(self, conn: DBConnection, data: ThreadEntity) -> None:
+        await self.statements.execute(conn, 'insert', data.parent_id, data.id, data.name, data.created_at, data.archived_at)
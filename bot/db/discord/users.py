@@ -1,15 +1,16 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Union
+from typing import Dict, List, Optional, Union
 
 from discord import Member, User
 
-from bot.db.utils import (Crud, DBConnection, Id, Mapper, Url, inject_conn, Entity)
+from bot.db.utils import (Crud, DBConnection, Id, Mapper, Url, inject_conn, Entity, copy_to_staging, fingerprint,
+                          Statements)
 
 
-@dataclass
+@dataclass(slots=True)
 class UserEntity(Entity):
-    __table_name__ = "server.user"
+    __table_name__ = "server.users"
 
     id: Id
     name: str
@@ -29,12 +30,8 @@ class UserMapper(Mapper[Union[User, Member], UserEntity]):
 
 
 class UserRepository(Crud[UserEntity]):
-    def __init__(self) -> None:
-        super().__init__(entity=UserEntity)
-
-    @inject_conn
-    async def insert(self, conn: DBConnection, data: UserEntity) -> None:
-        await conn.execute(f"""
+    statements = Statements(
+        insert="""
             INSERT INTO server.users AS u (id, name, avatar_url, is_bot, created_at)
             VALUES ($1, $2, $3, $4, $5)
             ON CONFLICT (id) DO UPDATE
@@ -47,4 +44,62 @@ class UserRepository(Crud[UserEntity]):
                       u.avatar_url<>excluded.avatar_url OR
                       u.is_bot<>excluded.is_bot OR
                       u.created_at<>excluded.created_at
-        """, data.id, data.name, data.avatar_url, data.is_bot, data.created_at)
+        """,
+    )
+
+    def __init__(self) -> None:
+        super().__init__(entity=UserEntity)
+
+    @inject_conn
+    async def insert(self, conn: DBConnection, data: UserEntity) -> None:
+        await self.statements.execute(conn, 'insert', data.id, data.name, data.avatar_url, data.is_bot, data.created_at)
+
+    @inject_conn
+    async def insert_many(self, conn: DBConnection, data: List[UserEntity]) -> None:
+        if not data:
+            return
+
+        columns = ('id', 'name', 'avatar_url', 'is_bot', 'created_at')
+        records = [(user.id, user.name, user.avatar_url, user.is_bot, user.created_at) for user in data]
+
+        async with conn.transaction():
+            staging = await copy_to_staging(conn, "server.users", columns, records)
+            await conn.execute(f"""
+                INSERT INTO server.users AS u (id, name, avatar_url, is_bot, created_at)
+                SELECT DISTINCT ON (id) id, name, avatar_url, is_bot, created_at
+                FROM {staging}
+                ORDER BY id
+                ON CONFLICT (id) DO UPDATE
+                    SET name=excluded.name,
+                        avatar_url=excluded.avatar_url,
+                        is_bot=excluded.is_bot,
+                        created_at=excluded.created_at,
+                        edited_at=NOW(),
+                        deleted_at=NULL
+                    WHERE u.name<>excluded.name OR
+                          u.avatar_url<>excluded.avatar_url OR
+                          u.is_bot<>excluded.is_bot OR
+                          u.created_at<>excluded.created_at OR
+                          u.deleted_at IS NOT NULL
+            """)
+
+    @inject_conn
+    async def soft_delete_missing(self, conn: DBConnection, ids: List[Id]) -> int:
+        """marks every user not in ids as deleted, returns the number of users marked"""
+        status = await conn.execute("""
+            UPDATE server.users AS u
+            SET deleted_at=NOW()
+            WHERE u.deleted_at IS NULL AND
+                  NOT EXISTS (SELECT 1 FROM unnest($1::bigint[]) AS present(id) WHERE present.id = u.id)
+        """, ids)
+        return int(status.split()[-1])
+
+    @inject_conn
+    async def find_fingerprints(self, conn: DBConnection) -> Dict[Id, int]:
+        """deleted users are left out, so that they are written again once they rejoin"""
+        rows = await conn.fetch("""
+            SELECT *
+            FROM server.users
+            WHERE deleted_at IS NULL
+        """)
+        return {row['id']: fingerprint(entity) for row, entity in zip(rows, self.entity.convert_many(rows))}
@@ -0,0 +1,147 @@
+"""
+applies the numbered migrations from database/migrations that the database has not seen yet
+
+    python -m bot.db.migrate
+"""
+import asyncio
+import logging
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Set
+
+import asyncpg
+
+from bot.db.utils import Pool
+
+log = logging.getLogger(__name__)
+
+__all__ = ['Migration', 'load_migrations', 'migrate', 'migrate_url']
+
+MIGRATIONS_DIR = Path(__file__).parent.parent.parent.joinpath('database', 'migrations')
+MIGRATION_FILE = re.compile(r'^(\d+)_(\w+)\.sql$')
+
+# a migration starting with this line runs its statements one by one outside of a transaction,
+# which CREATE INDEX CONCURRENTLY requires
+NO_TRANSACTION = '-- no-transaction'
+
+# held while migrating, so that bots starting at the same time do not apply a migration twice
+MIGRATION_LOCK_ID = 7_206_151
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    sql: str
+
+    @property
+    def transactional(self) -> bool:
+        return not self.sql.lstrip().startswith(NO_TRANSACTION)
+
+    @property
+    def statements(self) -> List[str]:
+        statements: List[str] = []
+        for part in re.split(r';\s*$', self.sql, flags=re.MULTILINE):
+            # a ; at the end of a line inside a $$ quoted function body does not end the statement
+            if statements and statements[-1].count('$$') % 2:
+                statements[-1] += ';' + part
+            else:
+                statements.append(part)
+        return [statement.strip() for statement in statements if _strip_comments(statement)]
+
+
+def _strip_comments(sql: str) -> str:
+    return "\n".join(line for line in sql.splitlines() if not line.strip().startswith('--')).strip()
+
+
+def load_migrations(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    migrations = []
+    for path in directory.iterdir():
+        if not (match := MIGRATION_FILE.match(path.name)):
+            continue
+        migrations.append(Migration(int(match.group(1)), match.group(2), path.read_text(encoding="UTF-8")))
+
+    migrations.sort(key=lambda migration: migration.version)
+    versions = [migration.version for migration in migrations]
+    assert len(versions) == len(set(versions)), f"duplicate migration versions in {directory}"
+    return migrations
+
+
+async def migrate(pool: Pool, migrations: List[Migration] | None = None) -> int:
+    """apply the pending migrations in order, returns the number of applied migrations"""
+    if getattr(pool, 'dialect', None) == 'sqlite':
+        log.info("SQLite databases are created with the migrated schema, nothing to migrate")
+        return 0
+    migrations = load_migrations() if migrations is None else migrations
+
+    async with pool.acquire() as conn:
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS public.schema_migrations (
+                version integer NOT NULL PRIMARY KEY,
+                name text NOT NULL,
+                applied_at timestamp with time zone NOT NULL DEFAULT now()
+            )
+        """)
+        await conn.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_ID)
+        try:
+            rows = await conn.fetch("SELECT version FROM public.schema_migrations")
+            applied: Set[int] = {row['version'] for row in rows}
+            pending = [migration for migration in migrations if migration.version not in applied]
+            for migration in pending:
+                await _apply(conn, migration)
+            return len(pending)
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_ID)
+
+
+async def migrate_url(url: str) -> int:
+    """
+    apply the pending migrations on a dedicated connection without a command timeout,
+    moving the rows of a large table or building an index concurrently takes longer than the bot pool allows
+    """
+    if url.startswith('sqlite:'):
+        return 0
+
+    pool = await asyncpg.create_pool(url, min_size=1, max_size=1, command_timeout=None)
+    try:
+        return await migrate(pool)
+    finally:
+        await pool.close()
+
+
+async def _apply(conn: asyncpg.Connection, migration: Migration) -> None:  # type: ignore[type-arg]
+    log.info("applying migration %04d_%s", migration.version, migration.name)
+    if migration.transactional:
+        async with conn.transaction():
+            await conn.execute(migration.sql)
+            await _record(conn, migration)
+        return
+
+    for statement in migration.statements:
+        await conn.execute(statement)
+    await _record(conn, migration)
+
+
+async def _record(conn: asyncpg.Connection, migration: Migration) -> None:  # type: ignore[type-arg]
+    await conn.execute("""
+        INSERT INTO public.schema_migrations (version, name)
+        VALUES ($1, $2)
+    """, migration.version, migration.name)
+
+
+async def main() -> None:
+    if not (postgres_url := os.getenv("POSTGRES")):
+        raise SystemExit("POSTGRES is required to migrate the database")
+
+    applied = await migrate_url(postgres_url)
+    log.info("applied %d migrations", applied)
+
+
+if __name__ == '__main__':
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -2,10 +2,10 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Optional, Iterable, cast
 
-from bot.db.utils import inject_conn, DBConnection, Url, Entity, Crud
+from bot.db.utils import inject_conn, DBConnection, Url, Entity, Crud, AsyncTTLCache, cached
 
 
-@dataclass
+@dataclass(slots=True)
 class CourseEntity(Entity):
     __table_name__ = "muni.courses"
 
@@ -20,6 +20,11 @@ class CourseEntity(Entity):
 
 
 class CourseRepository(Crud[CourseEntity]):
+    # looked up on every course argument, both match courses case-insensitively
+    # so a write clears them instead of invalidating a single key
+    course_by_code = AsyncTTLCache[Optional[CourseEntity]](ttl=600, capacity=4096)
+    courses = AsyncTTLCache[List[CourseEntity]](ttl=600, capacity=4096)
+
     def __init__(self) -> None:
         super().__init__(entity=CourseEntity)
 
@@ -34,15 +39,20 @@ class CourseRepository(Crud[CourseEntity]):
                     terms=ARRAY[$5],
                     edited_at=NOW()
         """, data.faculty, data.code, data.name, data.url, data.terms)
+        self.invalidate()
 
     @inject_conn
     async def soft_delete(self, conn: DBConnection, data: CourseEntity) -> None:
         await conn.execute("""
-            UPDATE muni.faculties
+            UPDATE muni.courses
             SET deleted_at=NOW()
             WHERE faculty=$1 AND code=$2
         """, data.faculty, data.code)
+        self.invalidate()
 
+    def invalidate(self) -> None:
+        self.course_by_code.clear()
+        self.courses.clear()
 
     @inject_conn
     async def autocomplete(self, conn: DBConnection, pattern: str) -> List[CourseEntity]:
@@ -54,6 +64,7 @@ class CourseRepository(Crud[CourseEntity]):
         """, pattern)
         return CourseEntity.convert_many(rows)
 
+    @cached(course_by_code)
     @inject_conn
     async def find_by_code(self, conn: DBConnection, faculty: str, code: str) -> Optional[CourseEntity]:
         row = await conn.fetchrow(f"""
@@ -71,8 +82,9 @@ class CourseRepository(Crud[CourseEntity]):
         """)
         return [cast(str, row['result']) for row in rows]
 
+    @cached(courses)
     @inject_conn
-    async def find_courses(self, conn: DBConnection, data: List[str]) -> Iterable[CourseEntity]:
+    async def find_courses(self, conn: DBConnection, data: List[str]) -> List[CourseEntity]:
         rows = await conn.fetch(f"""
                 SELECT *
                 FROM muni.courses
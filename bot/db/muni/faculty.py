@@ -5,7 +5,7 @@ from typing import Optional
 from bot.db.utils import inject_conn, DBConnection, Entity, Crud
 
 
-@dataclass
+@dataclass(slots=True)
 class FacultyEntity(Entity):
     __table_name__ = "muni.faculties"
 
@@ -1,10 +1,10 @@
 from dataclasses import dataclass
-from typing import Tuple, Iterable, cast
+from typing import List, Tuple, cast
 
-from bot.db.utils import inject_conn, DBConnection, Id, Crud, Entity
+from bot.db.utils import inject_conn, DBConnection, Id, Crud, Entity, AsyncTTLCache, cached
 
 
-@dataclass
+@dataclass(slots=True)
 class StudentEntity(Entity):
     __table_name__ = "muni.students"
 
@@ -15,6 +15,9 @@ class StudentEntity(Entity):
 
 
 class StudentRepository(Crud[StudentEntity]):
+    course_students = AsyncTTLCache[int](ttl=300, capacity=4096)
+    students_courses = AsyncTTLCache[List[str]](ttl=300, capacity=4096)
+
     def __init__(self) -> None:
         super().__init__(entity=StudentEntity)
 
@@ -26,7 +29,9 @@ class StudentRepository(Crud[StudentEntity]):
             ON CONFLICT (faculty, code, guild_id, member_id) DO UPDATE 
                 SET left_at=NULL
         """, data.faculty, data.code, data.guild_id, data.member_id)
+        self.invalidate(data)
 
+    @cached(course_students)
     @inject_conn
     async def count_course_students(self, conn: DBConnection, data: Tuple[str, str, Id]) -> int:
         faculty, code, guild_id = data
@@ -38,15 +43,16 @@ class StudentRepository(Crud[StudentEntity]):
         assert row
         return cast(int, row['count'])
 
+    @cached(students_courses)
     @inject_conn
-    async def find_all_students_courses(self, conn: DBConnection, data: Tuple[Id, Id]) -> Iterable[str]:
+    async def find_all_students_courses(self, conn: DBConnection, data: Tuple[Id, Id]) -> List[str]:
         guild_id, member_id = data
         rows = await conn.fetch("""
                 SELECT faculty||':'||code as result
                 FROM muni.students
                 WHERE guild_id=$1 AND member_id=$2 AND left_at IS NULL
             """, guild_id, member_id)
-        return map(lambda row: cast(str, row['result']), rows)
+        return [cast(str, row['result']) for row in rows]
 
     @inject_conn
     async def soft_delete(self, conn: DBConnection, data: StudentEntity) -> None:
@@ -55,3 +61,8 @@ class StudentRepository(Crud[StudentEntity]):
             SET left_at=NOW()
             WHERE faculty=$1 AND code=$2 AND guild_id=$3 AND member_id=$4
         """, data.faculty, data.code, data.guild_id, data.member_id)
+        self.invalidate(data)
+
+    def invalidate(self, student: StudentEntity) -> None:
+        self.course_students.invalidate((student.faculty, student.code, student.guild_id))
+        self.students_courses.invalidate((student.guild_id, student.member_id))
@@ -2,7 +2,9 @@ __all__ = [
     'Crud', 'Entity', 'Mapper', 'Table',
     'Id', 'Url', "Record", 'DBConnection',
     'Cursor', 'Pool', 'DBTransaction',
-    'UnitOfWork', 'inject_conn', 'Page'
+    'UnitOfWork', 'TransactionContext', 'ReadPool', 'inject_conn', 'inject_read_conn', 'Page', 'KeysetPage',
+    'copy_to_staging', 'fingerprint', 'FingerprintCache', 'Statements',
+    'QueryStats', 'QUERY_STATS', 'AsyncTTLCache', 'cached', 'SQLitePool', 'connect_sqlite'
 ]
 
 from .crud import Crud
@@ -10,6 +12,13 @@ from .entity import Entity
 from .mapper import Mapper
 from .table import Table
 from .dbtypes import Id, Url, Record, DBConnection, Cursor, Pool, DBTransaction
-from .transaction import UnitOfWork
-from .inject_conn import inject_conn
-from .page import Page
+from .transaction import UnitOfWork, TransactionContext
+from .inject_conn import inject_conn, inject_read_conn
+from .read_pool import ReadPool
+from .page import Page, KeysetPage
+from .staging import copy_to_staging
+from .fingerprint import fingerprint, FingerprintCache
+from .statements import Statements
+from .query_stats import QueryStats, QUERY_STATS
+from .cached import AsyncTTLCache, cached
+from .sqlite import SQLitePool, connect_sqlite
@@ -0,0 +1,121 @@
+import asyncio
+import time
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+from bot.utils.lru_cache import LRUCache
+
+__all__ = ['AsyncTTLCache', 'cached']
+
+V = TypeVar('V')
+F = TypeVar('F', bound=Callable[..., Awaitable[Any]])
+
+Key = Tuple[Hashable, ...]
+
+
+class AsyncTTLCache(Generic[V]):
+    """
+    results of an async lookup, kept for ttl seconds, at most `capacity` of them, least recently used evicted first
+
+    concurrent misses of the same key share a single lookup,
+    a lookup still running when its key is invalidated is not cached
+    """
+
+    def __init__(self, ttl: float, capacity: int = 1024) -> None:
+        assert ttl > 0, "ttl must be positive"
+        self.ttl = ttl
+        self._items: LRUCache[Key, Tuple[float, V]] = LRUCache(capacity)
+        self._loading: Dict[Key, "asyncio.Future[V]"] = {}
+
+    @property
+    def hits(self) -> int:
+        return self._items.hits
+
+    @property
+    def misses(self) -> int:
+        return self._items.misses
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @staticmethod
+    def key(*args: Any, **kwargs: Any) -> Key:
+        """lists and tuples become tuples so that a method taking a list can be cached"""
+        return tuple(map(_freeze, args)) + tuple(sorted((name, _freeze(value)) for name, value in kwargs.items()))
+
+    async def get_or_load(self, key: Key, load: Callable[[], Awaitable[V]]) -> V:
+        if (item := self._items.get(key)) is not None:
+            expires_at, value = item
+            if time.monotonic() < expires_at:
+                return value
+            self._items.pop(key)
+
+        if (loading := self._loading.get(key)) is None:
+            loading = asyncio.ensure_future(load())
+            self._loading[key] = loading
+            loading.add_done_callback(lambda future: self._loaded(key, future))
+        # a caller giving up does not cancel the lookup the other callers wait for
+        return await asyncio.shield(loading)
+
+    def peek(self, *args: Any, **kwargs: Any) -> Optional[V]:
+        """the result cached for the arguments, None when it is not cached or has expired, never loads"""
+        if (item := self._items.get(self.key(*args, **kwargs))) is None:
+            return None
+        expires_at, value = item
+        return value if time.monotonic() < expires_at else None
+
+    def invalidate(self, *args: Any, **kwargs: Any) -> None:
+        """drop the result cached for the same arguments as the cached method was called with"""
+        key = self.key(*args, **kwargs)
+        self._items.pop(key)
+        self._loading.pop(key, None)
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._loading.clear()
+
+    def _loaded(self, key: Key, future: "asyncio.Future[V]") -> None:
+        if self._loading.get(key) is not future:
+            return
+        del self._loading[key]
+        if not future.cancelled() and future.exception() is None:
+            self._items[key] = (time.monotonic() + self.ttl, future.result())
+
+    def __repr__(self) -> str:
+        return f"<AsyncTTLCache ttl={self.ttl}s items={self._items!r}>"
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(map(_freeze, value))
+    return value
+
+
+def cached(cache: AsyncTTLCache[Any]) -> Callable[[F], F]:
+    """
+    serve the results of a repository method from the cache,
+    the methods writing the data call `cache.invalidate` with the arguments of the cached call
+
+    calls given a connection are passed through, they may be part of a transaction
+    that sees its own uncommitted writes
+
+    ```py
+    class CourseRepository(Crud[CourseEntity]):
+        courses = AsyncTTLCache[Optional[CourseEntity]](ttl=300)
+
+        @cached(courses)
+        @inject_conn
+        async def find_by_code(self, conn: DBConnection, faculty: str, code: str) -> Optional[CourseEntity]:
+            ...
+    ```
+    """
+    def decorator(fn: F) -> F:
+        @wraps(fn)
+        async def wrapper(self: Any, *args: Any, conn: Optional[Any] = None, **kwargs: Any) -> Any:
+            if conn is not None:
+                return await fn(self, *args, conn=conn, **kwargs)
+            return await cache.get_or_load(cache.key(*args, **kwargs), lambda: fn(self, *args, **kwargs))
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
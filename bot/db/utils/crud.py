@@ -1,11 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import TypeVar
+from typing import Dict, List, Sequence, TypeVar
 
 from .entity import Entity
 from .inject_conn import inject_conn
-from .page import Page
+from .page import Page, KeysetPage
 from .table import Table
 from .dbtypes import DBConnection, Id
+from .fingerprint import fingerprint
 
 TEntity = TypeVar('TEntity', bound=Entity)
 
@@ -14,12 +15,23 @@ __all__ = ['Crud']
 
 class Crud(ABC, Table[TEntity]):
     @inject_conn
-    async def find_all(self, conn: DBConnection) -> Page[TEntity]:
+    async def find_all(self, conn: DBConnection, per_page: int = 50) -> Page[TEntity]:
+        """pages of a server side cursor, has to be called inside a transaction"""
         cursor = await conn.cursor(f"""
             SELECT *
             FROM {self.__table_name__}
         """)
-        return Page(cursor, self.entity)
+        return Page(cursor, self.entity, per_page)
+
+    def stream_all(
+        self,
+        key: Sequence[str] = ('id',),
+        per_page: int = 1000,
+        prefetch: bool = False
+    ) -> KeysetPage[TEntity]:
+        """pages ordered by the unique key, see `KeysetPage`"""
+        return KeysetPage(self.pool, f"SELECT * FROM {self.__table_name__}", self.entity,
+                          key=key, per_page=per_page, prefetch=prefetch)
 
     @inject_conn
     async def find_by_id(self, conn: DBConnection, id: Id) -> TEntity | None:
@@ -30,10 +42,23 @@ class Crud(ABC, Table[TEntity]):
         """, (id,))
         return self.entity.convert(row) if row else None
 
+    @inject_conn
+    async def find_fingerprints(self, conn: DBConnection) -> Dict[Id, int]:
+        """fingerprints of all rows by id, see `FingerprintCache`"""
+        rows = await conn.fetch(f"""
+            SELECT *
+            FROM {self.__table_name__}
+        """)
+        return {row['id']: fingerprint(entity) for row, entity in zip(rows, self.entity.convert_many(rows))}
+
     @abstractmethod
     async def insert(self, data: TEntity) -> None:
         raise NotImplementedError
 
+    async def insert_many(self, data: List[TEntity]) -> None:
+        for entity in data:
+            await self.insert(entity)
+
     async def update(self, data: TEntity) -> None:
         return await self.insert(data)
 
@@ -43,4 +68,4 @@ class Crud(ABC, Table[TEntity]):
             UPDATE {self.__table_name__}
             SET deleted_at=NOW()
             WHERE id = $1;
-        """, (id,))
+        """, id)
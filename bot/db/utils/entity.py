@@ -1,4 +1,7 @@
-from typing import List, TypeVar, Type
+from dataclasses import fields, MISSING
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Callable, List, Tuple, TypeVar, Type
 
 from asyncpg import Record
 
@@ -7,12 +10,47 @@ TEntity = TypeVar('TEntity', bound='Entity')
 
 class Entity:
     __table_name__: str
+    __slots__ = ()
 
     @classmethod
     def convert(cls: Type[TEntity], record: Record) -> TEntity:
-        # noinspection PyArgumentList
-        return cls(**{k: v for (k, v) in record.items()})
+        return cls._converter(tuple(record.keys()))(record)
 
     @classmethod
     def convert_many(cls: Type[TEntity], records: List[Record]) -> List[TEntity]:
-        return [cls.convert(record) for record in records]
+        """records have to come from the same query, the converter is compiled from the columns of the first one"""
+        if not records:
+            return []
+        convert = cls._converter(tuple(records[0].keys()))
+        return [convert(record) for record in records]
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _converter(cls: Type[TEntity], columns: Tuple[str, ...]) -> Callable[[Record], TEntity]:
+        """
+        converter of records with the given columns, fields are read by position,
+        compiled once per entity and query shape
+        """
+        names = [field.name for field in fields(cls)]  # type: ignore[arg-type]
+        unknown = set(columns) - set(names)
+        if unknown:
+            raise TypeError(f"{cls.__name__} has no fields {', '.join(sorted(unknown))}")
+
+        present = [name for name in names if name in columns]
+        get = itemgetter(*(columns.index(name) for name in present))
+        unpack: Callable[[Record], Tuple[Any, ...]]
+        if len(present) == 1:
+            # itemgetter of a single index returns the value itself, not a tuple
+            unpack = lambda record: (get(record),)
+        else:
+            unpack = get
+
+        if names[:len(present)] == present:
+            # missing columns are trailing fields with defaults, pass the rest positionally
+            return lambda record: cls(*unpack(record))
+
+        missing = [field.name for field in fields(cls)  # type: ignore[arg-type]
+                   if field.name not in columns and field.default is MISSING and field.default_factory is MISSING]
+        if missing:
+            raise TypeError(f"{cls.__name__} is missing columns {', '.join(missing)}")
+        return lambda record: cls(**dict(zip(present, unpack(record))))
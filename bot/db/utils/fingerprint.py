@@ -0,0 +1,114 @@
+import asyncio
+from dataclasses import fields
+from datetime import datetime, timezone
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Dict, List, Set, Tuple, TypeVar, cast
+
+from .dbtypes import Id
+from .entity import Entity
+
+if TYPE_CHECKING:
+    from .crud import Crud
+
+__all__ = ['fingerprint', 'FingerprintCache']
+
+TEntity = TypeVar('TEntity', bound=Entity)
+
+# maintained by the database, not compared by the upserts
+IGNORED_FIELDS = ('edited_at', 'deleted_at')
+
+
+def fingerprint(entity: Entity) -> int:
+    """
+    hash of the values an upsert writes,
+    values are normalised so that mapped and loaded entities of the same row are equal
+    """
+    return hash(tuple(_normalise(getattr(entity, field.name))
+                      for field in fields(entity)  # type: ignore[arg-type]
+                      if field.name not in IGNORED_FIELDS))
+
+
+def _normalise(value: Any) -> Any:
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+class FingerprintCache:
+    """
+    fingerprints of rows by (table, id), used to skip upserts of unchanged entities
+
+    a table is loaded in bulk the first time an entity of it is upserted,
+    the fingerprint is updated after every write
+
+    ```py
+    entity = await mapper.map(user)
+    await fingerprints.upsert(user_repository, entity)
+    ```
+    """
+
+    def __init__(self) -> None:
+        self.written = 0
+        self.skipped = 0
+        self._fingerprints: Dict[Tuple[str, Id], int] = {}
+        self._loaded: Set[str] = set()
+        self._lock = asyncio.Lock()
+
+    def clear(self) -> None:
+        self.written = self.skipped = 0
+        self._fingerprints.clear()
+        self._loaded.clear()
+
+    async def upsert(self, repository: "Crud[TEntity]", entity: TEntity) -> None:
+        table = repository.__table_name__
+        await self._load(repository)
+
+        key = (table, cast(Id, getattr(entity, 'id')))
+        value = fingerprint(entity)
+        if self._fingerprints.get(key) == value:
+            self.skipped += 1
+            return
+
+        await repository.insert(entity)
+        self._fingerprints[key] = value
+        self.written += 1
+
+    async def upsert_many(self, repository: "Crud[TEntity]", entities: List[TEntity]) -> None:
+        """writes the changed entities with a single `repository.insert_many`"""
+        table = repository.__table_name__
+        await self._load(repository)
+
+        changed: Dict[Tuple[str, Id], Tuple[TEntity, int]] = {}
+        for entity in entities:
+            key = (table, cast(Id, getattr(entity, 'id')))
+            value = fingerprint(entity)
+            if self._fingerprints.get(key) == value:
+                self.skipped += 1
+            else:
+                changed[key] = (entity, value)
+
+        if not changed:
+            return
+
+        await repository.insert_many([entity for entity, _ in changed.values()])
+        self._fingerprints.update((key, value) for key, (_, value) in changed.items())
+        self.written += len(changed)
+
+    async def _load(self, repository: "Crud[TEntity]") -> None:
+        table = repository.__table_name__
+        if table in self._loaded:
+            return
+
+        async with self._lock:
+            if table in self._loaded:
+                return
+            fingerprints = await repository.find_fingerprints()
+            self._fingerprints.update(((table, id), value) for id, value in fingerprints.items())
+            self._loaded.add(table)
+
+    def __repr__(self) -> str:
+        return f"<FingerprintCache tables={len(self._loaded)} written={self.written} skipped={self.skipped}>"
@@ -1,9 +1,11 @@
+import time
 from functools import wraps
 from inspect import iscoroutinefunction
 from typing import Callable, Concatenate, TypeVar, ParamSpec, Coroutine, Optional
 
 from bot.db.utils.dbtypes import DBConnection
 from bot.db.utils.table import Table
+from bot.db.utils.query_stats import QUERY_STATS
 
 S = TypeVar('S', bound=Table)  # type: ignore
 P = ParamSpec('P')
@@ -31,13 +33,45 @@ def inject_conn(fn: Callable[Concatenate[S, DBConnection, P], Awaitable[R]]) ->
     row = await find_by_id(id, conn=conn)
     ```
     """
+    return _inject_conn(fn, readonly=False)
+
+
+def inject_read_conn(fn: Callable[Concatenate[S, DBConnection, P], Awaitable[R]]) -> Callable[..., Awaitable[R]]:
+    """
+    like `inject_conn`, for methods that only read, the connection is acquired from the `ReadPool`
+    so that the reads go to the replica if one is configured
+    """
+    return _inject_conn(fn, readonly=True)
+
+
+def _inject_conn(
+    fn: Callable[Concatenate[S, DBConnection, P], Awaitable[R]],
+    readonly: bool
+) -> Callable[..., Awaitable[R]]:
     assert iscoroutinefunction(fn), f"{fn} is not async"
 
     @wraps(fn)
     async def wrapper(self: S, *args: P.args, conn: Optional[DBConnection] = None, **kwargs: P.kwargs) -> R:
+        if QUERY_STATS.enabled:
+            return await timed(self, *args, conn=conn, **kwargs)
         if conn is not None:
             return await fn(self, conn, *args, **kwargs)
-        async with self.pool.acquire() as connection:
+        async with (self.read_pool if readonly else self.pool).acquire() as connection:
             return await fn(self, connection, *args, **kwargs)
 
+    async def timed(self: S, *args: P.args, conn: Optional[DBConnection] = None, **kwargs: P.kwargs) -> R:
+        method = f"{type(self).__name__}.{fn.__name__}"
+        started_at = time.perf_counter()
+        if conn is not None:
+            result = await fn(self, conn, *args, **kwargs)
+            QUERY_STATS.record(method, time.perf_counter() - started_at, result, args=args)
+            return result
+
+        async with (self.read_pool if readonly else self.pool).acquire() as connection:
+            acquired_at = time.perf_counter()
+            result = await fn(self, connection, *args, **kwargs)
+        QUERY_STATS.record(method, time.perf_counter() - acquired_at, result, acquire_wait=acquired_at - started_at,
+                           args=args)
+        return result
+
     return wrapper
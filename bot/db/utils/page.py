@@ -1,8 +1,10 @@
+import asyncio
 from collections.abc import AsyncIterator
-from typing import Type, TypeVar, List
+from typing import Any, Optional, Sequence, Tuple, Type, TypeVar, List, Union
 
 from .entity import Entity
-from .dbtypes import Cursor
+from .dbtypes import Cursor, Pool, Record
+from .read_pool import ReadPool
 
 
 TEntity = TypeVar('TEntity', bound=Entity)
@@ -20,6 +22,92 @@ class Page(AsyncIterator[List[TEntity]]):
     async def __anext__(self) -> List[TEntity]:
         if not (rows := await self.cursor.fetch(self.per_page)):
             raise StopAsyncIteration
-        return [self.entity.convert(row) for row in rows]
+        return self.entity.convert_many(rows)
 
-    
\ No newline at end of file
+
+class KeysetPage(AsyncIterator[List[TEntity]]):
+    """
+    pages of a query ordered by a unique key, every page is a separate short query continuing after
+    the key of the last row of the previous page, so unlike `Page` no cursor or transaction stays open
+
+    the key columns have to be columns of the query result,
+    with prefetch the next page is fetched while the current one is being processed
+
+    ```py
+    pages = KeysetPage(pool, "SELECT * FROM server.messages WHERE channel_id=$1", MessageEntity,
+                       args=(channel_id,), key=('id',), per_page=1000)
+    async for messages in pages:
+        ...
+    ```
+    """
+
+    def __init__(
+        self,
+        pool: Union[Pool, ReadPool],
+        query: str,
+        entity: Type[TEntity],
+        args: Sequence[Any] = (),
+        key: Sequence[str] = ('id',),
+        per_page: int = 1000,
+        prefetch: bool = False
+    ) -> None:
+        assert key, "keyset pagination needs a key"
+        self.pool = pool
+        self.entity = entity
+        self.args = tuple(args)
+        self.key = tuple(key)
+        self.per_page = per_page
+        self.prefetch = prefetch
+
+        columns = ', '.join(self.key)
+        after = ', '.join(f'${len(self.args) + i + 1}' for i in range(len(self.key)))
+        self._first_query = f"""
+            SELECT * FROM ({query}) AS page
+            ORDER BY {columns}
+            LIMIT ${len(self.args) + 1}
+        """
+        self._next_query = f"""
+            SELECT * FROM ({query}) AS page
+            WHERE ({columns}) > ({after})
+            ORDER BY {columns}
+            LIMIT ${len(self.args) + len(self.key) + 1}
+        """
+
+        self._after: Optional[Tuple[Any, ...]] = None
+        self._pending: Optional[asyncio.Task[List[Record]]] = None
+        self._done = False
+
+    def __aiter__(self) -> "KeysetPage[TEntity]":
+        return self
+
+    async def __anext__(self) -> List[TEntity]:
+        if self._done:
+            raise StopAsyncIteration
+
+        if self._pending is not None:
+            rows, self._pending = await self._pending, None
+        else:
+            rows = await self._fetch(self._after)
+
+        if len(rows) < self.per_page:
+            self._done = True
+        if not rows:
+            raise StopAsyncIteration
+
+        self._after = tuple(rows[-1][column] for column in self.key)
+        if self.prefetch and not self._done:
+            self._pending = asyncio.create_task(self._fetch(self._after))
+        return self.entity.convert_many(rows)
+
+    async def aclose(self) -> None:
+        """stop iterating, cancels the prefetched page"""
+        self._done = True
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+
+    async def _fetch(self, after: Optional[Tuple[Any, ...]]) -> List[Record]:
+        async with self.pool.acquire() as conn:
+            if after is None:
+                return await conn.fetch(self._first_query, *self.args, self.per_page)
+            return await conn.fetch(self._next_query, *self.args, *after, self.per_page)
@@ -0,0 +1,92 @@
+import logging
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence, Tuple
+
+log = logging.getLogger(__name__)
+
+__all__ = ['MethodStats', 'QueryStats', 'QUERY_STATS']
+
+# upper bounds of the latency histogram buckets in seconds, the last bucket takes the rest
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+@dataclass
+class MethodStats:
+    calls: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    rows: int = 0
+    acquire_wait: float = 0.0
+    histogram: List[int] = field(default_factory=lambda: [0] * (len(BUCKETS) + 1))
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+    def record(self, elapsed: float, rows: int, acquire_wait: float) -> None:
+        self.calls += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        self.rows += rows
+        self.acquire_wait += acquire_wait
+        self.histogram[bisect_left(BUCKETS, elapsed)] += 1
+
+
+class QueryStats:
+    """
+    timings of repository methods, recorded by `inject_conn` while enabled,
+    calls slower than slow_query_threshold (seconds) are logged with their arguments
+
+    ```py
+    QUERY_STATS.enabled = True
+    ...
+    print(QUERY_STATS.format_top(10))
+    ```
+    """
+
+    def __init__(self, enabled: bool = False, slow_query_threshold: float = 0.5) -> None:
+        self.enabled = enabled
+        self.slow_query_threshold = slow_query_threshold
+        self.methods: Dict[str, MethodStats] = {}
+        self.slow_queries = 0
+
+    def reset(self) -> None:
+        self.methods.clear()
+        self.slow_queries = 0
+
+    def record(self, method: str, elapsed: float, result: Any, acquire_wait: float = 0.0,
+               args: Sequence[Any] = ()) -> None:
+        if (stats := self.methods.get(method)) is None:
+            stats = self.methods[method] = MethodStats()
+        stats.record(elapsed, _count_rows(result), acquire_wait)
+
+        if elapsed >= self.slow_query_threshold:
+            self.slow_queries += 1
+            log.warning("slow query took %.3fs: %s args=%r", elapsed, method, tuple(args))
+
+    def top(self, limit: int = 10) -> List[Tuple[str, MethodStats]]:
+        """methods that spent the most time in the database"""
+        return sorted(self.methods.items(), key=lambda item: item[1].total, reverse=True)[:limit]
+
+    def format_top(self, limit: int = 10) -> str:
+        lines = [f"{'method':<44} {'calls':>7} {'total s':>8} {'mean ms':>8} {'max ms':>8} {'rows':>8} {'wait s':>7}"]
+        for method, stats in self.top(limit):
+            lines.append(f"{method[-44:]:<44} {stats.calls:>7} {stats.total:>8.2f} {stats.mean * 1000:>8.1f} "
+                         f"{stats.max * 1000:>8.1f} {stats.rows:>8} {stats.acquire_wait:>7.2f}")
+        lines.append(f"slow queries: {self.slow_queries}")
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return f"<QueryStats enabled={self.enabled} methods={len(self.methods)} slow_queries={self.slow_queries}>"
+
+
+def _count_rows(result: Any) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, (list, dict)):
+        return len(result)
+    return 1
+
+
+QUERY_STATS = QueryStats()
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import asyncpg
+import inject
+
+from .dbtypes import DBConnection, Pool
+
+log = logging.getLogger(__name__)
+
+__all__ = ['ReadPool']
+
+UNHEALTHY_ERRORS = (OSError, asyncio.TimeoutError, asyncpg.PostgresConnectionError, asyncpg.InterfaceError)
+
+
+class ReadPool:
+    """
+    connections for read-only work, taken from the replica if one is configured
+
+    a replica that fails to hand out a connection is considered unhealthy for retry_after seconds,
+    connections come from the primary in the meantime
+
+    ```py
+    async with read_pool.acquire() as conn:
+        rows = await conn.fetch("SELECT ...")
+    ```
+    """
+
+    @inject.autoparams('primary')
+    def __init__(self, primary: Pool, replica: Optional[Pool] = None, retry_after: float = 30) -> None:
+        self.primary = primary
+        self.replica = replica
+        self.retry_after = retry_after
+        self._unhealthy_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return self.replica is not None and time.monotonic() >= self._unhealthy_until
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[DBConnection]:
+        if self.replica is not None and self.healthy:
+            acquired = self.replica.acquire()
+            try:
+                conn = await acquired.__aenter__()
+            except UNHEALTHY_ERRORS as ex:
+                self._unhealthy_until = time.monotonic() + self.retry_after
+                log.warning("replica is unhealthy, reading from the primary for %ds: %s", self.retry_after, ex)
+            else:
+                try:
+                    yield conn
+                finally:
+                    await acquired.__aexit__(None, None, None)
+                return
+
+        async with self.primary.acquire() as conn:
+            yield conn
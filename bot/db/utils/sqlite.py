@@ -0,0 +1,357 @@
+"""
+embedded SQLite backend for local runs and benchmarks, chosen by a DSN like
+
+    POSTGRES=sqlite:///masaryk.db
+
+the pool and its connections offer the part of the asyncpg api the repositories use,
+queries are written for postgres and translated to SQLite by `translate`,
+the schema in database/sqlite/schema.sql is created when the pool opens
+"""
+import asyncio
+import json
+import logging
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from types import TracebackType
+from typing import Any, AsyncIterator, Callable, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar
+
+__all__ = ['SQLitePool', 'SQLiteConnection', 'SQLiteTransaction', 'SQLiteCursor', 'SQLiteRecord',
+           'connect_sqlite', 'translate']
+
+log = logging.getLogger(__name__)
+
+SCHEMA = Path(__file__).parent.parent.parent.parent.joinpath('database', 'sqlite', 'schema.sql')
+DSN_PREFIX = 'sqlite:///'
+
+# fixed width, so that timestamps stored as text compare in chronological order
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+_T = TypeVar('_T')
+
+
+def _format_timestamp(value: datetime) -> str:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.strftime(TIMESTAMP_FORMAT)
+
+
+def _parse_timestamp(value: bytes) -> datetime:
+    return datetime.fromisoformat(value.decode()).replace(tzinfo=timezone.utc)
+
+
+def _adapt(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return _format_timestamp(value)
+    if isinstance(value, (list, tuple)):
+        return json.dumps(value, default=_adapt)
+    return value
+
+
+# declared column types of database/sqlite/schema.sql
+sqlite3.register_converter('timestamptz', _parse_timestamp)
+sqlite3.register_converter('boolean', lambda value: value != b'0')
+sqlite3.register_converter('jsonarray', json.loads)
+
+
+def _now() -> str:
+    return _format_timestamp(datetime.now(timezone.utc))
+
+
+def _to_timestamp(seconds: float) -> str:
+    return _format_timestamp(datetime.fromtimestamp(seconds, timezone.utc))
+
+
+def _timestamp_add(value: Optional[str], interval: str) -> Optional[str]:
+    if value is None:
+        return None
+    amount, unit = interval.split()
+    unit = unit if unit.endswith('s') else unit + 's'
+    return _format_timestamp(datetime.fromisoformat(value) + timedelta(**{unit: float(amount)}))
+
+
+def _unnest(match: re.Match[str]) -> str:
+    arrays = [array.strip() for array in match.group(1).split(',')]
+    columns = [column.strip() for column in match.group(3).split(',')]
+    assert len(arrays) == len(columns), f"unnest of {len(arrays)} arrays into {len(columns)} columns"
+
+    selected = ', '.join(f"j{i}.value AS {column}" for i, column in enumerate(columns))
+    joined = ' '.join(f"JOIN json_each({array}) AS j{i} ON j{i}.key = j0.key"
+                      for i, array in enumerate(arrays) if i > 0)
+    return f"(SELECT {selected} FROM json_each({arrays[0]}) AS j0 {joined}) AS {match.group(2)}"
+
+
+# applied in order, each rule rewrites one postgres construct the repositories use
+_RULES: List[Tuple[re.Pattern[str], str | Callable[[re.Match[str]], str]]] = [
+    (re.compile(r"::\w+(\[\])?"), ''),
+    (re.compile(r"\$(\d+)"), r'?\1'),
+    (re.compile(r"\b(server|muni|cogs|public)\.(\w+)"), r'\1_\2'),
+    (re.compile(r"CREATE TEMPORARY TABLE (\w+)\s*\(LIKE (\w+) INCLUDING DEFAULTS\)\s*ON COMMIT DROP", re.I),
+     r'CREATE TEMPORARY TABLE \1 AS SELECT * FROM \2 WHERE false'),
+    # DISTINCT ON ordered by its own keys keeps any row of each group, as GROUP BY of SQLite does
+    (re.compile(r"SELECT DISTINCT ON \(([^()]+)\)(.*?)FROM (\w+)\s+ORDER BY \1\b(?!\s*,)", re.I | re.S),
+     r'SELECT\2FROM \3 WHERE true GROUP BY \1'),
+    (re.compile(r"unnest\(([^()]+)\)\s+AS\s+(\w+)\(([^()]+)\)", re.I), _unnest),
+    (re.compile(r"=\s*ANY\(([^()]+)\)", re.I), r' IN (SELECT value FROM json_each(\1))'),
+    (re.compile(r"<>\s*ALL\(([^()]+)\)", re.I), r' NOT IN (SELECT value FROM json_each(\1))'),
+    (re.compile(r"\bcardinality\(", re.I), 'json_array_length('),
+    (re.compile(r"\bARRAY\[([^\[\]]+)\]", re.I), r'json_array(\1)'),
+    (re.compile(r"\barray_append\(([^,()]+),\s*([^()]+?)\)", re.I), r"json_insert(\1, '$[#]', \2)"),
+    (re.compile(r"\barray_remove\(([^,()]+),\s*([^()]+?)\)", re.I),
+     r'(SELECT json_group_array(value) FROM json_each(\1) WHERE value <> \2)'),
+    (re.compile(r"\bGREATEST\(", re.I), 'max('),
+    (re.compile(r"\bLEAST\(", re.I), 'min('),
+    (re.compile(r"\bTRUNCATE TABLE\b", re.I), 'DELETE FROM'),
+    (re.compile(r"([\w.]+)\s*\+\s*interval\s*'([^']+)'", re.I), r"timestamp_add(\1, '\2')"),
+]
+
+_TEMPORARY_TABLE = re.compile(r"CREATE TEMPORARY TABLE (\w+).*ON COMMIT DROP", re.I | re.S)
+
+
+@lru_cache(maxsize=1024)
+def translate(query: str) -> str:
+    """
+    postgres query of a repository in SQLite syntax
+
+    numbered parameters are kept, arrays are passed and stored as json,
+    queries that can not be translated need a SQLite variant, see `Statements.dialect`
+    """
+    for pattern, replacement in _RULES:
+        query = pattern.sub(replacement, query)
+    return query
+
+
+class SQLiteRecord(sqlite3.Row):
+    """row with the methods of asyncpg.Record the repositories use"""
+
+    def values(self) -> Tuple[Any, ...]:
+        return tuple(self)
+
+    def items(self) -> Iterable[Tuple[str, Any]]:
+        return zip(self.keys(), self)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self.keys() else default
+
+
+class SQLiteCursor:
+    def __init__(self, conn: "SQLiteConnection", cursor: sqlite3.Cursor) -> None:
+        self._conn = conn
+        self._cursor = cursor
+
+    async def fetch(self, n: int) -> List[SQLiteRecord]:
+        return await self._conn._run(self._cursor.fetchmany, n)
+
+
+class SQLiteTransaction:
+    """transaction of a connection, nested ones run in a savepoint like in asyncpg"""
+
+    def __init__(self, conn: "SQLiteConnection", readonly: bool = False) -> None:
+        self._conn = conn
+        self._readonly = readonly
+        self._savepoint: Optional[str] = None
+
+    async def start(self) -> None:
+        if self._conn._depth:
+            self._savepoint = f"savepoint_{self._conn._depth}"
+            await self._conn._run(self._conn._execute_raw, f"SAVEPOINT {self._savepoint}")
+        else:
+            # a writing transaction takes the write lock upfront instead of failing to upgrade later
+            await self._conn._run(self._conn._execute_raw, "BEGIN" if self._readonly else "BEGIN IMMEDIATE")
+        self._conn._depth += 1
+
+    async def commit(self) -> None:
+        self._conn._depth -= 1
+        if self._savepoint:
+            await self._conn._run(self._conn._execute_raw, f"RELEASE {self._savepoint}")
+        else:
+            await self._conn._run(self._conn._end, "COMMIT")
+
+    async def rollback(self) -> None:
+        self._conn._depth -= 1
+        if self._savepoint:
+            await self._conn._run(self._conn._execute_raw, f"ROLLBACK TO {self._savepoint}")
+            await self._conn._run(self._conn._execute_raw, f"RELEASE {self._savepoint}")
+        else:
+            await self._conn._run(self._conn._end, "ROLLBACK")
+
+    async def __aenter__(self) -> "SQLiteTransaction":
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType]
+    ) -> None:
+        if exc_val is not None:
+            await self.rollback()
+        else:
+            await self.commit()
+
+
+class SQLiteConnection:
+    """
+    SQLite connection behaving like an asyncpg connection,
+    the blocking calls run on a thread of their own so that they do not stall the event loop
+    """
+
+    dialect = 'sqlite'
+
+    def __init__(self, path: str, busy_timeout: float = 30) -> None:
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._db: Optional[sqlite3.Connection] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sqlite')
+        self._depth = 0
+        self._drop_on_commit: List[str] = []
+
+    async def open(self) -> None:
+        self._db = await self._run(self._open)
+
+    def _open(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False,
+                             detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
+        db.row_factory = SQLiteRecord
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("PRAGMA foreign_keys=ON")
+        db.execute(f"PRAGMA busy_timeout={int(self.busy_timeout * 1000)}")
+        db.create_function('now', 0, _now)
+        db.create_function('to_timestamp', 1, _to_timestamp, deterministic=True)
+        db.create_function('timestamp_add', 2, _timestamp_add, deterministic=True)
+        return db
+
+    async def close(self) -> None:
+        if self._db is not None:
+            await self._run(self._db.close)
+            self._db = None
+        self._executor.shutdown(wait=False)
+
+    async def _run(self, fn: Callable[..., _T], *args: Any) -> _T:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        assert self._db is not None, "connection is not open"
+        return self._db
+
+    def _query(self, query: str, args: Sequence[Any]) -> sqlite3.Cursor:
+        if self._depth and (match := _TEMPORARY_TABLE.search(query)):
+            self._drop_on_commit.append(match.group(1))
+        return self.db.execute(translate(query), [_adapt(arg) for arg in args])
+
+    def _execute_raw(self, query: str) -> None:
+        self.db.execute(query)
+
+    def _end(self, statement: str) -> None:
+        self.db.execute(statement)
+        for table in self._drop_on_commit:
+            self.db.execute(f"DROP TABLE IF EXISTS temp.{table}")
+        self._drop_on_commit.clear()
+
+    def _execute(self, query: str, args: Sequence[Any]) -> str:
+        cursor = self._query(query, args)
+        command = query.split(None, 1)[0].upper()
+        if command == 'INSERT':
+            return f"INSERT 0 {cursor.rowcount}"
+        if command in ('UPDATE', 'DELETE'):
+            return f"{command} {cursor.rowcount}"
+        return command
+
+    async def execute(self, query: str, *args: Any) -> str:
+        """status like asyncpg, e.g. UPDATE 3"""
+        return await self._run(self._execute, query, args)
+
+    async def executemany(self, query: str, args: Iterable[Sequence[Any]]) -> None:
+        rows = [[_adapt(arg) for arg in row] for row in args]
+        await self._run(self.db.executemany, translate(query), rows)
+
+    async def fetch(self, query: str, *args: Any) -> List[SQLiteRecord]:
+        return await self._run(lambda: self._query(query, args).fetchall())
+
+    async def fetchrow(self, query: str, *args: Any) -> Optional[SQLiteRecord]:
+        return await self._run(lambda: self._query(query, args).fetchone())
+
+    async def fetchval(self, query: str, *args: Any) -> Any:
+        row = await self.fetchrow(query, *args)
+        return row[0] if row else None
+
+    async def cursor(self, query: str, *args: Any) -> SQLiteCursor:
+        return SQLiteCursor(self, await self._run(self._query, query, args))
+
+    async def copy_records_to_table(
+        self,
+        table_name: str,
+        *,
+        records: Iterable[Sequence[Any]],
+        columns: Sequence[str]
+    ) -> str:
+        placeholders = ', '.join(f'${i + 1}' for i in range(len(columns)))
+        await self.executemany(f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})", records)
+        return "COPY"
+
+    def transaction(self, readonly: bool = False) -> SQLiteTransaction:
+        return SQLiteTransaction(self, readonly)
+
+    async def reset(self) -> None:
+        """roll back what a released connection left open, as asyncpg does on release"""
+        if self._depth:
+            self._depth = 0
+            await self._run(self._end, "ROLLBACK")
+
+
+class SQLitePool:
+    """
+    at most `size` connections to one database file,
+    in WAL mode readers do not block the writer, writers queue on the busy timeout
+    """
+
+    dialect = 'sqlite'
+
+    def __init__(self, path: str, size: int = 4) -> None:
+        assert size > 0, "pool size must be positive"
+        self.path = path
+        self.size = size
+        self._connections: List[SQLiteConnection] = []
+        self._idle: asyncio.Queue[SQLiteConnection] = asyncio.Queue()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[SQLiteConnection]:
+        conn = await self._take()
+        try:
+            yield conn
+        finally:
+            await conn.reset()
+            self._idle.put_nowait(conn)
+
+    async def _take(self) -> SQLiteConnection:
+        if self._idle.empty() and len(self._connections) < self.size:
+            conn = SQLiteConnection(self.path)
+            self._connections.append(conn)
+            await conn.open()
+            return conn
+        return await self._idle.get()
+
+    async def create_schema(self, schema: Path = SCHEMA) -> None:
+        async with self.acquire() as conn:
+            await conn._run(conn.db.executescript, translate(schema.read_text(encoding="UTF-8")))
+
+    async def close(self) -> None:
+        for conn in self._connections:
+            await conn.close()
+        self._connections.clear()
+
+
+async def connect_sqlite(url: str, size: int = 4) -> SQLitePool:
+    """pool of the database file of a sqlite:///path DSN with the schema created"""
+    assert url.startswith(DSN_PREFIX), f"not a SQLite DSN {url}"
+    pool = SQLitePool(url[len(DSN_PREFIX):], size)
+    await pool.create_schema()
+    log.info("using the SQLite database %s", pool.path)
+    return pool
@@ -0,0 +1,37 @@
+from itertools import count
+from typing import Iterable, Sequence, Tuple, Any
+
+from .dbtypes import DBConnection
+
+__all__ = ['copy_to_staging']
+
+_staging_ids = count()
+
+
+async def copy_to_staging(
+    conn: DBConnection,
+    table_name: str,
+    columns: Sequence[str],
+    records: Iterable[Tuple[Any, ...]]
+) -> str:
+    """
+    create a temporary copy of table_name and fill it using COPY
+
+    the staging table is dropped when the surrounding transaction commits,
+    so this has to be called inside of `conn.transaction()`,
+    every call gets its own table, as a nested transaction only commits to a savepoint
+
+    ```py
+    async with conn.transaction():
+        staging = await copy_to_staging(conn, "server.messages", ("id", "content"), records)
+        await conn.execute(f"INSERT INTO server.messages SELECT * FROM {staging} ON CONFLICT ...")
+    ```
+    """
+    staging_table = f"staging_{table_name.replace('.', '_')}_{next(_staging_ids)}"
+    await conn.execute(f"""
+        CREATE TEMPORARY TABLE {staging_table}
+        (LIKE {table_name} INCLUDING DEFAULTS)
+        ON COMMIT DROP
+    """)
+    await conn.copy_records_to_table(staging_table, records=records, columns=columns)
+    return staging_table
@@ -0,0 +1,96 @@
+from typing import Any, ClassVar, Dict, List, Optional, Set
+from weakref import WeakKeyDictionary, WeakSet
+
+from .dbtypes import DBConnection, Record
+
+__all__ = ['Statements']
+
+# statements asyncpg keeps prepared per connection besides the registered ones
+DEFAULT_STATEMENT_CACHE_SIZE = 100
+
+
+class Statements:
+    """
+    named queries of a repository, the query strings are built once
+
+    every pooled connection prepares a query the first time it runs it,
+    later runs on the same connection reuse the prepared statement and skip parsing and planning
+
+    ```py
+    class GuildRepository(Crud[GuildEntity]):
+        statements = Statements(
+            insert=\"""
+                INSERT INTO server.guilds (id, name) VALUES ($1, $2)
+            \""",
+        )
+
+        @inject_conn
+        async def insert(self, conn: DBConnection, data: GuildEntity) -> None:
+            await self.statements.execute(conn, 'insert', data.id, data.name)
+    ```
+
+    the prepared statements live in the statement cache asyncpg keeps on every connection,
+    a handle returned by `Connection.prepare` can not be used once the connection is released to the pool,
+    the cache outlives the release, see `cache_size` for sizing it
+
+    a query the SQLite backend can not translate gets a variant of its own, see `dialect`
+    """
+
+    _registries: ClassVar["WeakSet[Statements]"] = WeakSet()
+
+    def __init__(self, **queries: str) -> None:
+        self.queries = queries
+        self.dialects: Dict[str, Dict[str, str]] = {}
+        self.prepared = 0
+        self.reused = 0
+        # keyed by the underlying connection, pool proxies are created anew on every acquire
+        self._seen: WeakKeyDictionary[Any, Set[str]] = WeakKeyDictionary()
+        Statements._registries.add(self)
+
+    @classmethod
+    def cache_size(cls) -> int:
+        """statement cache size of a connection that holds every registered query"""
+        return DEFAULT_STATEMENT_CACHE_SIZE + sum(len(statements.queries) for statements in cls._registries)
+
+    @classmethod
+    def totals(cls) -> Dict[str, int]:
+        """prepared and reused counts of all registries"""
+        return {
+            'prepared': sum(statements.prepared for statements in cls._registries),
+            'reused': sum(statements.reused for statements in cls._registries),
+        }
+
+    def dialect(self, dialect: str, **queries: str) -> "Statements":
+        """variants of the queries used on connections of the dialect, e.g. 'sqlite'"""
+        assert set(queries) <= set(self.queries), f"unknown statements {set(queries) - set(self.queries)}"
+        self.dialects.setdefault(dialect, {}).update(queries)
+        return self
+
+    def query(self, conn: DBConnection, name: str) -> str:
+        assert name in self.queries, f"unknown statement {name}"
+        variants = self.dialects.get(getattr(conn, 'dialect', None), {})  # type: ignore[arg-type]
+        seen = self._seen.setdefault(getattr(conn, '_con', conn), set())
+        if name in seen:
+            self.reused += 1
+        else:
+            seen.add(name)
+            self.prepared += 1
+        return variants.get(name, self.queries[name])
+
+    async def execute(self, conn: DBConnection, name: str, *args: Any) -> str:
+        return await conn.execute(self.query(conn, name), *args)
+
+    async def executemany(self, conn: DBConnection, name: str, args: List[Any]) -> None:
+        await conn.executemany(self.query(conn, name), args)
+
+    async def fetch(self, conn: DBConnection, name: str, *args: Any) -> List[Record]:
+        return await conn.fetch(self.query(conn, name), *args)
+
+    async def fetchrow(self, conn: DBConnection, name: str, *args: Any) -> Optional[Record]:
+        return await conn.fetchrow(self.query(conn, name), *args)
+
+    async def fetchval(self, conn: DBConnection, name: str, *args: Any) -> Any:
+        return await conn.fetchval(self.query(conn, name), *args)
+
+    def __repr__(self) -> str:
+        return f"<Statements queries={len(self.queries)} prepared={self.prepared} reused={self.reused}>"
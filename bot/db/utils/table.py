@@ -1,19 +1,24 @@
-from typing import Type, TypeVar, Generic
+from typing import ClassVar, Type, TypeVar, Generic
 
 import inject
 
 from .entity import Entity
 from .dbtypes import Pool
+from .read_pool import ReadPool
+from .statements import Statements
 
 TEntity = TypeVar('TEntity', bound=Entity)
 
 
 class Table(Generic[TEntity]):
-    @inject.autoparams('pool')
-    def __init__(self, entity: Type[TEntity], pool: Pool) -> None:
+    statements: ClassVar[Statements] = Statements()
+
+    @inject.autoparams('pool', 'read_pool')
+    def __init__(self, entity: Type[TEntity], pool: Pool, read_pool: ReadPool) -> None:
         assert hasattr(entity, '__table_name__')
         self.entity = entity
         self.pool = pool
+        self.read_pool = read_pool
 
     @property
     def __table_name__(self) -> str:
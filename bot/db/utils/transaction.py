@@ -1,21 +1,55 @@
 import logging
+import time
 from types import TracebackType
-from typing import Optional, Type
+from typing import Any, AsyncContextManager, Optional, Type, Union
 
 import inject
 
 from bot.db.utils import Pool, DBConnection, DBTransaction
+from bot.db.utils.read_pool import ReadPool
 
 log = logging.getLogger(__name__)
 
 
 class TransactionContext:
-    def __init__(self, pool: Pool, readonly: bool = False) -> None:
+    """
+    transaction on a connection acquired from the pool, the connection is released back to the pool once it ends
+
+    nested transactions share the connection of their parent and run in a savepoint,
+    so a failing nested transaction rolls back only its own statements
+
+    ```py
+    async with uow.transaction() as transaction:
+        for message in messages:
+            async with transaction.transaction() as savepoint:
+                await repository.insert(message, conn=savepoint.conn)
+    ```
+    """
+
+    def __init__(
+        self,
+        pool: Union[Pool, ReadPool],
+        readonly: bool = False,
+        parent: Optional["TransactionContext"] = None
+    ) -> None:
+        assert parent is None or readonly or not parent.readonly, "read-write transaction nested in a read-only one"
         self.pool = pool
         self.readonly = readonly
+        self.parent = parent
 
-        self.conn: Optional[DBConnection]
-        self._transaction: Optional[DBTransaction]
+        self.conn: Optional[DBConnection] = None
+        self.elapsed: Optional[float] = None
+        self._transaction: Optional[DBTransaction] = None
+        self._acquired: Optional[AsyncContextManager[Any]] = None
+        self._started_at = 0.0
+
+    @property
+    def nested(self) -> bool:
+        return self.parent is not None
+
+    def transaction(self, readonly: Optional[bool] = None) -> "TransactionContext":
+        """savepoint on the connection of this transaction"""
+        return TransactionContext(self.pool, self.readonly if readonly is None else readonly, parent=self)
 
     async def __aenter__(self) -> "TransactionContext":
         await self._start()
@@ -29,41 +63,64 @@ class TransactionContext:
     ) -> None:
         if exc_val is not None:
             await self._rollback()
-            raise exc_val
         else:
             await self._commit()
 
     async def _start(self) -> None:
-        self.conn = await self.pool.acquire()
-        self._transaction = self.conn.transaction(readonly=self.readonly)
-        await self._transaction.start()
+        self._started_at = time.perf_counter()
+        if self.parent is not None:
+            assert self.parent.conn, "parent transaction has not started"
+            self.conn = self.parent.conn
+        else:
+            self._acquired = self.pool.acquire()
+            self.conn = await self._acquired.__aenter__()
+
+        try:
+            self._transaction = self.conn.transaction(readonly=self.readonly)
+            await self._transaction.start()
+        except BaseException:
+            await self._release()
+            raise
 
     async def _commit(self) -> None:
         assert self._transaction, "no transaction"
-        assert self.conn, "no connection"
-
-        await self._transaction.commit()
-        await self.conn.close()
 
-        self._transaction = None
-        self.conn = None
+        try:
+            await self._transaction.commit()
+        finally:
+            await self._release()
+        log.debug("%s committed in %.3fs", self._kind, self.elapsed)
 
     async def _rollback(self) -> None:
         assert self._transaction, "no transaction"
-        assert self.conn, "no connection"
 
-        await self._transaction.rollback()
-        log.error("Transaction failed, statement rolled back")
-        await self.conn.close()
+        try:
+            await self._transaction.rollback()
+        finally:
+            await self._release()
+        log.error("%s failed after %.3fs, statements rolled back", self._kind, self.elapsed)
+
+    async def _release(self) -> None:
+        assert self.conn, "no connection"
 
+        self.elapsed = time.perf_counter() - self._started_at
+        if self._acquired is not None:
+            await self._acquired.__aexit__(None, None, None)
+            self._acquired = None
         self._transaction = None
         self.conn = None
 
+    @property
+    def _kind(self) -> str:
+        return "Savepoint" if self.nested else "Transaction"
+
 
 class UnitOfWork:
-    @inject.autoparams('pool')
-    def __init__(self, pool: Pool) -> None:
+    @inject.autoparams('pool', 'read_pool')
+    def __init__(self, pool: Pool, read_pool: ReadPool) -> None:
         self.pool = pool
+        self.read_pool = read_pool
 
     def transaction(self, readonly: bool = False) -> TransactionContext:
-        return TransactionContext(self.pool, readonly)
+        """read-only transactions run on the replica, see `ReadPool`"""
+        return TransactionContext(self.read_pool if readonly else self.pool, readonly)
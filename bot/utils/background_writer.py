@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Generic, List, Optional, TypeVar
+
+log = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class BackgroundWriter(Generic[T]):
+    """
+    writes batches in a background task, in the order they were put
+
+    at most max_pending batches wait for the writer, `put` blocks once they are full,
+    so producers slow down to the speed of the writer instead of piling batches up in memory
+
+    a batch that fails to be written is kept and retried by `join`, which raises if it fails again
+
+    ```py
+    writer = BackgroundWriter(repository.insert_many, max_pending=4)
+    await writer.put(entities)
+    ...
+    await writer.join()
+    ```
+    """
+
+    def __init__(self, write: Callable[[List[T]], Awaitable[None]], max_pending: int = 4) -> None:
+        assert max_pending > 0, "max_pending must be positive"
+        self._write = write
+        self.max_pending = max_pending
+
+        self._queue: Optional[asyncio.Queue[List[T]]] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self._failed: List[List[T]] = []
+
+    def __len__(self) -> int:
+        """number of batches waiting to be written"""
+        return (self._queue.qsize() if self._queue else 0) + len(self._failed)
+
+    async def put(self, batch: List[T]) -> None:
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._task = asyncio.create_task(self._run(self._queue))
+        assert self._queue is not None
+        await self._queue.put(batch)
+
+    async def join(self) -> None:
+        """wait until every batch put so far is written"""
+        if self._queue is not None:
+            await self._queue.join()
+
+        while self._failed:
+            await self._write(self._failed[0])
+            self._failed.pop(0)
+
+    async def close(self) -> None:
+        """wait for the batches put so far, then stop the writer task"""
+        try:
+            await self.join()
+        finally:
+            if self._task is not None:
+                self._task.cancel()
+                self._task = None
+                self._queue = None
+
+    async def _run(self, queue: asyncio.Queue[List[T]]) -> None:
+        while True:
+            batch = await queue.get()
+            try:
+                await self._write(batch)
+            except Exception:
+                log.exception("background write of %d items failed, retrying on join", len(batch))
+                self._failed.append(batch)
+            finally:
+                queue.task_done()
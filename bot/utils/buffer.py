@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Generic, List, Optional, TypeVar
+
+log = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class FlushBuffer(Generic[T]):
+    """
+    collects items and hands them over to the flush callback in batches,
+    either when max_size items are buffered or max_delay seconds after the
+    first buffered item, whichever comes first
+
+    if the flush callback fails, the batch is put back into the buffer
+    and retried by the next flush, so an explicit `flush()` only returns
+    once every item handed to the buffer so far was written
+
+    ```py
+    buffer = FlushBuffer(repository.insert_many, max_size=500, max_delay=10)
+    await buffer.add(entity)
+    ...
+    await buffer.flush()
+    ```
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[T]], Awaitable[None]],
+        max_size: int = 500,
+        max_delay: float = 10.0
+    ) -> None:
+        self._flush = flush
+        self.max_size = max_size
+        self.max_delay = max_delay
+
+        self._items: List[T] = []
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task[None]] = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def add(self, item: T) -> None:
+        self._items.append(item)
+        if len(self._items) >= self.max_size:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        async with self._lock:
+            self._cancel_timer()
+            if not self._items:
+                return
+            items, self._items = self._items, []
+            try:
+                await self._flush(items)
+            except BaseException:
+                self._items[:0] = items
+                raise
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.max_delay)
+        self._timer = None
+        try:
+            await self.flush()
+        except Exception:
+            log.exception("timed flush failed")
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
@@ -1,7 +1,10 @@
+import re
 from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
 
 import discord
 from discord.ext import commands
+from emoji import EMOJI_DATA
 
 from bot.utils.context import Context
 
@@ -39,3 +42,85 @@ async def convert_emoji(ctx: Context, emoji: str) -> AnyEmote:
         pass
 
     return emoji
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """regex matching any of the words, branching character by character and preferring the longest word"""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if '' in node else group
+
+    return build(trie)
+
+
+def _char_ranges(chars: Iterable[str]) -> str:
+    """regex character class body of chars, consecutive code points merged into ranges"""
+    ranges: List[List[int]] = []
+    for code in sorted(set(map(ord, chars))):
+        if ranges and ranges[-1][1] + 1 == code:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return ''.join(re.escape(chr(start)) + ('-' + re.escape(chr(end)) if start != end else '')
+                   for start, end in ranges)
+
+
+CUSTOM_EMOJI_PATTERN = re.compile(r"<(?P<animated>a?):(?P<name>\w+):(?P<id>\d+)>")
+
+# custom emojis (<a:name:id>) and unicode emojis in a single pass,
+# positions starting neither are rejected by one character class lookup
+EMOJI_PATTERN = re.compile(
+    f"(?=[{_char_ranges('<' + ''.join(emoji[0] for emoji in EMOJI_DATA))}])"
+    f"(?:{CUSTOM_EMOJI_PATTERN.pattern}|{_trie_pattern(EMOJI_DATA)})"
+)
+
+
+class EmojiIndex:
+    """
+    custom emojis of the bot's guilds by id
+
+    built once from `bot.emojis` and kept fresh with `update_guild` on `on_guild_emojis_update`,
+    so that emojis are resolved from message content without constructing a command context
+    """
+
+    def __init__(self) -> None:
+        self._emojis: Dict[int, discord.Emoji] = {}
+
+    def __len__(self) -> int:
+        return len(self._emojis)
+
+    def build(self, emojis: Iterable[discord.Emoji]) -> None:
+        self._emojis = {emoji.id: emoji for emoji in emojis}
+
+    def update_guild(self, guild: discord.Guild, emojis: Iterable[discord.Emoji]) -> None:
+        self._emojis = {id: emoji for id, emoji in self._emojis.items() if emoji.guild_id != guild.id}
+        self._emojis.update((emoji.id, emoji) for emoji in emojis)
+
+    def get(self, emoji_id: int) -> Optional[discord.Emoji]:
+        return self._emojis.get(emoji_id)
+
+    def find_emojis(self, content: str) -> List[AnyEmote]:
+        """unicode and custom emojis in content, custom emojis of unknown guilds are partial"""
+        # every unicode emoji contains a non-ascii character
+        pattern = CUSTOM_EMOJI_PATTERN if content.isascii() else EMOJI_PATTERN
+
+        emojis: List[AnyEmote] = []
+        for match in pattern.finditer(content):
+            if match['id'] is None:
+                emojis.append(match[0])
+            elif (emoji := self.get(int(match['id']))) is not None:
+                emojis.append(emoji)
+            else:
+                emojis.append(discord.PartialEmoji(name=match['name'], id=int(match['id']),
+                                                   animated=bool(match['animated'])))
+        return emojis
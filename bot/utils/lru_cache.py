@@ -0,0 +1,55 @@
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class LRUCache(Generic[K, V]):
+    """
+    mapping of at most `capacity` items, the least recently used item is evicted first
+
+    `get` counts hits and misses, plain membership tests do not
+    """
+
+    def __init__(self, capacity: int) -> None:
+        assert capacity > 0, "capacity must be positive"
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[K, V] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._items
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if len(self._items) > self.capacity:
+            self._items.popitem(last=False)
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        if key not in self._items:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._items.move_to_end(key)
+        return self._items[key]
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        return self._items.pop(key, default)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __repr__(self) -> str:
+        return (f"<LRUCache size={len(self)}/{self.capacity} "
+                f"hits={self.hits} misses={self.misses}>")
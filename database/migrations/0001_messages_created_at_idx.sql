@@ -0,0 +1,8 @@
+-- no-transaction
+-- Index: messages_idx_created_at
+
+DROP INDEX CONCURRENTLY IF EXISTS server.messages_idx_created_at;
+
+CREATE INDEX CONCURRENTLY messages_idx_created_at
+    ON server.messages USING btree
+    (created_at ASC NULLS LAST);
@@ -0,0 +1,8 @@
+-- no-transaction
+-- Index: courses_idx_lower_code, used by CourseRepository.find_by_code
+
+DROP INDEX CONCURRENTLY IF EXISTS muni.courses_idx_lower_code;
+
+CREATE INDEX CONCURRENTLY courses_idx_lower_code
+    ON muni.courses USING btree
+    (lower(faculty::text), lower(code::text));
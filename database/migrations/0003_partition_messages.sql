@@ -0,0 +1,137 @@
+-- no-transaction
+-- Table: server.messages, partitioned by month of created_at
+--
+-- the table is renamed to server.messages_unpartitioned, a partitioned server.messages takes its place
+-- and the rows are moved over in batches, each batch committed on its own,
+-- an interrupted migration continues where it stopped when it runs again
+--
+-- unique keys of a partitioned table include the partition key, so the primary key becomes (id, created_at)
+-- and the foreign keys referencing server.messages (id) are dropped
+
+-- FUNCTION: server.create_message_partitions(timestamp with time zone, timestamp with time zone)
+
+CREATE OR REPLACE FUNCTION server.create_message_partitions(from_date timestamp with time zone,
+                                                            to_date timestamp with time zone)
+    RETURNS integer
+    LANGUAGE plpgsql
+AS
+$$
+DECLARE
+    month timestamp with time zone := date_trunc('month', from_date, 'UTC');
+    partition text;
+    created integer := 0;
+BEGIN
+    WHILE month < to_date LOOP
+        partition := 'messages_' || to_char(month AT TIME ZONE 'UTC', '"y"YYYY"m"MM');
+        IF to_regclass('server.' || partition) IS NULL THEN
+            EXECUTE format('CREATE TABLE server.%I PARTITION OF server.messages FOR VALUES FROM (%L) TO (%L)',
+                           partition, month, month + interval '1 month');
+            created := created + 1;
+        END IF;
+        month := month + interval '1 month';
+    END LOOP;
+    RETURN created;
+END
+$$;
+
+DO
+$$
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'server.messages'::regclass) = 'p' THEN
+        RETURN;
+    END IF;
+
+    ALTER TABLE server.messages RENAME TO messages_unpartitioned;
+    ALTER TABLE server.messages_unpartitioned RENAME CONSTRAINT messages_pkey TO messages_unpartitioned_pkey;
+    ALTER INDEX server.fki_messages_fkey_channel RENAME TO fki_messages_unpartitioned_fkey_channel;
+    ALTER INDEX server.fki_messages_fkey_thread RENAME TO fki_messages_unpartitioned_fkey_thread;
+    ALTER INDEX server.fki_messages_fkey_user RENAME TO fki_messages_unpartitioned_fkey_user;
+    ALTER INDEX IF EXISTS server.messages_idx_created_at RENAME TO messages_unpartitioned_idx_created_at;
+    -- the rows are counted into the leaderboard already
+    DROP TRIGGER IF EXISTS update_leaderboard ON server.messages_unpartitioned;
+
+    ALTER TABLE server.attachments DROP CONSTRAINT IF EXISTS attachments_fkey_message;
+    ALTER TABLE server.message_emoji DROP CONSTRAINT IF EXISTS message_emoji_fkey_message;
+    ALTER TABLE server.reactions DROP CONSTRAINT IF EXISTS reactions_fkey_message;
+
+    CREATE TABLE server.messages
+    (
+        channel_id bigint,
+        thread_id bigint,
+        author_id bigint NOT NULL,
+        id bigint NOT NULL,
+        content text COLLATE pg_catalog."default" NOT NULL,
+        is_command boolean NOT NULL DEFAULT false,
+        created_at timestamp with time zone NOT NULL DEFAULT now(),
+        edited_at timestamp with time zone,
+        deleted_at timestamp with time zone,
+        CONSTRAINT messages_pkey PRIMARY KEY (id, created_at),
+        CONSTRAINT messages_fkey_channel FOREIGN KEY (channel_id)
+            REFERENCES server.channels (id),
+        CONSTRAINT messages_fkey_thread FOREIGN KEY (thread_id)
+            REFERENCES server.threads (id),
+        CONSTRAINT messages_fkey_user FOREIGN KEY (author_id)
+            REFERENCES server.users (id)
+    ) PARTITION BY RANGE (created_at);
+
+    CREATE INDEX fki_messages_fkey_channel ON server.messages (channel_id);
+    CREATE INDEX fki_messages_fkey_thread ON server.messages (thread_id);
+    CREATE INDEX fki_messages_fkey_user ON server.messages (author_id);
+    CREATE INDEX messages_idx_created_at ON server.messages (created_at);
+
+    PERFORM server.create_message_partitions('2015-01-01 00:00:00+00', now() + interval '3 months');
+END
+$$;
+
+-- moves the rows in batches of 50000 in order of id, a batch is committed before the next one starts
+DO
+$$
+DECLARE
+    last_id bigint;
+    batch_last_id bigint;
+BEGIN
+    IF to_regclass('server.messages_unpartitioned') IS NULL THEN
+        RETURN;
+    END IF;
+
+    SELECT COALESCE(MAX(id), -1) INTO last_id FROM server.messages;
+    LOOP
+        WITH batch AS (
+            SELECT *
+            FROM server.messages_unpartitioned
+            WHERE id > last_id
+            ORDER BY id
+            LIMIT 50000
+        ), moved AS (
+            INSERT INTO server.messages
+            SELECT * FROM batch
+            ON CONFLICT (id, created_at) DO NOTHING
+        )
+        SELECT MAX(id) INTO batch_last_id FROM batch;
+
+        EXIT WHEN batch_last_id IS NULL;
+        last_id := batch_last_id;
+        COMMIT;
+    END LOOP;
+END
+$$;
+
+DO
+$$
+BEGIN
+    IF to_regclass('server.messages_unpartitioned') IS NULL THEN
+        RETURN;
+    END IF;
+
+    IF (SELECT COUNT(*) FROM server.messages_unpartitioned) <> (SELECT COUNT(*) FROM server.messages) THEN
+        RAISE EXCEPTION 'server.messages_unpartitioned was not moved completely';
+    END IF;
+    DROP TABLE server.messages_unpartitioned;
+
+    CREATE TRIGGER update_leaderboard
+        AFTER INSERT
+        ON server.messages
+        FOR EACH ROW
+        EXECUTE PROCEDURE server.update_leaderboard();
+END
+$$;
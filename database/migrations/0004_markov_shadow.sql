@@ -0,0 +1,12 @@
+-- Table: cogs.markov_shadow, the model of a guild being retrained until it replaces the rows in cogs.markov
+
+CREATE TABLE IF NOT EXISTS cogs.markov_shadow
+(
+    guild_id bigint NOT NULL,
+    context character varying COLLATE pg_catalog."default" NOT NULL,
+    follows character varying(1) COLLATE pg_catalog."default" NOT NULL,
+    frequency integer NOT NULL,
+    CONSTRAINT markov_shadow_pkey PRIMARY KEY (guild_id, context, follows),
+    CONSTRAINT markov_shadow_fkey_guild FOREIGN KEY (guild_id)
+        REFERENCES server.guilds (id)
+);
@@ -0,0 +1,412 @@
+-- schema of database/sql and database/migrations for the SQLite backend, see bot/db/utils/sqlite.py
+--
+-- table names keep their postgres schema, server.guilds becomes the table server_guilds,
+-- timestamps are stored as UTC text '%Y-%m-%d %H:%M:%S.%f' so that they compare in order,
+-- arrays are stored as json
+
+PRAGMA foreign_keys = ON;
+
+-- Table: server.guilds
+
+CREATE TABLE IF NOT EXISTS server.guilds
+(
+    id bigint NOT NULL,
+    name varchar(30) NOT NULL,
+    icon_url text,
+    created_at timestamptz NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f000', 'now')),
+    edited_at timestamptz,
+    deleted_at timestamptz,
+    CONSTRAINT guilds_pkey PRIMARY KEY (id)
+);
+
+-- Table: server.users
+
+CREATE TABLE IF NOT EXISTS server.users
+(
+    id bigint NOT NULL,
+    name varchar NOT NULL,
+    avatar_url text,
+    is_bot boolean NOT NULL DEFAULT false,
+    created_at timestamptz NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f000', 'now')),
+    edited_at timestamptz,
+    deleted_at timestamptz,
+    CONSTRAINT users_pkey PRIMARY KEY (id)
+);
+
+-- Table: server.roles
+
+CREATE TABLE IF NOT EXISTS server.roles
+(
+    guild_id bigint NOT NULL,
+    id bigint NOT NULL,
+    name varchar(100) NOT NULL,
+    color varchar(8) NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f000', 'now')),
+    edited_at timestamptz,
+    deleted_at timestamptz,
+    CONSTRAINT roles_pkey PRIMARY KEY (id),
+    CONSTRAINT roles_fkey_guild FOREIGN KEY (guild_id)
+        REFERENCES server.guilds (id)
+);
+
+CREATE INDEX IF NOT EXISTS fki_roles_fkey_guild
+    ON server.roles (guild_id);
+
+-- Table: server.categories
+
+CREATE TABLE IF NOT EXISTS server.categories
+(
+    guild_id bigint NOT NULL,
+    id bigint NOT NULL,
+    name varchar(100) NOT NULL,
+    "position" integer,
+    created_at timestamptz NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f000', 'now')),
+    edited_at timestamptz,
+    deleted_at timestamptz,
+    CONSTRAINT categories_pkey PRIMARY KEY (id),
+    CONSTRAINT categories_fkey_guild FOREIGN KEY (guild_id)
+        REFERENCES server.guilds (id)
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS categories_idx_position
+    ON server.categories (guild_id, id, "position")
+    WHERE deleted_at IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS fki_categories_fkey_guild
+    ON server.categories (guild_id);
+
+-- Table: server.channels
+
+CREATE TABLE IF NOT EXISTS server.channels
+(
+    guild_id bigint NOT NULL,
+    category_id bigint,
+    id bigint NOT NULL,
+    "name" varchar(100) NOT NULL,
+    "type" text NOT NULL CHECK ("type" IN ('text', 'forum')),
+    created_at timestamptz NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f000', 'now')),
+    edited_at timestamptz,
+    deleted_at timestamptz,
+    CONSTRAINT channels_pkey PRIMARY KEY (id),
+    CONSTRAINT channels_fkey_category FOREIGN KEY (category_id)
+        REFERENCES server.categories (id),
+    CONSTRAINT channels_fkey_guild FOREIGN KEY (guild_id)
+        REFERENCES server.guilds (id)
+);
+
+CREATE INDEX IF NOT EXISTS fki_channels_fkey_category
+    ON server.channels (category_id);
+
+CREATE INDEX IF NOT EXISTS fki_channels_fkey_guild
+    ON server.channels (guild_id);
+
+-- Table: server.threads
+
+CREATE TABLE IF NOT EXISTS server.threads
+(
+    parent_id bigint,
+    id bigint NOT NULL,
+    "name" varchar(100) NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f000', 'now')),
+    archived_at timestamptz,
+    edited_at timestamptz,
+    deleted_at timestamptz,
+    CONSTRAINT threads_pkey PRIMARY KEY (id),
+    CONSTRAINT threads_fkey_channel FOREIGN KEY (parent_id)
+        REFERENCES server.channels (id)
+);
+
+CREATE INDEX IF NOT EXISTS fki_threads_fkey_channel
+    ON server.threads (parent_id);
+
+-- Table: server.messages
+
+CREATE TABLE IF NOT EXISTS server.messages
+(
+    channel_id bigint,
+    thread_id bigint,
+    author_id bigint NOT NULL,
+    id bigint NOT NULL,
+    content text NOT NULL,
+    is_command boolean NOT NULL DEFAULT false,
+    created_at timestamptz NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f000', 'now')),
+    edited_at timestamptz,
+    deleted_at timestamptz,
+    CONSTRAINT messages_pkey PRIMARY KEY (id),
+    CONSTRAINT messages_fkey_channel FOREIGN KEY (channel_id)
+        REFERENCES server.channels (id),
+    CONSTRAINT messages_fkey_thread FOREIGN KEY (thread_id)
+        REFERENCES server.threads (id),
+    CONSTRAINT messages_fkey_user FOREIGN KEY (author_id)
+        REFERENCES server.users (id)
+);
+
+CREATE INDEX IF NOT EXISTS fki_messages_fkey_channel
+    ON server.messages (channel_id);
+
+CREATE INDEX IF NOT EXISTS fki_messages_fkey_thread
+    ON server.messages (thread_id);
+
+CREATE INDEX IF NOT EXISTS fki_messages_fkey_user
+    ON server.messages (author_id);
+
+CREATE INDEX IF NOT EXISTS messages_idx_created_at
+    ON server.messages (created_at);
+
+-- the conflict target of the partitioned PostgreSQL table
+CREATE UNIQUE INDEX IF NOT EXISTS messages_idx_id_created_at
+    ON server.messages (id, created_at);
+
+-- Table: server.attachments
+
+CREATE TABLE IF NOT EXISTS server.attachments
+(
+    message_id bigint,
+    id bigint NOT NULL,
+    filename text,
+    url text,
+    CONSTRAINT attachments_pkey PRIMARY KEY (id)
+    -- no foreign key to server.messages, it is partitioned in PostgreSQL
+);
+
+CREATE INDEX IF NOT EXISTS fki_attachments_fkey_message
+    ON server.attachments (message_id);
+
+-- Table: server.emojis
+
+CREATE TABLE IF NOT EXISTS server.emojis
+(
+    id bigint NOT NULL,
+    name varchar NOT NULL,
+    url varchar,
+    animated boolean,
+    created_at timestamptz DEFAULT (strftime('%Y-%m-%d %H:%M:%f000', 'now')),
+    edited_at timestamptz,
+    deleted_at timestamptz,
+    CONSTRAINT emojis_pkey PRIMARY KEY (id)
+);
+
+-- Table: server.message_emoji
+
+CREATE TABLE IF NOT EXISTS server.message_emoji
+(
+    message_id bigint NOT NULL,
+    emoji_id bigint NOT NULL,
+    count integer NOT NULL,
+    edited_at timestamptz,
+    CONSTRAINT message_emoji_fkey_emoji FOREIGN KEY (emoji_id)
+        REFERENCES server.emojis (id)
+    -- no foreign key to server.messages, it is partitioned in PostgreSQL
+);
+
+CREATE INDEX IF NOT EXISTS fki_message_emojis_fkey_emoji
+    ON server.message_emoji (emoji_id);
+
+CREATE INDEX IF NOT EXISTS fki_message_emojis_fkey_message
+    ON server.message_emoji (message_id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_message_emojis_unique
+    ON server.message_emoji (message_id, emoji_id);
+
+-- Table: server.reactions
+
+CREATE TABLE IF NOT EXISTS server.reactions
+(
+    message_id bigint NOT NULL,
+    emoji_id bigint NOT NULL,
+    member_ids jsonarray NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f000', 'now')),
+    edited_at timestamptz,
+    deleted_at timestamptz,
+    CONSTRAINT reactions_fkey_emoji FOREIGN KEY (emoji_id)
+        REFERENCES server.emojis (id)
+    -- no foreign key to server.messages, it is partitioned in PostgreSQL
+);
+
+CREATE INDEX IF NOT EXISTS fki_reactions_fkey_emoji
+    ON server.reactions (emoji_id);
+
+CREATE INDEX IF NOT EXISTS fki_reactions_fkey_message
+    ON server.reactions (message_id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_reactions_unique
+    ON server.reactions (message_id, emoji_id);
+
+-- Table: muni.faculties
+
+CREATE TABLE IF NOT EXISTS muni.faculties
+(
+    id integer NOT NULL,
+    code varchar NOT NULL,
+    name varchar NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f000', 'now')),
+    edited_at timestamptz,
+    deleted_at timestamptz,
+    CONSTRAINT faculties_pkey PRIMARY KEY (id)
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS faculties_code_idx_unique
+    ON muni.faculties (code);
+
+-- Table: muni.courses
+
+CREATE TABLE IF NOT EXISTS muni.courses
+(
+    faculty varchar NOT NULL,
+    code varchar NOT NULL,
+    name varchar NOT NULL,
+    url text NOT NULL,
+    terms jsonarray NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f000', 'now')),
+    edited_at timestamptz,
+    deleted_at timestamptz,
+    CONSTRAINT courses_pkey PRIMARY KEY (faculty, code),
+    CONSTRAINT fki_course_faculty_fkey_faculty FOREIGN KEY (faculty)
+        REFERENCES muni.faculties (code)
+);
+
+CREATE INDEX IF NOT EXISTS fki_course_faculty_fkey_faculty
+    ON muni.courses (faculty);
+
+CREATE INDEX IF NOT EXISTS courses_idx_lower_code
+    ON muni.courses (lower(faculty), lower(code));
+
+-- Table: muni.course_guild
+
+CREATE TABLE IF NOT EXISTS muni.course_guild
+(
+    faculty varchar NOT NULL,
+    code varchar NOT NULL,
+    guild_id bigint NOT NULL,
+    category_id bigint,
+    channel_id bigint NOT NULL,
+    CONSTRAINT course_guild_fkey_channel FOREIGN KEY (channel_id)
+        REFERENCES server.channels (id),
+    CONSTRAINT course_guild_fkey_code FOREIGN KEY (code, faculty)
+        REFERENCES muni.courses (code, faculty),
+    CONSTRAINT course_guild_fkey_guild FOREIGN KEY (guild_id)
+        REFERENCES server.guilds (id)
+);
+
+CREATE INDEX IF NOT EXISTS fki_course_guild_fkey_channel
+    ON muni.course_guild (channel_id);
+
+CREATE INDEX IF NOT EXISTS fki_course_guild_fkey_code
+    ON muni.course_guild (code);
+
+CREATE INDEX IF NOT EXISTS fki_course_guild_fkey_guild
+    ON muni.course_guild (guild_id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS course_guild_idx_unique
+    ON muni.course_guild (faculty, code, guild_id);
+
+-- Table: muni.students
+
+CREATE TABLE IF NOT EXISTS muni.students
+(
+    faculty varchar NOT NULL,
+    code varchar NOT NULL,
+    guild_id bigint NOT NULL,
+    member_id bigint NOT NULL,
+    joined_at timestamptz NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f000', 'now')),
+    left_at timestamptz,
+    CONSTRAINT students_pkey PRIMARY KEY (faculty, code, guild_id, member_id),
+    CONSTRAINT students_fkey_code FOREIGN KEY (code, faculty)
+        REFERENCES muni.courses (code, faculty),
+    CONSTRAINT students_fkey_guild FOREIGN KEY (guild_id)
+        REFERENCES server.guilds (id)
+);
+
+CREATE INDEX IF NOT EXISTS fki_students_fkey_code
+    ON muni.students (code, faculty);
+
+CREATE INDEX IF NOT EXISTS fki_students_fkey_guild
+    ON muni.students (guild_id);
+
+-- Table: cogs.markov
+
+CREATE TABLE IF NOT EXISTS cogs.markov
+(
+    guild_id bigint NOT NULL,
+    context varchar NOT NULL,
+    follows varchar(1) NOT NULL,
+    frequency integer NOT NULL,
+    CONSTRAINT markov_pkey PRIMARY KEY (guild_id, context, follows),
+    CONSTRAINT markov_fkey_guild FOREIGN KEY (guild_id)
+        REFERENCES server.guilds (id)
+);
+
+CREATE INDEX IF NOT EXISTS fki_markov_fkey_guild
+    ON cogs.markov (guild_id);
+
+-- Table: cogs.markov_shadow
+
+CREATE TABLE IF NOT EXISTS cogs.markov_shadow
+(
+    guild_id bigint NOT NULL,
+    context varchar NOT NULL,
+    follows varchar(1) NOT NULL,
+    frequency integer NOT NULL,
+    CONSTRAINT markov_shadow_pkey PRIMARY KEY (guild_id, context, follows),
+    CONSTRAINT markov_shadow_fkey_guild FOREIGN KEY (guild_id)
+        REFERENCES server.guilds (id)
+);
+
+-- Table: cogs.leaderboard
+
+CREATE TABLE IF NOT EXISTS cogs.leaderboard
+(
+    channel_id bigint,
+    author_id bigint,
+    messages_sent integer
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS leaderboard_unique
+    ON cogs.leaderboard (channel_id, author_id);
+
+-- Trigger: update_leaderboard, split by the branches of server.update_leaderboard(),
+-- inserts of triggers can not alias their table
+
+CREATE TRIGGER IF NOT EXISTS update_leaderboard_thread
+    AFTER INSERT ON server.messages
+    WHEN NEW.channel_id IS NULL
+BEGIN
+    INSERT INTO cogs.leaderboard (channel_id, author_id, messages_sent)
+    SELECT channel.id, NEW.author_id, 1
+        FROM server.threads AS thread
+        INNER JOIN server.channels channel ON channel.id = thread.parent_id
+        WHERE thread.id = NEW.thread_id
+    ON CONFLICT (channel_id, author_id) DO UPDATE
+        SET messages_sent = messages_sent + 1;
+
+    INSERT INTO cogs.leaderboard (channel_id, author_id, messages_sent)
+    VALUES (NEW.thread_id, NEW.author_id, 1)
+    ON CONFLICT (channel_id, author_id) DO UPDATE
+        SET messages_sent = messages_sent + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS update_leaderboard_channel
+    AFTER INSERT ON server.messages
+    WHEN NEW.channel_id IS NOT NULL
+BEGIN
+    INSERT INTO cogs.leaderboard (channel_id, author_id, messages_sent)
+    VALUES (NEW.channel_id, NEW.author_id, 1)
+    ON CONFLICT (channel_id, author_id) DO UPDATE
+        SET messages_sent = messages_sent + 1;
+END;
+
+-- Table: cogs.logger
+
+CREATE TABLE IF NOT EXISTS cogs.logger
+(
+    channel_id bigint NOT NULL,
+    from_date timestamptz NOT NULL,
+    to_date timestamptz,
+    finished_at timestamptz
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS logger_idx_unique_end
+    ON cogs.logger (channel_id, to_date);
+
+CREATE UNIQUE INDEX IF NOT EXISTS logger_idx_unique_start
+    ON cogs.logger (channel_id, from_date);
@@ -0,0 +1,52 @@
+"""
+rows per second of `Entity.convert_many` compared to the dict based conversion it replaced
+
+    python -m tests.benchmarks.entity_convert
+"""
+import sys
+import timeit
+from dataclasses import fields
+from datetime import datetime
+from typing import Any, List, Type
+
+from asyncpg import Record
+from asyncpg.protocol.protocol import _create_record
+
+from bot.db import CourseEntity, MessageEntity
+from bot.db.utils import Entity
+
+ROWS = 10_000
+REPEAT = 5
+
+
+def make_records(entity: Type[Entity], values: List[Any]) -> List[Record]:
+    mapping = {field.name: i for i, field in enumerate(fields(entity))}  # type: ignore[arg-type]
+    return [_create_record(mapping, tuple(values)) for _ in range(ROWS)]
+
+
+def convert_with_dict(entity: Type[Entity], records: List[Record]) -> List[Entity]:
+    return [entity(**{k: v for (k, v) in record.items()}) for record in records]
+
+
+def rows_per_second(fn: Any) -> float:
+    return ROWS / min(timeit.repeat(fn, number=1, repeat=REPEAT))
+
+
+def main() -> None:
+    now = datetime.now()
+    cases = [
+        (MessageEntity, [10, None, 20, 30, "hello there", False, now, None, None]),
+        (CourseEntity, ["FI", "IB111", "Foundations of Programming", "https://is.muni.cz", ["podzim 2022"], now,
+                        None, None]),
+    ]
+    for entity, values in cases:
+        records = make_records(entity, values)
+        before = rows_per_second(lambda: convert_with_dict(entity, records))
+        after = rows_per_second(lambda: entity.convert_many(records))
+        instance = entity.convert(records[0])
+        print(f"{entity.__name__:>14}: {before:>12,.0f} -> {after:>12,.0f} rows/s ({after / before:.2f}x), "
+              f"{sys.getsizeof(instance)} bytes per instance, has __dict__: {hasattr(instance, '__dict__')}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+import unittest
+import unittest.mock
+
+import inject
+from discord.ext import commands
+
+import tests.helpers as helpers
+from bot.cogs.logger.processors import (
+    AttachmentBackup, Backup, BotBackup, EmojiBackup, MessageEmojiBackup, ReactionBackup, UserBackup, setup_injections
+)
+from bot.utils import MessageAttachment, MessageEmote
+from tests.bot.utils import mock_database
+
+
+class BackupTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        def setup_test_injections(binder: inject.Binder) -> None:
+            binder.install(mock_database)
+            binder.install(setup_injections)
+            binder.bind(commands.Bot, helpers.MockBot())
+        inject.clear_and_configure(setup_test_injections)
+
+    def test_key_given_emojis_uses_emoji_id(self) -> None:
+        backup = EmojiBackup()
+
+        self.assertEqual(4123, backup.key(helpers.MockEmoji(id=4123)))
+        self.assertEqual(sum(map(ord, "👍")), backup.key("👍"))
+
+    def test_key_given_reactions_of_different_messages_differ(self) -> None:
+        backup = ReactionBackup()
+        emoji = helpers.MockEmoji(id=4123)
+        reaction1 = helpers.MockReaction(emoji=emoji, message=helpers.MockMessage(id=1))
+        reaction2 = helpers.MockReaction(emoji=emoji, message=helpers.MockMessage(id=2))
+
+        self.assertEqual((1, 4123), backup.key(reaction1))
+        self.assertNotEqual(backup.key(reaction1), backup.key(reaction2))
+
+    def test_key_given_message_emoji_uses_message_and_emoji(self) -> None:
+        backup = MessageEmojiBackup()
+
+        self.assertEqual((1, 4123), backup.key(MessageEmote(helpers.MockMessage(id=1), helpers.MockEmoji(id=4123))))
+
+    def test_key_given_attachment_uses_attachment_id(self) -> None:
+        backup = AttachmentBackup()
+        attachment = helpers.MockAttachment(id=7)
+
+        self.assertEqual(7, backup.key(MessageAttachment(helpers.MockMessage(id=1), attachment)))
+
+    async def test_backup_given_ledger_matching_count_skips_fetching_users(self) -> None:
+        backup = ReactionBackup()
+        reaction = helpers.MockReaction(emoji=helpers.MockEmoji(id=4123), message=helpers.MockMessage(id=1), count=3)
+        backup.reaction_repository.find_member_counts.return_value = {(1, 4123): 3}
+
+        await backup.preload([reaction])
+        await backup.backup(reaction)
+
+        reaction.users.assert_not_called()
+        backup.reaction_repository.insert.assert_not_called()
+
+    async def test_traverse_down_given_backed_up_reaction_drops_preloaded_count(self) -> None:
+        backup = ReactionBackup()
+        reaction = helpers.MockReaction(emoji=helpers.MockEmoji(id=4123), message=helpers.MockMessage(id=1), count=3)
+        backup.reaction_repository.find_member_counts.return_value = {(1, 4123): 3}
+        backup._backedUp[backup.key(reaction)] = True
+
+        await backup.preload([reaction])
+        await backup.traverse_down(reaction)
+
+        self.assertEqual({}, backup._ledger_counts)
+
+    async def test_backup_given_ledger_behind_fetches_users(self) -> None:
+        backup = ReactionBackup()
+        reaction = helpers.MockReaction(emoji=helpers.MockEmoji(id=4123), message=helpers.MockMessage(id=1), count=3)
+        reaction.users.return_value = helpers.AsyncIterator([])
+        backup.reaction_repository.find_member_counts.return_value = {(1, 4123): 2}
+
+        await backup.backup(reaction)
+
+        reaction.users.assert_called_once()
+        backup.reaction_repository.insert.assert_awaited_once()
+
+    async def test_traverse_up_given_same_user_backs_up_once(self) -> None:
+        backup = UserBackup()
+        user = helpers.MockMember(id=2123)
+
+        await backup.traverse_up(user)
+        await backup.traverse_up(user)
+
+        self.assertEqual(1, backup.user_repository.insert.await_count)
+
+    async def test_clear_caches_given_renamed_user_backs_it_up_again(self) -> None:
+        backup = UserBackup()
+        user = helpers.MockMember(id=2123, name='Will')
+
+        await backup.traverse_up(user)
+        Backup.clear_caches()
+        user.name = 'Bill'
+        await backup.traverse_up(user)
+
+        self.assertEqual(2, backup.user_repository.insert.await_count)
+
+    async def test_clear_caches_given_unchanged_user_skips_the_upsert(self) -> None:
+        backup = UserBackup()
+        user = helpers.MockMember(id=2123, name='Will')
+
+        await backup.traverse_up(user)
+        Backup.clear_caches()
+        await backup.traverse_up(user)
+
+        self.assertEqual(1, backup.user_repository.insert.await_count)
+
+    async def test_traverse_down_many_given_members_writes_them_in_one_batch(self) -> None:
+        backup = UserBackup()
+        member1, member2 = helpers.MockMember(id=2123, name='Will'), helpers.MockMember(id=2124, name='Bill')
+
+        await backup.traverse_up(member1)
+        await backup.traverse_down_many([member1, member2])
+
+        backup.user_repository.insert_many.assert_awaited_once()
+        self.assertEqual([2124], [user.id for user in backup.user_repository.insert_many.await_args.args[0]])
+
+    async def test_mark_departed_users_given_all_guilds_chunked_keeps_members_of_any_guild(self) -> None:
+        backup = BotBackup()
+        backup.user_repository.soft_delete_missing.return_value = 1
+        guild1 = helpers.MockGuild(members=[helpers.MockMember(id=2123)])
+        guild2 = helpers.MockGuild(members=[helpers.MockMember(id=2123), helpers.MockMember(id=2124)])
+
+        await backup.mark_departed_users(helpers.MockBot(guilds=[guild1, guild2]))
+
+        self.assertEqual([2123, 2124], sorted(backup.user_repository.soft_delete_missing.await_args.args[0]))
+
+    async def test_mark_departed_users_given_unchunked_guild_marks_nobody(self) -> None:
+        backup = BotBackup()
+        guild = helpers.MockGuild(members=[helpers.MockMember(id=2123)], chunked=False)
+
+        await backup.mark_departed_users(helpers.MockBot(guilds=[guild]))
+
+        backup.user_repository.soft_delete_missing.assert_not_called()
@@ -0,0 +1,102 @@
+import unittest
+import unittest.mock
+from datetime import datetime
+
+import discord
+import inject
+from pytz import UTC
+
+import bot.db
+import tests.helpers as helpers
+from bot.cogs.logger.live_ingestion import LiveIngestion
+from bot.cogs.logger.processors import Backup
+from bot.utils import AnyEmote
+
+
+class LiveIngestionTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.message_backup = unittest.mock.AsyncMock()
+        self.emoji_backup = unittest.mock.AsyncMock()
+        self.message_repository = unittest.mock.AsyncMock()
+        self.reaction_repository = unittest.mock.AsyncMock()
+        self.logger_repository = unittest.mock.AsyncMock()
+        self._mock_injections()
+
+        self.channel = helpers.MockTextChannel(id=10)
+        self.guild = helpers.MockGuild(id=1)
+
+    async def test_flush_given_messages_records_live_coverage_per_channel(self) -> None:
+        ingestion = LiveIngestion()
+        ingestion.session_start = datetime(2022, 10, 1, 12, 0, tzinfo=UTC)
+        await ingestion.on_message(self._message(1, datetime(2022, 10, 1, 12, 5, tzinfo=UTC)))
+        await ingestion.on_message(self._message(2, datetime(2022, 10, 1, 12, 9, tzinfo=UTC)))
+
+        await ingestion.flush()
+
+        self.assertEqual(2, self.message_backup.traverse_down.await_count)
+        self.message_backup.flush.assert_awaited_once()
+        self.logger_repository.extend_live_process.assert_awaited_once_with((
+            10,
+            datetime(2022, 10, 1, 12, 0, tzinfo=UTC),
+            datetime(2022, 10, 1, 12, 9, tzinfo=UTC)
+        ))
+
+    async def test_flush_given_mixed_events_writes_them_in_order(self) -> None:
+        ingestion = LiveIngestion()
+        manager = unittest.mock.Mock()
+        manager.attach_mock(self.message_backup.flush, 'flush')
+        manager.attach_mock(self.message_repository.edit_many, 'edit_many')
+        manager.attach_mock(self.message_repository.soft_delete_many, 'soft_delete_many')
+
+        await ingestion.on_message(self._message(1, datetime(2022, 10, 1, 12, 5, tzinfo=UTC)))
+        await ingestion.on_message_edit(self._edit_payload(1, "edited"))
+        await ingestion.on_message_delete([1, 2])
+
+        await ingestion.flush()
+
+        self.assertEqual(['flush', 'edit_many', 'soft_delete_many'], [name for name, *_ in manager.mock_calls])
+        self.message_repository.edit_many.assert_awaited_once_with([(1, "edited", False)])
+        self.message_repository.soft_delete_many.assert_awaited_once_with([1, 2])
+
+    async def test_on_message_edit_given_embed_only_update_is_ignored(self) -> None:
+        ingestion = LiveIngestion()
+        payload = self._edit_payload(1, "")
+        del payload.data['content']
+
+        await ingestion.on_message_edit(payload)
+        await ingestion.flush()
+
+        self.message_repository.edit_many.assert_not_called()
+
+    async def test_on_reaction_add_backs_up_emoji_before_the_reaction(self) -> None:
+        ingestion = LiveIngestion()
+        payload = unittest.mock.Mock(spec=discord.RawReactionActionEvent)
+        payload.guild_id, payload.message_id, payload.user_id = 1, 1047592744380936192, 3
+        payload.emoji = discord.PartialEmoji(name="👍")
+
+        await ingestion.on_reaction_add(payload)
+        await ingestion.flush()
+
+        self.emoji_backup.traverse_up.assert_awaited_once_with("👍")
+        (data,), _ = self.reaction_repository.add_members.await_args
+        self.assertEqual([(1047592744380936192, sum(map(ord, "👍")), 3, discord.utils.snowflake_time(1047592744380936192))],
+                         data)
+
+    def _message(self, id: int, created_at: datetime) -> helpers.MockMessage:
+        return helpers.MockMessage(id=id, channel=self.channel, guild=self.guild, created_at=created_at)
+
+    @staticmethod
+    def _edit_payload(message_id: int, content: str) -> unittest.mock.Mock:
+        payload = unittest.mock.Mock(spec=discord.RawMessageUpdateEvent)
+        payload.guild_id, payload.message_id, payload.data = 1, message_id, {'content': content}
+        return payload
+
+    def _mock_injections(self) -> None:
+        def setup_injections(binder: inject.Binder) -> None:
+            binder.bind(Backup[discord.Message], self.message_backup)
+            binder.bind(Backup[AnyEmote], self.emoji_backup)
+            binder.bind(bot.db.MessageRepository, self.message_repository)
+            binder.bind(bot.db.ReactionRepository, self.reaction_repository)
+            binder.bind(bot.db.LoggerRepository, self.logger_repository)
+
+        inject.clear_and_configure(setup_injections)
@@ -18,7 +18,6 @@ from tests.bot.utils import mock_database
 class LoggerTests(unittest.IsolatedAsyncioTestCase):
     def setUp(self) -> None:
         self.bot = helpers.MockBot(guilds=[guild])
-        self.cog = logger.LoggerCog(self.bot)
         self.logger_repository = unittest.mock.AsyncMock()
         self.message_emoji_repository = unittest.mock.AsyncMock()
 
@@ -28,33 +27,43 @@ class LoggerTests(unittest.IsolatedAsyncioTestCase):
         message_iterator_history.return_value = helpers.AsyncIterator([message1, message2])
         self.logger_repository.find_updatable_processes = unittest.mock.AsyncMock(return_value=[])
         self._mock_injections()
+        inject.instance(bot.db.ReactionRepository).find_member_counts.return_value = {}
+        inject.instance(bot.db.UserRepository).soft_delete_missing.return_value = 0
+        cog = logger.LoggerCog(self.bot)
 
-        await self.cog._backup()
+        await cog._backup()
 
         self.assertEqual(1, self._get_insert_call_count(bot.db.GuildRepository))
-        self.assertEqual(2, self._get_insert_call_count(bot.db.UserRepository))
+        self.assertEqual(2, self._get_insert_call_count(bot.db.UserRepository)
+                         + self._get_insert_many_row_count(bot.db.UserRepository))
         self.assertEqual(1, self._get_insert_call_count(bot.db.RoleRepository))
-        self.assertEqual(1, self._get_insert_call_count(bot.db.EmojiRepository))
+        self.assertEqual(4, self._get_insert_call_count(bot.db.EmojiRepository))
         self.assertEqual(1, self._get_insert_call_count(bot.db.CategoryRepository))
         self.assertEqual(2, self._get_insert_call_count(bot.db.ChannelRepository))
-        self.assertEqual(2, self._get_insert_call_count(bot.db.MessageRepository))
+        self.assertEqual(2, self._get_insert_many_row_count(bot.db.MessageRepository))
         self.assertEqual(3, self._get_insert_call_count(bot.db.MessageEmojiRepository))
         self.assertEqual(1, self._get_insert_call_count(bot.db.ReactionRepository))
         self.assertEqual(1, self._get_insert_call_count(bot.db.AttachmentRepository))
+        inject.instance(bot.db.MessageRepository).create_partitions.assert_awaited_once()
 
 
     @staticmethod
     def _get_insert_call_count(repo: Any) -> int:
         return cast(unittest.mock.AsyncMock, inject.instance(repo).insert).call_count
 
+    @staticmethod
+    def _get_insert_many_row_count(repo: Any) -> int:
+        insert_many = cast(unittest.mock.AsyncMock, inject.instance(repo).insert_many)
+        return sum(len(call.args[0]) for call in insert_many.call_args_list)
+
 
     def _mock_injections(self) -> None:
-        def setup_injections(binder: inject.Binder) -> None:
+        def setup_test_injections(binder: inject.Binder) -> None:
             binder.install(mock_database)
             binder.install(setup_injections)
             binder.bind(commands.Bot, self.bot)
             binder.bind(bot.db.LoggerRepository, self.logger_repository)
-        inject.clear_and_configure(setup_injections)
+        inject.clear_and_configure(setup_test_injections)
 
 
 # ---- data ---- #
@@ -110,6 +119,7 @@ guild.emojis = [emoji1]
 uncategorized_channel = helpers.MockTextChannel(
     id=5123,
     name='uncategories',
+    type=discord.ChannelType.text,
     created_at=datetime(2010, 11, 10, 15, 33, 00),
     category=None,
     guild=guild
@@ -123,12 +133,13 @@ category = helpers.MockCategoryChannel(
 categorised_channel = helpers.MockTextChannel(
     id=5456,
     name='categorised',
+    type=discord.ChannelType.text,
     created_at=datetime(2010, 11, 10, 15, 33, 00),
     category=category,
     guild=guild
 )
-category.text_channels = [categorised_channel]
-guild.text_channels = [uncategorized_channel, categorised_channel]
+category.text_channels = category.channels = [categorised_channel]
+guild.text_channels = guild.channels = [uncategorized_channel, categorised_channel]
 guild.categories = [category]
 
 # messages
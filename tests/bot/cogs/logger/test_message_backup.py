@@ -0,0 +1,94 @@
+import asyncio
+import unittest
+import unittest.mock
+from datetime import datetime
+
+import discord
+import inject
+from discord.ext import commands
+
+import bot.db
+import tests.helpers as helpers
+from bot.cogs.logger.processors import Backup, MessageBackup
+from bot.utils import MessageAttachment, MessageEmote
+
+
+class MessageBackupTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.bot = helpers.MockBot()
+        self.message_repository = unittest.mock.AsyncMock()
+        self.reaction_backup = unittest.mock.AsyncMock()
+        self._mock_injections()
+
+        channel = helpers.MockTextChannel(id=10, type=discord.ChannelType.text)
+        self.message = helpers.MockMessage(id=20, content="hi", created_at=datetime(2022, 10, 1), channel=channel)
+        self.message.reactions = [helpers.MockReaction(message=self.message)]
+
+    async def test_traverse_down_writes_reactions_only_after_the_messages(self) -> None:
+        backup = MessageBackup()
+        backup.emoji_mapper = unittest.mock.AsyncMock(**{'map_emojis.return_value': ()})
+
+        await backup.traverse_down(self.message)
+
+        self.message_repository.insert_many.assert_not_called()
+        self.reaction_backup.traverse_down.assert_not_called()
+
+        await backup.flush()
+
+        self.assertEqual(1, len(self.message_repository.insert_many.await_args.args[0]))
+        self.reaction_backup.traverse_down.assert_awaited_once_with(self.message.reactions[0])
+
+    async def test_flush_given_failing_write_does_not_write_reactions(self) -> None:
+        backup = MessageBackup()
+        self.message_repository.insert_many.side_effect = ConnectionError("database unavailable")
+
+        await backup.traverse_down(self.message)
+        with self.assertRaises(ConnectionError):
+            await backup.flush()
+
+        self.reaction_backup.traverse_down.assert_not_called()
+
+    async def test_writer_leaves_children_to_the_crawler(self) -> None:
+        backup = MessageBackup()
+        backup.emoji_mapper = unittest.mock.AsyncMock(**{'map_emojis.return_value': ()})
+        await backup.traverse_down(self.message)
+
+        await backup._buffer.flush()
+        await backup._writer.join()
+
+        self.message_repository.insert_many.assert_awaited_once()
+        self.reaction_backup.traverse_down.assert_not_called()
+
+        await backup.traverse_down(self.message)
+
+        self.reaction_backup.traverse_down.assert_awaited_once_with(self.message.reactions[0])
+
+    async def test_close_writes_pending_messages_and_stops_the_writer(self) -> None:
+        backup = MessageBackup()
+        backup.emoji_mapper = unittest.mock.AsyncMock(**{'map_emojis.return_value': ()})
+        await backup.traverse_down(self.message)
+        await backup._buffer.flush()
+        task = backup._writer._task
+
+        await backup.close()
+        await asyncio.sleep(0)
+
+        self.message_repository.insert_many.assert_awaited_once()
+        self.reaction_backup.traverse_down.assert_awaited_once()
+        assert task is not None
+        self.assertTrue(task.cancelled())
+
+    def _mock_injections(self) -> None:
+        def setup_injections(binder: inject.Binder) -> None:
+            binder.bind(commands.Bot, self.bot)
+            binder.bind(bot.db.MessageRepository, self.message_repository)
+            binder.bind_to_constructor(bot.db.MessageMapper, bot.db.MessageMapper)
+            binder.bind_to_constructor(bot.db.MessageEmojiMapper, bot.db.MessageEmojiMapper)
+            binder.bind(Backup[discord.Thread], unittest.mock.AsyncMock())
+            binder.bind(Backup[discord.abc.GuildChannel], unittest.mock.AsyncMock())
+            binder.bind(Backup[discord.User | discord.Member], unittest.mock.AsyncMock())
+            binder.bind(Backup[discord.Reaction], self.reaction_backup)
+            binder.bind(Backup[MessageAttachment], unittest.mock.AsyncMock())
+            binder.bind(Backup[MessageEmote], unittest.mock.AsyncMock())
+
+        inject.clear_and_configure(setup_injections)
@@ -1,6 +1,7 @@
 import unittest
 import unittest.mock
 from datetime import datetime
+from typing import AsyncIterator, List
 
 import inject
 from discord.utils import time_snowflake
@@ -10,7 +11,7 @@ from pytz import UTC
 import bot.db
 from bot.cogs.logger.message_iterator import MessageIterator
 import tests.helpers as helpers
-from bot.db import LoggerEntity
+from bot.db import LoggerRepository
 
 
 class MessageIteratorTests(unittest.IsolatedAsyncioTestCase):
@@ -19,49 +20,62 @@ class MessageIteratorTests(unittest.IsolatedAsyncioTestCase):
         self.channel.last_message_id = time_snowflake(datetime(2022, 10, 1, 12, 22, tzinfo=UTC))
         self.logger_repository = unittest.mock.AsyncMock()
 
-    async def test_get_next_from_date_given_new_channel_returns_created_at_date(self) -> None:
-        self.logger_repository.find_last_process.return_value = None
+    async def test_get_next_gap_given_new_channel_returns_created_at_date(self) -> None:
+        self.logger_repository.find_next_gap.return_value = None
         self._mock_injections()
 
         iterator = MessageIterator(self.channel)
-        date = await iterator._get_next_from_date()
+        from_date, to_date = await iterator._get_next_gap()
 
-        self.assertEqual(datetime(2020, 10, 1, 12, 22, tzinfo=UTC), date)
+        self.assertEqual(datetime(2020, 10, 1, 12, 22, tzinfo=UTC), from_date)
+        self.assertIsNone(to_date)
 
-    async def test_get_next_from_date_given_existing_channel_returns(self) -> None:
-        self.logger_repository.find_last_process.return_value = LoggerEntity(
-            1,
+    async def test_get_next_gap_given_existing_channel_returns_end_of_coverage(self) -> None:
+        self.logger_repository.find_next_gap.return_value = LoggerRepository.Gap(
             datetime(2020, 10, 7, 12, 22, tzinfo=UTC),
-            datetime(2022, 10, 1, 12, 22, tzinfo=UTC)
+            None
         )
         self._mock_injections()
 
         iterator = MessageIterator(self.channel)
-        date = await iterator._get_next_from_date()
+        from_date, to_date = await iterator._get_next_gap()
 
-        self.assertEqual(datetime(2020, 10, 7, 12, 22, tzinfo=UTC), date)
+        self.assertEqual(datetime(2020, 10, 7, 12, 22, tzinfo=UTC), from_date)
+        self.assertIsNone(to_date)
 
-    async def test_get_next_from_date_given_existing_channel_and_finished_at_None_reruns(self) -> None:
-        self.logger_repository.find_last_process.return_value = LoggerEntity(
-            1,
+    async def test_get_next_gap_given_gap_before_live_process_returns_bounded_gap(self) -> None:
+        self.logger_repository.find_next_gap.return_value = LoggerRepository.Gap(
             datetime(2020, 10, 1, 12, 22, tzinfo=UTC),
-            None,
-            None
+            datetime(2022, 10, 1, 12, 22, tzinfo=UTC)
         )
         self._mock_injections()
 
         iterator = MessageIterator(self.channel)
-        date = await iterator._get_next_from_date()
+        from_date, to_date = await iterator._get_next_gap()
 
-        self.assertEqual(datetime(2020, 10, 1, 12, 22, tzinfo=UTC), date)
+        self.assertEqual(datetime(2020, 10, 1, 12, 22, tzinfo=UTC), from_date)
+        self.assertEqual(datetime(2022, 10, 1, 12, 22, tzinfo=UTC), to_date)
 
     @freeze_time(datetime(2022, 10, 12, 11, 30, tzinfo=UTC))
     async def test_history_given_finished_process_loads_next_1000(self) -> None:
-        self.logger_repository.find_last_process.return_value = LoggerEntity(
-            1,
-            datetime(2020, 9, 1, 9, 22, tzinfo=UTC),
+        self.logger_repository.find_next_gap.return_value = LoggerRepository.Gap(
             datetime(2020, 9, 25, 9, 22, tzinfo=UTC),
-            datetime(2022, 10, 12, 11, 30, tzinfo=UTC),
+            None
+        )
+        self._mock_injections()
+
+        iterator = MessageIterator(self.channel)
+        await iterator.history()
+
+        self.channel.history.assert_has_calls([
+            unittest.mock.call(after=datetime(2020, 9, 25, 9, 22, tzinfo=UTC), before=None, limit=1_000)
+        ])
+
+    @freeze_time(datetime(2022, 10, 12, 11, 30, tzinfo=UTC))
+    async def test_history_given_bounded_gap_loads_only_the_gap(self) -> None:
+        self.logger_repository.find_next_gap.return_value = LoggerRepository.Gap(
+            datetime(2022, 10, 10, 9, 22, tzinfo=UTC),
+            datetime(2022, 10, 11, 9, 22, tzinfo=UTC)
         )
         self._mock_injections()
 
@@ -69,15 +83,35 @@ class MessageIteratorTests(unittest.IsolatedAsyncioTestCase):
         await iterator.history()
 
         self.channel.history.assert_has_calls([
-            unittest.mock.call(after=datetime(2020, 9, 25, 9, 22, tzinfo=UTC), limit=1_000)
+            unittest.mock.call(
+                after=datetime(2022, 10, 10, 9, 22, tzinfo=UTC),
+                before=datetime(2022, 10, 11, 9, 22, tzinfo=UTC),
+                limit=1_000
+            )
         ])
 
+    async def test_history_given_exhausted_bounded_gap_closes_the_gap(self) -> None:
+        self.logger_repository.find_next_gap.return_value = LoggerRepository.Gap(
+            datetime(2022, 10, 10, 9, 22, tzinfo=UTC),
+            datetime(2022, 10, 11, 9, 22, tzinfo=UTC)
+        )
+        self.channel.history.return_value = helpers.AsyncIterator([])
+        self._mock_injections()
+
+        async for _ in await MessageIterator(self.channel).history():
+            pass
+
+        self.logger_repository.end_process.assert_awaited_once_with((
+            10,
+            datetime(2022, 10, 10, 9, 22, tzinfo=UTC),
+            datetime(2022, 10, 11, 9, 22, tzinfo=UTC)
+        ))
+
     @freeze_time(datetime(2020, 10, 2, 12, 22, tzinfo=UTC))
     async def test_history_given_task_finished_today_does_not_backup_future(self) -> None:
-        self.logger_repository.find_last_process.return_value = LoggerEntity(
-            1,
-            datetime(2020, 10, 1, 12, 22, tzinfo=UTC),
-            datetime(2020, 10, 2, 12, 22, tzinfo=UTC)
+        self.logger_repository.find_next_gap.return_value = LoggerRepository.Gap(
+            datetime(2020, 10, 2, 12, 22, tzinfo=UTC),
+            None
         )
         self._mock_injections()
 
@@ -86,6 +120,36 @@ class MessageIteratorTests(unittest.IsolatedAsyncioTestCase):
 
         self.channel.history.assert_not_called()
 
+    async def test_history_given_long_window_checkpoints_after_flushing(self) -> None:
+        self.logger_repository.find_next_gap.return_value = LoggerRepository.Gap(
+            datetime(2022, 10, 10, 9, 0, tzinfo=UTC),
+            None
+        )
+        messages = [helpers.MockMessage(created_at=datetime(2022, 10, 10, 9, minute, tzinfo=UTC)) for minute in range(1, 6)]
+        self.channel.history.return_value = self._iterate(messages)
+        self._mock_injections()
+        manager = unittest.mock.Mock()
+        flush = manager.flush = unittest.mock.AsyncMock()
+        manager.attach_mock(self.logger_repository.checkpoint_process, 'checkpoint_process')
+
+        iterator = MessageIterator(self.channel, flush=flush)
+        iterator.CHECKPOINT_INTERVAL = 2
+        async for _ in await iterator.history():
+            pass
+
+        self.assertEqual([
+            unittest.mock.call.flush(),
+            unittest.mock.call.checkpoint_process((10, datetime(2022, 10, 10, 9, 0, tzinfo=UTC), messages[1].created_at)),
+            unittest.mock.call.flush(),
+            unittest.mock.call.checkpoint_process((10, datetime(2022, 10, 10, 9, 0, tzinfo=UTC), messages[3].created_at)),
+            unittest.mock.call.flush(),
+        ], manager.mock_calls)
+
+    @staticmethod
+    async def _iterate(messages: List[helpers.MockMessage]) -> AsyncIterator[helpers.MockMessage]:
+        for message in messages:
+            yield message
+
     def _mock_injections(self) -> None:
         def setup_injections(binder: inject.Binder) -> None:
             binder.bind(bot.db.LoggerRepository, self.logger_repository)
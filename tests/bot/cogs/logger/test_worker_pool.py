@@ -0,0 +1,49 @@
+import asyncio
+import unittest
+
+from bot.cogs.logger.worker_pool import WorkerPool
+
+
+class WorkerPoolTests(unittest.IsolatedAsyncioTestCase):
+    async def test_run_given_items_never_exceeds_concurrency(self) -> None:
+        running, peak = 0, 0
+
+        async def process(_item: int) -> None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        processed = await WorkerPool(concurrency=3).run(process, range(10))
+
+        self.assertEqual(10, processed)
+        self.assertEqual(3, peak)
+
+    async def test_run_given_failing_item_processes_the_rest(self) -> None:
+        done = []
+
+        async def process(item: int) -> None:
+            if item == 2:
+                raise ValueError("channel not accessible")
+            done.append(item)
+
+        processed = await WorkerPool(concurrency=2).run(process, range(5))
+
+        self.assertCountEqual([0, 1, 3, 4], done)
+        self.assertEqual(4, processed)
+
+    async def test_run_when_cancelled_stops_all_workers(self) -> None:
+        started = asyncio.Event()
+
+        async def process(_item: int) -> None:
+            started.set()
+            await asyncio.sleep(60)
+
+        task = asyncio.create_task(WorkerPool(concurrency=2).run(process, range(10)))
+        await started.wait()
+        task.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertEqual(1, len(asyncio.all_tasks()))
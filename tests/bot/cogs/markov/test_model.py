@@ -0,0 +1,105 @@
+import unittest
+import unittest.mock
+from array import array
+from collections import Counter
+from typing import AsyncIterator, List
+
+from bot.cogs.markov.generation_service import MarkovGenerationService
+from bot.cogs.markov.model import AliasTable, MarkovModel, MarkovModels
+from bot.db.cogs import MarkovEntity
+
+
+async def pages(*pages: List[MarkovEntity]) -> AsyncIterator[List[MarkovEntity]]:
+    for page in pages:
+        yield page
+
+
+class MarkovModelTests(unittest.TestCase):
+    def test_next_given_unknown_context_returns_none(self) -> None:
+        self.assertIsNone(MarkovModel().next("abc"))
+
+    def test_next_draws_by_frequency(self) -> None:
+        model = MarkovModel()
+        model.add("a", "b", 1)
+        model.add("a", "c", 2)
+        model.add("a", "b", 1)
+
+        with unittest.mock.patch('random.random', side_effect=[0.0, 0.49, 0.5, 0.99]):
+            drawn = [model.next("a") for _ in range(4)]
+
+        self.assertEqual(["b", "b", "c", "c"], drawn)
+
+    def test_next_follows_frequencies(self) -> None:
+        model = MarkovModel()
+        model.add("", "x", 9)
+        model.add("", "y", 1)
+
+        counts = Counter(model.next("") for _ in range(2_000))
+
+        self.assertEqual({"x", "y"}, set(counts))
+        self.assertGreater(counts["x"], counts["y"] * 4)
+
+
+    def test_next_builds_alias_table_once_and_rebuilds_after_add(self) -> None:
+        model = MarkovModel(capacity=1)
+        model.add("a", "b")
+        model.add("c", "d")
+
+        model.next("a")
+        table = model.tables.get("a")
+        model.next("a")
+        self.assertIs(table, model.tables.get("a"))
+
+        model.add("a", "e")
+        self.assertNotIn("a", model.tables)
+        model.next("c")
+        self.assertEqual(1, len(model.tables))
+
+
+class AliasTableTests(unittest.TestCase):
+    def test_alias_table_keeps_probabilities_of_frequencies(self) -> None:
+        frequencies = array('q', [1, 2, 5])
+        table = AliasTable("xyz", frequencies)
+
+        # probability of a character is its own share of the slots plus the slots aliasing it
+        shares = [table.probability[i] / 3 for i in range(3)]
+        for i in range(3):
+            if table.alias[i] != i:
+                shares[table.alias[i]] += (1 - table.probability[i]) / 3
+        for share, frequency in zip(shares, frequencies):
+            self.assertAlmostEqual(frequency / 8, share)
+
+    def test_draw_given_single_character_returns_it(self) -> None:
+        self.assertEqual("x", AliasTable("x", array('q', [3])).draw())
+
+
+class MarkovModelsTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.repository = unittest.mock.MagicMock()
+        self.repository.find_model.side_effect = lambda guild_id: pages(
+            [MarkovEntity(guild_id, "", "h", 1), MarkovEntity(guild_id, "h", "i", 1)],
+            [MarkovEntity(guild_id, "hi", "!", 1)],
+        )
+        self.models = MarkovModels(self.repository)
+
+    async def test_get_loads_model_once(self) -> None:
+        model = await self.models.get(1)
+
+        self.assertIs(model, await self.models.get(1))
+        self.assertEqual(3, len(model))
+        self.repository.find_model.assert_called_once_with(1)
+
+    async def test_loaded_given_invalidated_model_returns_none(self) -> None:
+        await self.models.get(1)
+        self.assertIsNotNone(self.models.loaded(1))
+
+        self.models.invalidate(1)
+
+        self.assertIsNone(self.models.loaded(1))
+
+    async def test_generate_runs_on_loaded_model(self) -> None:
+        service = MarkovGenerationService(self.models)
+
+        self.assertEqual("hi!", await service.generate(1))
+        self.assertEqual("hi!", await service.generate(1, start="h"))
+        self.repository.find_model.assert_called_once_with(1)
@@ -0,0 +1,56 @@
+import unittest
+import unittest.mock
+from collections import Counter
+from datetime import datetime
+from typing import AsyncIterator, List
+
+from bot.cogs.markov.training_service import MarkovTrainingService, count_ngrams
+from bot.db import MessageEntity
+
+
+async def pages(*pages: List[MessageEntity]) -> AsyncIterator[List[MessageEntity]]:
+    for page in pages:
+        yield page
+
+
+def message(content: str) -> MessageEntity:
+    return MessageEntity(10, None, 100, 1, content, False, datetime(2023, 9, 18))
+
+
+class MarkovTrainingTests(unittest.IsolatedAsyncioTestCase):
+    def test_count_ngrams_counts_context_and_follows_pairs(self) -> None:
+        counts = count_ngrams(["abab"], context_size=2)
+
+        self.assertEqual(Counter({("", "a"): 1, ("a", "b"): 1, ("ab", "a"): 1, ("ba", "b"): 1}), counts)
+
+    async def test_train_writes_aggregated_counts_once(self) -> None:
+        markov_repository = unittest.mock.AsyncMock()
+        markov_repository.find_training_messages = unittest.mock.MagicMock(
+            return_value=pages([message("hi"), message("hi")], [message("ha")]))
+        message_repository = unittest.mock.AsyncMock(**{'count.return_value': 3})
+        service = MarkovTrainingService(message_repository, markov_repository, unittest.mock.MagicMock())
+
+        await service.train(1)
+
+        markov_repository.insert.assert_not_awaited()
+        markov_repository.truncate.assert_not_awaited()
+        (entities,), kwargs = markov_repository.insert_many.await_args
+        self.assertEqual({'shadow': True}, kwargs)
+        markov_repository.swap_shadow.assert_awaited_once_with(1)
+        self.assertEqual({("", "h", 3), ("h", "i", 2), ("h", "a", 1)},
+                         {(entity.context, entity.follows, entity.frequency) for entity in entities})
+
+    async def test_train_messages_writes_one_delta_per_guild_in_one_call(self) -> None:
+        markov_repository = unittest.mock.AsyncMock()
+        models = unittest.mock.MagicMock()
+        models.loaded.return_value = None
+        service = MarkovTrainingService(unittest.mock.AsyncMock(), markov_repository, models)
+        messages = [unittest.mock.MagicMock(guild=unittest.mock.MagicMock(id=guild_id), content=content)
+                    for guild_id, content in ((1, "ab"), (2, "ab"), (1, "ab"))]
+
+        await service.train_messages(messages)
+
+        (entities,), _ = markov_repository.insert_many.await_args
+        self.assertEqual({(1, "", "a", 2), (1, "a", "b", 2), (2, "", "a", 1), (2, "a", "b", 1)},
+                         {(entity.guild_id, entity.context, entity.follows, entity.frequency) for entity in entities})
+        self.assertEqual((1, 3), (service.flush_stats.calls, service.flush_stats.rows))
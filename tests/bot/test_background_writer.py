@@ -0,0 +1,62 @@
+import asyncio
+import unittest
+import unittest.mock
+from typing import List
+
+from bot.utils.background_writer import BackgroundWriter
+
+
+class BackgroundWriterTests(unittest.IsolatedAsyncioTestCase):
+    async def test_join_given_batches_writes_them_in_order(self) -> None:
+        written: List[List[int]] = []
+
+        async def write(batch: List[int]) -> None:
+            await asyncio.sleep(0)
+            written.append(batch)
+
+        writer = BackgroundWriter[int](write, max_pending=2)
+        for batch in ([1], [2], [3]):
+            await writer.put(batch)
+        await writer.join()
+
+        self.assertEqual([[1], [2], [3]], written)
+        self.assertEqual(0, len(writer))
+
+    async def test_put_given_full_queue_waits_for_the_writer(self) -> None:
+        release = asyncio.Event()
+
+        async def write(_batch: List[int]) -> None:
+            await release.wait()
+
+        writer = BackgroundWriter[int](write, max_pending=1)
+        await writer.put([1])
+        await asyncio.sleep(0)
+        await writer.put([2])
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(writer.put([3]), timeout=0.05)
+
+        release.set()
+        await writer.join()
+
+    async def test_join_given_failed_batch_retries_it(self) -> None:
+        write = unittest.mock.AsyncMock(side_effect=[ConnectionError("database unavailable"), None, None])
+
+        writer = BackgroundWriter[int](write, max_pending=2)
+        await writer.put([1])
+        await writer.put([2])
+        await writer.join()
+
+        self.assertEqual([unittest.mock.call([1]), unittest.mock.call([2]), unittest.mock.call([1])],
+                         write.await_args_list)
+        self.assertEqual(0, len(writer))
+
+    async def test_join_given_failing_retry_raises_and_keeps_batch(self) -> None:
+        write = unittest.mock.AsyncMock(side_effect=ConnectionError("database unavailable"))
+
+        writer = BackgroundWriter[int](write)
+        await writer.put([1])
+
+        with self.assertRaises(ConnectionError):
+            await writer.join()
+        self.assertEqual(1, len(writer))
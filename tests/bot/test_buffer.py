@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+import unittest.mock
+from typing import List
+
+from bot.utils.buffer import FlushBuffer
+
+
+class FlushBufferTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.batches: List[List[int]] = []
+
+    async def _write(self, items: List[int]) -> None:
+        self.batches.append(items)
+
+    async def test_add_given_max_size_items_flushes_them(self) -> None:
+        buffer = FlushBuffer[int](self._write, max_size=3, max_delay=60)
+
+        for item in range(4):
+            await buffer.add(item)
+
+        self.assertEqual([[0, 1, 2]], self.batches)
+        self.assertEqual(1, len(buffer))
+
+    async def test_add_given_max_delay_passed_flushes_them(self) -> None:
+        buffer = FlushBuffer[int](self._write, max_size=100, max_delay=0.01)
+
+        await buffer.add(1)
+        await buffer.add(2)
+        await asyncio.sleep(0.05)
+
+        self.assertEqual([[1, 2]], self.batches)
+        self.assertEqual(0, len(buffer))
+
+    async def test_flush_writes_buffered_items(self) -> None:
+        buffer = FlushBuffer[int](self._write, max_size=100, max_delay=60)
+
+        await buffer.add(1)
+        await buffer.flush()
+        await buffer.flush()
+
+        self.assertEqual([[1]], self.batches)
+
+    async def test_flush_given_failing_write_keeps_items_for_next_flush(self) -> None:
+        write = unittest.mock.AsyncMock(side_effect=[ConnectionError("database unavailable"), None])
+        buffer = FlushBuffer[int](write, max_size=100, max_delay=60)
+
+        await buffer.add(1)
+        with self.assertRaises(ConnectionError):
+            await buffer.flush()
+        await buffer.add(2)
+        await buffer.flush()
+
+        write.assert_awaited_with([1, 2])
+        self.assertEqual(0, len(buffer))
+
+    async def test_flush_given_failed_timed_flush_raises_again(self) -> None:
+        write = unittest.mock.AsyncMock(side_effect=ConnectionError("database unavailable"))
+        buffer = FlushBuffer[int](write, max_size=100, max_delay=0.01)
+
+        await buffer.add(1)
+        await asyncio.sleep(0.05)
+
+        with self.assertRaises(ConnectionError):
+            await buffer.flush()
+        self.assertEqual(1, len(buffer))
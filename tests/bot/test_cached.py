@@ -0,0 +1,87 @@
+import asyncio
+import unittest
+import unittest.mock
+from typing import List, Optional
+
+from bot.db.utils import AsyncTTLCache, cached
+
+
+class Repository:
+    names = AsyncTTLCache[str](ttl=60, capacity=2)
+
+    def __init__(self) -> None:
+        self.calls: List[int] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    @cached(names)
+    async def find_name(self, id: int, conn: Optional[object] = None) -> str:
+        self.calls.append(id)
+        await self.release.wait()
+        return f"name {id}"
+
+
+class CachedTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        Repository.names.clear()
+        self.repository = Repository()
+
+    async def test_cached_given_repeated_call_queries_once(self) -> None:
+        hits = Repository.names.hits
+        self.assertEqual("name 1", await self.repository.find_name(1))
+        self.assertEqual("name 1", await self.repository.find_name(1))
+
+        self.assertEqual([1], self.repository.calls)
+        self.assertEqual(hits + 1, Repository.names.hits)
+
+    async def test_cached_given_concurrent_misses_queries_once(self) -> None:
+        self.repository.release.clear()
+        lookups = [asyncio.create_task(self.repository.find_name(1)) for _ in range(5)]
+        await asyncio.sleep(0)
+        self.repository.release.set()
+
+        self.assertEqual(["name 1"] * 5, await asyncio.gather(*lookups))
+        self.assertEqual([1], self.repository.calls)
+
+    async def test_cached_given_expired_item_queries_again(self) -> None:
+        await self.repository.find_name(1)
+
+        with unittest.mock.patch('bot.db.utils.cached.time.monotonic', return_value=10 ** 9):
+            await self.repository.find_name(1)
+
+        self.assertEqual([1, 1], self.repository.calls)
+
+    async def test_cached_given_full_cache_evicts_least_recently_used(self) -> None:
+        for id in (1, 2, 1, 3, 1, 2):
+            await self.repository.find_name(id)
+
+        self.assertEqual([1, 2, 3, 2], self.repository.calls)
+
+    async def test_invalidate_given_running_lookup_does_not_cache_its_result(self) -> None:
+        self.repository.release.clear()
+        lookup = asyncio.create_task(self.repository.find_name(1))
+        await asyncio.sleep(0)
+        Repository.names.invalidate(1)
+        self.repository.release.set()
+        await lookup
+
+        await self.repository.find_name(1)
+
+        self.assertEqual([1, 1], self.repository.calls)
+
+    async def test_cached_given_connection_bypasses_cache(self) -> None:
+        await self.repository.find_name(1)
+        await self.repository.find_name(1, conn=object())
+
+        self.assertEqual([1, 1], self.repository.calls)
+
+    async def test_cached_given_failed_lookup_does_not_cache_it(self) -> None:
+        with unittest.mock.patch.object(self.repository.release, 'wait', side_effect=OSError("connection lost")):
+            with self.assertRaises(OSError):
+                await self.repository.find_name(1)
+
+        self.assertEqual("name 1", await self.repository.find_name(1))
+        self.assertEqual([1, 1], self.repository.calls)
+
+    def test_key_given_list_argument_is_hashable(self) -> None:
+        self.assertEqual(AsyncTTLCache.key(['FI:PB152', 'FI:IB000']), AsyncTTLCache.key(('FI:PB152', 'FI:IB000')))
@@ -0,0 +1,35 @@
+import unittest
+
+import discord
+
+import tests.helpers as helpers
+from bot.utils import EmojiIndex
+
+
+class EmojiIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.guild = helpers.MockGuild(id=1)
+        self.kek = helpers.MockEmoji(id=4123, name='kek', guild_id=1)
+
+    def test_find_emojis_given_unicode_and_custom_emojis_keeps_their_order(self) -> None:
+        index = EmojiIndex()
+        index.build([self.kek])
+
+        emojis = index.find_emojis("Oh 👍🏽 hi <:kek:4123> 👨‍👩‍👧 <a:blob:99> 1️⃣")
+
+        self.assertEqual(['👍🏽', self.kek, '👨‍👩‍👧', discord.PartialEmoji(name='blob', id=99, animated=True), '1️⃣'],
+                         emojis)
+
+    def test_find_emojis_given_plain_text_finds_nothing(self) -> None:
+        self.assertEqual([], EmojiIndex().find_emojis("Ahoj, jak se máš? 12 # *"))
+
+    def test_update_guild_replaces_emojis_of_the_guild(self) -> None:
+        index = EmojiIndex()
+        index.build([self.kek])
+        pepe = helpers.MockEmoji(id=4456, name='pepe', guild_id=1)
+
+        index.update_guild(self.guild, [pepe])
+
+        self.assertIsNone(index.get(4123))
+        self.assertEqual(pepe, index.get(4456))
+        self.assertIsInstance(index.find_emojis("<:kek:4123>")[0], discord.PartialEmoji)
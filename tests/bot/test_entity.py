@@ -0,0 +1,37 @@
+import unittest
+from datetime import datetime
+
+from asyncpg.protocol.protocol import _create_record
+
+from bot.db import MessageEntity
+
+
+def record(**values: object) -> object:
+    return _create_record({name: i for i, name in enumerate(values)}, tuple(values.values()))
+
+
+class EntityTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.created_at = datetime(2022, 10, 1)
+
+    def test_convert_given_table_columns_maps_them_by_name(self) -> None:
+        row = record(author_id=20, id=30, channel_id=10, thread_id=None, content="hi", is_command=False,
+                     created_at=self.created_at)
+
+        self.assertEqual(MessageEntity(10, None, 20, 30, "hi", False, self.created_at), MessageEntity.convert(row))
+
+    def test_convert_many_given_missing_optional_column_uses_default(self) -> None:
+        rows = [record(channel_id=10, thread_id=None, author_id=20, id=id, content="hi", is_command=False,
+                       created_at=self.created_at, deleted_at=None) for id in (30, 31)]
+
+        messages = MessageEntity.convert_many(rows)
+
+        self.assertEqual([30, 31], [message.id for message in messages])
+        self.assertIsNone(messages[0].edited_at)
+
+    def test_convert_given_unknown_column_raises(self) -> None:
+        with self.assertRaises(TypeError):
+            MessageEntity.convert(record(id=30, reactions=2))
+
+    def test_entities_have_no_instance_dict(self) -> None:
+        self.assertFalse(hasattr(MessageEntity(10, None, 20, 30, "hi", False, self.created_at), '__dict__'))
@@ -0,0 +1,53 @@
+import unittest
+import unittest.mock
+from datetime import datetime
+
+from pytz import UTC
+
+from bot.db import ChannelEntity, UserEntity
+from bot.db.discord.channels import ChannelType
+from bot.db.utils import FingerprintCache, fingerprint
+
+
+class FingerprintTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.user = UserEntity(2123, 'Will', 'https://cdn/avatar.png', False, datetime(2010, 11, 10, 15, 33))
+        self.repository = unittest.mock.AsyncMock(__table_name__='server.users')
+
+    def test_fingerprint_given_loaded_row_equals_mapped_entity(self) -> None:
+        mapped = ChannelEntity(1, None, 5123, 'general', ChannelType.TEXT, datetime(2010, 11, 10, 15, 33))
+        loaded = ChannelEntity(1, None, 5123, 'general', 'text',  # type: ignore[arg-type]
+                               datetime(2010, 11, 10, 15, 33, tzinfo=UTC),
+                               edited_at=datetime(2022, 1, 1, tzinfo=UTC))
+
+        self.assertEqual(fingerprint(mapped), fingerprint(loaded))
+
+    async def test_upsert_given_unchanged_row_skips_it(self) -> None:
+        self.repository.find_fingerprints.return_value = {2123: fingerprint(self.user)}
+        cache = FingerprintCache()
+
+        await cache.upsert(self.repository, self.user)
+
+        self.repository.insert.assert_not_called()
+        self.assertEqual(1, cache.skipped)
+
+    async def test_upsert_given_changed_row_writes_it_once(self) -> None:
+        self.repository.find_fingerprints.return_value = {2123: fingerprint(self.user)}
+        cache = FingerprintCache()
+        renamed = UserEntity(2123, 'Bill', 'https://cdn/avatar.png', False, datetime(2010, 11, 10, 15, 33))
+
+        await cache.upsert(self.repository, renamed)
+        await cache.upsert(self.repository, renamed)
+
+        self.repository.insert.assert_awaited_once_with(renamed)
+        self.repository.find_fingerprints.assert_awaited_once()
+
+    async def test_upsert_many_given_some_unchanged_rows_writes_the_rest_at_once(self) -> None:
+        self.repository.find_fingerprints.return_value = {2123: fingerprint(self.user)}
+        cache = FingerprintCache()
+        joined = UserEntity(2124, 'Bill', 'https://cdn/avatar.png', False, datetime(2011, 1, 1))
+
+        await cache.upsert_many(self.repository, [self.user, joined])
+
+        self.repository.insert_many.assert_awaited_once_with([joined])
+        self.assertEqual((1, 1), (cache.written, cache.skipped))
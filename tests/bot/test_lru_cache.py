@@ -0,0 +1,49 @@
+import unittest
+
+from bot.utils.lru_cache import LRUCache
+
+
+class LRUCacheTests(unittest.TestCase):
+    def test_setitem_given_full_cache_evicts_least_recently_used(self) -> None:
+        cache = LRUCache[int, str](capacity=2)
+        cache[1] = "one"
+        cache[2] = "two"
+        cache.get(1)
+
+        cache[3] = "three"
+
+        self.assertIn(1, cache)
+        self.assertNotIn(2, cache)
+        self.assertIn(3, cache)
+        self.assertEqual(2, len(cache))
+
+    def test_setitem_given_existing_key_refreshes_it(self) -> None:
+        cache = LRUCache[int, str](capacity=2)
+        cache[1] = "one"
+        cache[2] = "two"
+        cache[1] = "uno"
+
+        cache[3] = "three"
+
+        self.assertEqual("uno", cache.get(1))
+        self.assertNotIn(2, cache)
+
+    def test_get_counts_hits_and_misses(self) -> None:
+        cache = LRUCache[int, str](capacity=2)
+        cache[1] = "one"
+
+        cache.get(1)
+        cache.get(1)
+        cache.get(2)
+
+        self.assertEqual(2, cache.hits)
+        self.assertEqual(1, cache.misses)
+        self.assertAlmostEqual(2 / 3, cache.hit_ratio)
+
+    def test_contains_does_not_count(self) -> None:
+        cache = LRUCache[int, str](capacity=2)
+
+        _ = 1 in cache
+
+        self.assertEqual(0, cache.hits + cache.misses)
+        self.assertEqual(0.0, cache.hit_ratio)
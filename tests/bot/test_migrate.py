@@ -0,0 +1,95 @@
+import contextlib
+import tempfile
+import unittest
+import unittest.mock
+from pathlib import Path
+from typing import AsyncIterator
+
+from bot.db.migrate import Migration, load_migrations, migrate, migrate_url
+
+CONCURRENT_INDEX = """-- no-transaction
+-- Index: messages_idx_created_at
+
+DROP INDEX CONCURRENTLY IF EXISTS server.messages_idx_created_at;
+
+CREATE INDEX CONCURRENTLY messages_idx_created_at
+    ON server.messages USING btree
+    (created_at ASC NULLS LAST);
+"""
+
+FUNCTION_AND_BLOCK = """-- no-transaction
+CREATE FUNCTION server.one() RETURNS integer LANGUAGE plpgsql AS
+$$
+BEGIN
+    RETURN 1;
+END
+$$;
+
+DO
+$$
+BEGIN
+    PERFORM server.one();
+    COMMIT;
+END
+$$;
+"""
+
+
+class MigrateTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.conn = unittest.mock.AsyncMock()
+        self.conn.transaction = unittest.mock.MagicMock()
+        self.pool = unittest.mock.MagicMock(**{'acquire.side_effect': self._acquire})
+
+    @contextlib.asynccontextmanager
+    async def _acquire(self) -> AsyncIterator[unittest.mock.AsyncMock]:
+        yield self.conn
+
+    def test_load_migrations_orders_by_version_and_skips_other_files(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ('0010_later.sql', '0002_earlier.sql', 'README.md'):
+                Path(directory, name).write_text("SELECT 1;")
+
+            migrations = load_migrations(Path(directory))
+
+        self.assertEqual([(2, 'earlier'), (10, 'later')], [(m.version, m.name) for m in migrations])
+
+    def test_statements_given_no_transaction_migration_splits_them(self) -> None:
+        migration = Migration(1, 'messages_created_at_idx', CONCURRENT_INDEX)
+
+        self.assertFalse(migration.transactional)
+        self.assertEqual(2, len(migration.statements))
+        self.assertTrue(migration.statements[1].startswith("CREATE INDEX CONCURRENTLY"))
+
+    def test_statements_given_dollar_quoted_bodies_keeps_them_whole(self) -> None:
+        migration = Migration(1, 'function', FUNCTION_AND_BLOCK)
+
+        self.assertEqual(2, len(migration.statements))
+        self.assertIn("RETURN 1;", migration.statements[0])
+        self.assertTrue(migration.statements[1].startswith("DO"))
+        self.assertTrue(migration.statements[1].endswith("$$"))
+
+    async def test_migrate_applies_only_pending_migrations(self) -> None:
+        self.conn.fetch.return_value = [{'version': 1}]
+        migrations = [Migration(1, 'applied', "SELECT 1;"), Migration(2, 'pending', CONCURRENT_INDEX)]
+
+        applied = await migrate(self.pool, migrations)
+
+        self.assertEqual(1, applied)
+        executed = [call.args[0] for call in self.conn.execute.await_args_list]
+        self.assertNotIn("SELECT 1;", executed)
+        self.assertTrue(any(sql.startswith("CREATE INDEX CONCURRENTLY") for sql in executed))
+        self.conn.transaction.assert_not_called()
+        self.assertIn(2, self.conn.execute.await_args_list[-2].args)
+
+    async def test_migrate_url_uses_a_connection_without_command_timeout(self) -> None:
+        self.conn.fetch.return_value = []
+        self.pool.close = unittest.mock.AsyncMock()
+        with unittest.mock.patch('asyncpg.create_pool', unittest.mock.AsyncMock(return_value=self.pool)) as create_pool:
+            await migrate_url("postgres://localhost/masaryk")
+
+        self.assertIsNone(create_pool.await_args.kwargs['command_timeout'])
+        self.pool.close.assert_awaited_once()
+
+    def test_shipped_migrations_load(self) -> None:
+        self.assertTrue(all(migration.statements for migration in load_migrations()))
@@ -0,0 +1,54 @@
+import contextlib
+import unittest
+import unittest.mock
+from datetime import datetime
+from typing import Any, AsyncIterator, List
+
+from asyncpg.protocol.protocol import _create_record
+
+from bot.db import FacultyEntity
+from bot.db.utils import KeysetPage
+
+COLUMNS = {'id': 0, 'code': 1, 'name': 2, 'created_at': 3}
+
+
+class KeysetPageTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.rows = [_create_record(COLUMNS, (id, f"F{id}", "Faculty", datetime(2022, 1, 1))) for id in range(1, 6)]
+        self.conn = unittest.mock.AsyncMock(**{'fetch.side_effect': self._fetch})
+        self.pool = unittest.mock.MagicMock(**{'acquire.side_effect': self._acquire})
+
+    @contextlib.asynccontextmanager
+    async def _acquire(self) -> AsyncIterator[unittest.mock.AsyncMock]:
+        yield self.conn
+
+    async def _fetch(self, query: str, *args: Any) -> List[Any]:
+        limit = args[-1]
+        after = args[-2] if ') > (' in query else 0
+        return [row for row in self.rows if row['id'] > after][:limit]
+
+    async def _ids(self, pages: KeysetPage[FacultyEntity]) -> List[List[int]]:
+        return [[faculty.id for faculty in faculties] async for faculties in pages]
+
+    async def test_iteration_continues_after_last_key_of_each_page(self) -> None:
+        pages = KeysetPage(self.pool, "SELECT * FROM muni.faculties", FacultyEntity, per_page=2)
+
+        self.assertEqual([[1, 2], [3, 4], [5]], await self._ids(pages))
+        self.assertEqual(3, self.conn.fetch.await_count)
+
+    async def test_iteration_given_prefetch_returns_same_pages(self) -> None:
+        pages = KeysetPage(self.pool, "SELECT * FROM muni.faculties", FacultyEntity, per_page=5, prefetch=True)
+
+        self.assertEqual([[1, 2, 3, 4, 5]], await self._ids(pages))
+        self.assertEqual(2, self.conn.fetch.await_count)
+
+    async def test_query_given_args_numbers_keyset_parameters_after_them(self) -> None:
+        pages = KeysetPage(self.pool, "SELECT * FROM muni.faculties WHERE name=$1", FacultyEntity,
+                           args=("Faculty",), per_page=3)
+
+        await self._ids(pages)
+
+        query, *args = self.conn.fetch.await_args_list[-1].args
+        self.assertIn("WHERE (id) > ($2)", query)
+        self.assertIn("LIMIT $3", query)
+        self.assertEqual(["Faculty", 3, 3], args)
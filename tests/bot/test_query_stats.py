@@ -0,0 +1,59 @@
+import contextlib
+import unittest
+import unittest.mock
+from typing import AsyncIterator, List
+
+from bot.db.utils import DBConnection, QUERY_STATS, inject_conn
+from bot.db.utils.query_stats import QueryStats
+
+
+class Repository:
+    def __init__(self) -> None:
+        self.pool = unittest.mock.MagicMock(**{'acquire.side_effect': self._acquire})
+
+    @contextlib.asynccontextmanager
+    async def _acquire(self) -> AsyncIterator[unittest.mock.AsyncMock]:
+        yield unittest.mock.AsyncMock()
+
+    @inject_conn
+    async def find_ids(self, conn: DBConnection) -> List[int]:
+        return [1, 2, 3]
+
+
+class QueryStatsTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        QUERY_STATS.reset()
+        self.addCleanup(setattr, QUERY_STATS, 'enabled', False)
+
+    async def test_inject_conn_given_enabled_records_calls_and_rows(self) -> None:
+        QUERY_STATS.enabled = True
+
+        await Repository().find_ids()
+        await Repository().find_ids(conn=unittest.mock.AsyncMock())
+
+        stats = QUERY_STATS.methods['Repository.find_ids']
+        self.assertEqual((2, 6), (stats.calls, stats.rows))
+        self.assertEqual(2, sum(stats.histogram))
+
+    async def test_inject_conn_given_disabled_records_nothing(self) -> None:
+        await Repository().find_ids()
+
+        self.assertEqual({}, QUERY_STATS.methods)
+
+    def test_record_given_slow_call_logs_it_with_arguments(self) -> None:
+        stats = QueryStats(enabled=True, slow_query_threshold=0.1)
+
+        with self.assertLogs('bot.db.utils.query_stats', 'WARNING') as logs:
+            stats.record('MessageRepository.soft_delete_many', 0.2, None, args=([5],))
+            stats.record('MessageRepository.count', 0.01, 1)
+
+        self.assertEqual(1, stats.slow_queries)
+        self.assertIn("MessageRepository.soft_delete_many args=([5],)", logs.output[0])
+
+    def test_top_orders_methods_by_total_time(self) -> None:
+        stats = QueryStats(enabled=True)
+        stats.record('MarkovRepository.insert', 0.5, None)
+        stats.record('LoggerRepository.find_next_gap', 2.0, None)
+
+        self.assertEqual(['LoggerRepository.find_next_gap', 'MarkovRepository.insert'],
+                         [method for method, _ in stats.top()])
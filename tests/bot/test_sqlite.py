@@ -0,0 +1,155 @@
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+import inject
+from discord.utils import time_snowflake
+
+from bot.db import (ChannelEntity, ChannelRepository, GuildEntity, GuildRepository, LeaderboardRepository,
+                    LoggerRepository, MessageEntity, MessageRepository, Pool, ReadPool, UnitOfWork, UserEntity,
+                    UserRepository, connect_db)
+from bot.db.cogs import MarkovEntity, MarkovRepository
+from bot.db.cogs.leaderboard import LeaderboardFilter
+from bot.db.discord.channels import ChannelType
+from bot.db.utils.sqlite import SQLitePool, translate
+
+
+class TranslateTests(unittest.TestCase):
+    def test_translate_given_array_parameter_reads_it_as_json(self) -> None:
+        self.assertEqual(
+            "SELECT * FROM server_users WHERE id IN (SELECT value FROM json_each(?1))",
+            translate("SELECT * FROM server.users WHERE id=ANY($1::bigint[])")
+        )
+
+    def test_translate_given_unnest_of_arrays_zips_them(self) -> None:
+        self.assertEqual(
+            "FROM (SELECT j0.value AS id, j1.value AS content FROM json_each(?1) AS j0 "
+            "JOIN json_each(?2) AS j1 ON j1.key = j0.key) AS e",
+            translate("FROM unnest($1::bigint[], $2::text[]) AS e(id, content)")
+        )
+
+    def test_translate_given_distinct_on_with_more_sort_keys_keeps_it(self) -> None:
+        query = "SELECT DISTINCT ON (channel_id) * FROM coverage ORDER BY channel_id, from_date"
+
+        self.assertEqual(query, translate(query))
+
+
+class SQLiteTests(unittest.IsolatedAsyncioTestCase):
+    created_at = datetime(2023, 9, 18, 8, 30, tzinfo=timezone.utc)
+
+    async def asyncSetUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.pool = await connect_db(f"sqlite:///{Path(self.directory.name, 'masaryk.db')}")
+        assert isinstance(self.pool, SQLitePool)
+
+        def setup_injections(binder: inject.Binder) -> None:
+            binder.bind(Pool, self.pool)  # type: ignore[misc]
+            binder.bind(ReadPool, ReadPool(self.pool))
+        inject.clear_and_configure(setup_injections)
+
+        await GuildRepository().insert(GuildEntity(1, "MUNI", None, self.created_at))
+        await ChannelRepository().insert(ChannelEntity(1, None, 10, "general", ChannelType.TEXT, self.created_at))
+        await UserRepository().insert_many([UserEntity(100, "Alice", None, False, self.created_at),
+                                            UserEntity(101, "Bob", None, False, self.created_at)])
+
+    async def asyncTearDown(self) -> None:
+        assert isinstance(self.pool, SQLitePool)
+        await self.pool.close()
+        inject.clear()
+        self.directory.cleanup()
+
+    def message(self, id: int, author_id: int, content: str = "hello") -> MessageEntity:
+        return MessageEntity(10, None, author_id, self.snowflake(id), content, False, self.created_at)
+
+    def snowflake(self, id: int) -> int:
+        return time_snowflake(self.created_at) + id
+
+    async def test_connect_db_creates_schema_in_wal_mode(self) -> None:
+        async with self.pool.acquire() as conn:  # type: ignore[union-attr]
+            self.assertEqual("wal", await conn.fetchval("PRAGMA journal_mode"))
+            self.assertEqual(2, await conn.fetchval("SELECT COUNT(*) FROM server.users"))
+
+    async def test_insert_many_given_messages_updates_leaderboard(self) -> None:
+        messages = MessageRepository()
+        await messages.insert_many([self.message(1, 100), self.message(2, 100), self.message(3, 101)])
+        await messages.edit_many([(self.snowflake(3), "edited", False)])
+
+        top10, around = await LeaderboardRepository().get_data(101, LeaderboardFilter(1, [], [], []))
+
+        self.assertEqual([(100, "Alice", 2), (101, "Bob", 1)],
+                         [(row.author_id, row.author, row.sent_total) for row in top10])
+        self.assertEqual([100, 101], [row.author_id for row in around])
+        self.assertEqual(3, await messages.count())
+
+    async def test_edit_and_soft_delete_given_snowflakes_find_messages_in_bounds(self) -> None:
+        messages = MessageRepository()
+        await messages.insert_many([self.message(1, 100), self.message(2, 100)])
+
+        await messages.edit_many([(self.snowflake(1), "edited", False)])
+        await messages.soft_delete_many([self.snowflake(2)])
+
+        async with self.pool.acquire() as conn:  # type: ignore[union-attr]
+            rows = await conn.fetch("SELECT content, deleted_at FROM server.messages ORDER BY id")
+        self.assertEqual(["edited", "hello"], [row['content'] for row in rows])
+        self.assertEqual([False, True], [row['deleted_at'] is not None for row in rows])
+        self.assertEqual(0, await messages.create_partitions())
+
+    async def test_markov_insert_many_adds_frequencies(self) -> None:
+        markov = MarkovRepository()
+        await markov.insert_many([MarkovEntity(1, "ab", "c", 2), MarkovEntity(1, "ab", "c", 1),
+                                  MarkovEntity(1, "", "a", 1)])
+        await markov.insert_many([MarkovEntity(1, "ab", "c", 4)])
+
+        self.assertEqual({("ab", "c", 7), ("", "a", 1)},
+                         {(row.context, row.follows, row.frequency) async for page in markov.find_model(1)
+                          for row in page})
+
+    async def test_markov_swap_shadow_replaces_only_the_guild(self) -> None:
+        await GuildRepository().insert(GuildEntity(2, "FI", None, self.created_at))
+        markov = MarkovRepository()
+        await markov.insert_many([MarkovEntity(1, "a", "b", 1), MarkovEntity(2, "a", "b", 5)])
+        await markov.insert_many([MarkovEntity(1, "a", "c", 3)], shadow=True)
+
+        await markov.swap_shadow(1)
+
+        self.assertEqual([("a", "c", 3)], [(row.context, row.follows, row.frequency)
+                                           async for page in markov.find_model(1) for row in page])
+        self.assertEqual([("a", "b", 5)], [(row.context, row.follows, row.frequency)
+                                           async for page in markov.find_model(2) for row in page])
+
+    async def test_soft_delete_missing_marks_departed_users(self) -> None:
+        users = UserRepository()
+
+        self.assertEqual(1, await users.soft_delete_missing([100]))
+        self.assertEqual({100}, set(await users.find_fingerprints()))
+
+    async def test_insert_given_departed_author_keeps_them_departed(self) -> None:
+        users = UserRepository()
+        await users.soft_delete_missing([100])
+
+        await users.insert(UserEntity(101, "Bob", None, False, self.created_at))
+
+        self.assertEqual({100}, set(await users.find_fingerprints()))
+
+    async def test_find_next_gap_returns_timestamps(self) -> None:
+        logger = LoggerRepository()
+        from_date = datetime(2023, 9, 1, tzinfo=timezone.utc)
+        await logger.begin_process((10, from_date))
+        await logger.end_process((10, from_date, self.created_at))
+
+        gap = await logger.find_next_gap(10)
+
+        channel_created_at = datetime(2015, 1, 1, tzinfo=timezone.utc)
+        self.assertEqual(LoggerRepository.Gap(channel_created_at, from_date), gap)
+
+    async def test_nested_transaction_given_error_rolls_back_savepoint_only(self) -> None:
+        messages = MessageRepository()
+        async with UnitOfWork().transaction() as transaction:
+            await messages.insert(self.message(1, 100), conn=transaction.conn)
+            with self.assertRaises(ValueError):
+                async with transaction.transaction() as savepoint:
+                    await messages.insert(self.message(2, 100), conn=savepoint.conn)
+                    raise ValueError("invalid message")
+
+        self.assertEqual(1, await messages.count())
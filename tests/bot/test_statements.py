@@ -0,0 +1,36 @@
+import unittest
+import unittest.mock
+
+from bot.db.utils import Statements
+
+
+class StatementsTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.statements = Statements(find="SELECT * FROM server.users WHERE id=$1")
+        self.connection = unittest.mock.AsyncMock()
+
+    def _acquire(self) -> unittest.mock.AsyncMock:
+        """new pool proxy of the same connection"""
+        return unittest.mock.AsyncMock(_con=self.connection)
+
+    async def test_fetch_given_same_connection_prepares_once(self) -> None:
+        await self.statements.fetch(self._acquire(), 'find', 1)
+        await self.statements.fetch(self._acquire(), 'find', 2)
+
+        self.assertEqual((1, 1), (self.statements.prepared, self.statements.reused))
+
+    async def test_fetch_given_other_connection_prepares_again(self) -> None:
+        await self.statements.fetch(self._acquire(), 'find', 1)
+        await self.statements.fetch(unittest.mock.AsyncMock(_con=unittest.mock.AsyncMock()), 'find', 1)
+
+        self.assertEqual((2, 0), (self.statements.prepared, self.statements.reused))
+
+    async def test_execute_runs_registered_query(self) -> None:
+        conn = self._acquire()
+
+        await self.statements.execute(conn, 'find', 1)
+
+        conn.execute.assert_awaited_once_with("SELECT * FROM server.users WHERE id=$1", 1)
+
+    def test_cache_size_given_registered_queries_holds_them(self) -> None:
+        self.assertGreaterEqual(Statements.cache_size(), 100 + len(self.statements.queries))
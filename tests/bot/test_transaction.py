@@ -0,0 +1,100 @@
+import contextlib
+import unittest
+import unittest.mock
+from typing import AsyncIterator, Optional
+
+from bot.db.utils import ReadPool, TransactionContext, UnitOfWork
+
+
+class MockPool:
+    def __init__(self) -> None:
+        self.conn = unittest.mock.MagicMock()
+        self.conn.transaction.side_effect = lambda **_: unittest.mock.AsyncMock()
+        self.acquired = 0
+        self.released = 0
+        self.error: Optional[Exception] = None
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> AsyncIterator[unittest.mock.MagicMock]:
+        if self.error is not None:
+            raise self.error
+        self.acquired += 1
+        try:
+            yield self.conn
+        finally:
+            self.released += 1
+
+
+class UnitOfWorkTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.pool = MockPool()
+        self.replica = MockPool()
+        self.uow = UnitOfWork(self.pool, ReadPool(self.pool, self.replica))  # type: ignore[arg-type]
+
+    async def test_transaction_given_commit_releases_connection_to_pool(self) -> None:
+        async with self.uow.transaction() as transaction:
+            self.assertIs(self.pool.conn, transaction.conn)
+
+        self.assertEqual((1, 1), (self.pool.acquired, self.pool.released))
+        self.pool.conn.close.assert_not_called()
+        self.assertIsNotNone(transaction.elapsed)
+
+    async def test_transaction_given_error_rolls_back_and_releases_connection(self) -> None:
+        with self.assertRaises(ValueError):
+            async with self.uow.transaction():
+                raise ValueError("invalid entity")
+
+        self.assertEqual(1, self.pool.released)
+
+    async def test_nested_transaction_given_error_keeps_parent_connection(self) -> None:
+        async with self.uow.transaction() as transaction:
+            with self.assertRaises(ValueError):
+                async with transaction.transaction() as savepoint:
+                    self.assertIs(self.pool.conn, savepoint.conn)
+                    raise ValueError("invalid entity")
+            self.assertEqual(0, self.pool.released)
+            self.assertIs(self.pool.conn, transaction.conn)
+
+        self.assertEqual((1, 1), (self.pool.acquired, self.pool.released))
+
+    def test_transaction_given_read_only_parent_refuses_read_write_savepoint(self) -> None:
+        parent = TransactionContext(self.pool, readonly=True)  # type: ignore[arg-type]
+
+        with self.assertRaises(AssertionError):
+            parent.transaction(readonly=False)
+
+    async def test_read_only_transaction_runs_on_replica(self) -> None:
+        async with self.uow.transaction(readonly=True) as transaction:
+            self.assertIs(self.replica.conn, transaction.conn)
+
+        self.assertEqual((0, 1, 1), (self.pool.acquired, self.replica.acquired, self.replica.released))
+
+
+class ReadPoolTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.primary = MockPool()
+        self.replica = MockPool()
+        self.replica.error = OSError("connection refused")
+
+    async def test_acquire_given_unhealthy_replica_falls_back_to_primary(self) -> None:
+        pool = ReadPool(self.primary, self.replica, retry_after=60)  # type: ignore[arg-type]
+
+        async with pool.acquire() as conn:
+            self.assertIs(self.primary.conn, conn)
+        self.replica.error = None
+        async with pool.acquire() as conn:
+            self.assertIs(self.primary.conn, conn)
+
+        self.assertFalse(pool.healthy)
+        self.assertEqual(2, self.primary.acquired)
+
+    async def test_acquire_given_replica_recovered_uses_it_again(self) -> None:
+        pool = ReadPool(self.primary, self.replica, retry_after=0)  # type: ignore[arg-type]
+        async with pool.acquire():
+            pass
+
+        self.replica.error = None
+        async with pool.acquire() as conn:
+            self.assertIs(self.replica.conn, conn)
+
+        self.assertEqual((1, 1), (self.replica.acquired, self.replica.released))
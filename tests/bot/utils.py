@@ -11,7 +11,9 @@ def mock_database(binder: inject.Binder) -> None:
     binder.bind(asyncpg.Pool, unittest.mock.MagicMock())
 
     for repository in bot.db.discord.REPOSITORIES:
-        binder.bind(repository, unittest.mock.AsyncMock())
+        mock_repository = unittest.mock.AsyncMock(**{'find_fingerprints.return_value': {}})
+        mock_repository.__table_name__ = repository.__name__
+        binder.bind(repository, mock_repository)
 
     for mapper in bot.db.discord.MAPPERS:
         binder.bind_to_constructor(mapper, mapper)
\ No newline at end of file